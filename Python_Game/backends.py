@@ -0,0 +1,369 @@
+import os
+import math
+import logging
+import pygame
+
+from config import (
+    ANCHO, ALTO,
+    COLOR_FONDO_BASE, COLOR_MISIL, COLOR_NAVE, COLOR_BEAM,
+    ALCANCE_BEAM,
+    ESTELA_RADIO, COLOR_ESTELA,
+    BLOOM_INTENSITY, BLOOM_DOWNSCALE,
+    ESCALA_RENDER, ESCALA_RENDER_MIN,
+    PARTICULAS_RENDER,
+    BARRA_VIDA_NIVELES,
+)
+from entities import LaserShot, Enemigo
+from render import dibujar_escena, dibujar_ui, componer_frame, CapaFondo
+from particulas import SplatParticulas
+from superficies import superficie, adaptar, registro, ALFA
+
+logger = logging.getLogger("Naves")
+
+# Modos de mezcla de SDL_Renderer (SDL_BlendMode)
+BLENDMODE_NONE = 0
+BLENDMODE_BLEND = 1
+BLENDMODE_ADD = 2
+
+# Interfaz común de los backends de dibujo:
+#   preparar_recursos(recursos)  -> adapta sprites cargados al backend
+#   dibujar_escena(...)          -> mismos argumentos que render.dibujar_escena sin `scene` ni `escala`/`hud`
+#                                   (con `camara`: entidades en coordenadas de mundo, culling y contadores)
+#   presentar(offset)            -> compone bloom + shake y muestra el frame
+#   cambiar_escala(escala)       -> resolución interna del mundo (HUD siempre nativo)
+#   cerrar()
+# y el atributo `grabador`: si no es None, presentar() le entrega el frame final
+# (con bloom, shake y HUD) antes de mostrarlo, vía grabador.capturar(copiar).
+
+
+def _tam_interno(escala):
+    return max(1, int(ANCHO * escala)), max(1, int(ALTO * escala))
+
+
+def _normalizar_escala(escala):
+    return min(1.0, max(ESCALA_RENDER_MIN, round(escala, 2)))
+
+
+class BackendSoftware:
+    nombre = 'software'
+
+    def __init__(self, titulo, escala=ESCALA_RENDER, vsync=False, particulas=PARTICULAS_RENDER):
+        self.vsync = False
+        if vsync:
+            # SDL solo sincroniza con SCALED u OPENGL
+            try:
+                self.pantalla = pygame.display.set_mode((ANCHO, ALTO), pygame.DOUBLEBUF | pygame.SCALED, vsync=1)
+                self.vsync = True
+            except pygame.error:
+                logger.warning("vsync no disponible; se usa el modo de ventana normal")
+        if not self.vsync:
+            self.pantalla = pygame.display.set_mode((ANCHO, ALTO), pygame.DOUBLEBUF)
+        registro.pantalla_cambiada()
+        pygame.display.set_caption(titulo)
+        self.ampliada = None
+        self._hud = None
+        self.grabador = None
+        self.fondo = CapaFondo()
+        self.splat = SplatParticulas() if particulas == 'splat' else None
+        self.cambiar_escala(escala)
+
+    def cambiar_escala(self, escala):
+        self.escala = _normalizar_escala(escala)
+        self.scene = superficie(_tam_interno(self.escala))
+        if self.escala < 1.0 and self.ampliada is None:
+            self.ampliada = superficie((ANCHO, ALTO))
+        logger.info(f"Escala de render interna: {self.escala:.2f}")
+
+    def preparar_recursos(self, recursos):
+        for k, v in list(recursos.items()):
+            if isinstance(v, pygame.Surface):
+                try:
+                    recursos[k] = adaptar(v)
+                except Exception:
+                    logger.exception(f"Error convirtiendo el recurso {k} al formato de pantalla")
+
+    def dibujar_escena(self, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui,
+                       perf_monitor=None, camara=None):
+        hud_en_escena = self.escala == 1.0
+        dibujar_escena(self.scene, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui,
+                       self.escala, hud_en_escena, perf_monitor, camara, self.fondo, self.splat)
+        self._hud = None if hud_en_escena else (entidades, stats, nave, reloj, fuente_ui, perf_monitor)
+
+    def presentar(self, offset):
+        componer_frame(self.pantalla, self.scene, offset, self.ampliada)
+        if self._hud:
+            entidades, stats, nave, reloj, fuente_ui, perf_monitor = self._hud
+            dibujar_ui(self.pantalla, entidades, stats, nave, reloj, perf_monitor, fuente_ui)
+        if self.grabador:
+            self.grabador.capturar(self._copiar_final)
+        pygame.display.flip()
+
+    def _copiar_final(self, destino):
+        destino.blit(self.pantalla, (0, 0))
+
+    def cerrar(self):
+        pass
+
+
+class _LienzoUI:
+    # Adaptador con la parte de la API de Surface que usa dibujar_ui. Cada
+    # posición del HUD es un slot con una textura streaming reutilizable: por
+    # frame solo se sube el texto a su esquina (la textura crece si no entra)
+    # y se dibuja ese rectángulo, sin crear ni destruir texturas.
+    def __init__(self, backend):
+        self.backend = backend
+        self._slots = {}
+
+    def blit(self, surf, pos):
+        w, h = surf.get_size()
+        if not w or not h:
+            return
+        clave = (int(pos[0]), int(pos[1]))
+        tex = self._slots.get(clave)
+        if tex is None or tex.width < w or tex.height < h:
+            tam = (max(w, tex.width), max(h, tex.height)) if tex else (w, h)
+            tex = self.backend.video.Texture(self.backend.renderer, tam, streaming=True)
+            tex.blend_mode = BLENDMODE_BLEND
+            self._slots[clave] = tex
+        area = pygame.Rect(0, 0, w, h)
+        tex.update(surf, area)
+        tex.draw(srcrect=area, dstrect=pygame.Rect(clave, (w, h)))
+
+    def limpiar(self):
+        self._slots.clear()
+
+
+class BackendTexturas:
+    nombre = 'texturas'
+
+    def __init__(self, titulo, renderer_software=False, escala=ESCALA_RENDER, vsync=False):
+        from pygame._sdl2 import video
+
+        # Filtrado bilineal al escalar texturas (necesario para el bloom)
+        os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', '1')
+        self.video = video
+        self.ventana = video.Window(titulo, (ANCHO, ALTO))
+        self.vsync = vsync
+        if renderer_software:
+            nombres = [d.name for d in video.get_drivers()]
+            self.renderer = video.Renderer(self.ventana, index=nombres.index('software'), vsync=vsync)
+        else:
+            self.renderer = video.Renderer(self.ventana, accelerated=1, vsync=vsync)
+        logger.info(f"Backend de texturas ({'software' if renderer_software else 'acelerado'})")
+
+        tam_bloom = (max(1, ANCHO // BLOOM_DOWNSCALE), max(1, ALTO // BLOOM_DOWNSCALE))
+        self.bloom = video.Texture(self.renderer, tam_bloom, target=True)
+        self.bloom.blend_mode = BLENDMODE_ADD
+        self.bloom.alpha = BLOOM_INTENSITY
+        self._texturas = {}
+        self._lienzo_ui = _LienzoUI(self)
+        self._hud = None
+        self._desplazamiento = (0.0, 0.0)
+        self.grabador = None
+        self.cambiar_escala(escala)
+
+    def cambiar_escala(self, escala):
+        # El escalado de coordenadas lo hace el renderer (SDL_RenderSetScale)
+        self.escala = _normalizar_escala(escala)
+        self.escena = self.video.Texture(self.renderer, _tam_interno(self.escala), target=True)
+        self.escena.blend_mode = BLENDMODE_NONE
+        logger.info(f"Escala de render interna: {self.escala:.2f}")
+
+    def preparar_recursos(self, recursos):
+        # Los sprites se suben una sola vez, al primer uso, en _textura()
+        pass
+
+    def _textura(self, clave, fabrica):
+        tex = self._texturas.get(clave)
+        if tex is None:
+            tex = self.video.Texture.from_surface(self.renderer, fabrica())
+            tex.blend_mode = BLENDMODE_BLEND
+            self._texturas[clave] = tex
+        return tex
+
+    def _sprite(self, tex, centro, tam=None, angulo=0.0, alpha=255):
+        w, h = tam if tam else (tex.width, tex.height)
+        dx, dy = self._desplazamiento
+        tex.alpha = alpha
+        tex.draw(dstrect=pygame.Rect(int(centro[0] + dx - w / 2), int(centro[1] + dy - h / 2), int(w), int(h)),
+                 angle=angulo)
+
+    def _circulo(self, color, radio):
+        def fabrica():
+            surf = superficie((radio * 2, radio * 2), ALFA)
+            pygame.draw.circle(surf, color, (radio, radio), radio)
+            return surf
+        return self._textura(('circulo', color, radio), fabrica)
+
+    def dibujar_escena(self, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui,
+                       perf_monitor=None, camara=None):
+        r = self.renderer
+        # El fondo va en coordenadas de pantalla; el desplazamiento de cámara se aplica después
+        self._desplazamiento = (0.0, 0.0)
+        r.target = self.escena
+        r.scale = (self.escala, self.escala)
+        r.draw_color = (*COLOR_FONDO_BASE, 255)
+        r.clear()
+
+        for n in entidades['nebulas']:
+            if n.img:
+                tex = self._textura(('img', id(n.img)), lambda: n.img)
+                self._sprite(tex, (n.x, n.y), (n.size * 2, n.size * 2), -n.rotation, int(180 * (1 - n.z)))
+            elif n.size > 0:
+                self._sprite(self._circulo(n.color, n.size), (n.x, n.y), alpha=30)
+        for s in entidades['stars']:
+            col = int(200 + (1 - s.z) * 55)
+            r.draw_color = (col, col, col, 255)
+            r.fill_rect((int(s.x), int(s.y), s.size, s.size))
+        for f in entidades['fogs']:
+            tex = self._textura(('fog', f.size, f.color_base, f.z), f.sprite)
+            self._sprite(tex, (int(f.x), int(f.y)))
+
+        if camara is None:
+            enemigos, estelas = entidades['enemigos'], entidades['estelas']
+            misiles, lasers = entidades['misiles'], entidades['lasers']
+        else:
+            self._desplazamiento = camara.desplazamiento()
+            enemigos = camara.filtrar_visibles(entidades['enemigos'])
+            estelas = [est for est in entidades['estelas'] if camara.caja_visible(est.caja())]
+            misiles = camara.filtrar_visibles(entidades['misiles'])
+            lasers = camara.filtrar_visibles(entidades['lasers'])
+        for e in enemigos:
+            self._dibujar_enemigo(e, recursos.get('enemigo'))
+        for est in estelas:
+            self._dibujar_estela(est)
+        for m in misiles:
+            self._dibujar_estela(m.estela)
+            self._dibujar_misil(m)
+        tex_laser = self._textura(('laser',), LaserShot.sprite)
+        for l in lasers:
+            self._sprite(tex_laser, l.pos, angulo=-l.angulo())
+        if nave.alive:
+            nave.emitir_estela_motor(entidades['particles'])
+            self._dibujar_nave(nave, recursos.get('jugador'))
+        particulas = entidades['particles'] if camara is None else camara.filtrar_visibles(entidades['particles'])
+        for p in particulas:
+            radio = int(p.size)
+            if radio > 0:
+                alpha = int(255 * (1 - (p.age / p.lifetime)))
+                self._sprite(self._circulo(p.color, radio), p.pos, (int(p.size * 2), int(p.size * 2)), alpha=alpha)
+
+        if haz_activo:
+            self._dibujar_haz(nave, mouse_pos)
+
+        r.scale = (1.0, 1.0)
+        self._desplazamiento = (0.0, 0.0)
+        if self.escala == 1.0:
+            dibujar_ui(self._lienzo_ui, entidades, stats, nave, reloj, perf_monitor, fuente_ui)
+            self._hud = None
+        else:
+            self._hud = (entidades, stats, nave, reloj, fuente_ui, perf_monitor)
+        r.target = None
+
+    def _dibujar_enemigo(self, e, img):
+        if img:
+            self._sprite(self._textura(('img', id(img)), lambda: img), e.pos)
+        else:
+            self._sprite(self._textura(('enemigo', e.radio), lambda: Enemigo.sprite_fallback(e.radio)), e.pos)
+
+        # Misma barra cuantizada que el backend software; con la vida llena no se dibuja
+        nivel = e.nivel_barra()
+        if nivel < BARRA_VIDA_NIVELES:
+            tex = self._textura(('barra', nivel), lambda: Enemigo.barra(nivel))
+            x = int(e.pos.x + self._desplazamiento[0] - 17)
+            y = int(e.pos.y + self._desplazamiento[1] - e.radio - 14)
+            tex.draw(dstrect=pygame.Rect(x, y, tex.width, tex.height))
+
+    def _dibujar_estela(self, est):
+        for x, y, restante in est.puntos():
+            if restante <= 0:
+                continue
+            radio = max(1, int(1 + (ESTELA_RADIO - 1) * restante))
+            self._sprite(self._circulo(COLOR_ESTELA, radio), (x, y), alpha=int(255 * restante))
+
+    def _dibujar_misil(self, m):
+        def fabrica():
+            # Mismo resultado que las capas de Misil.dibujar sobre la escena opaca
+            surf = superficie((20, 10), ALFA)
+            surf.fill((*COLOR_MISIL, 255))
+            surf.fill((255, 255, 255, 255), (0, 3, 20, 4))
+            return surf
+        if m.vel.length_squared() == 0:
+            return
+        dir_norm = m.vel.normalize()
+        angulo = math.degrees(math.atan2(dir_norm.y, dir_norm.x))
+        self._sprite(self._textura(('misil',), fabrica), m.pos + dir_norm * 10, angulo=angulo)
+
+    def _dibujar_nave(self, nave, img):
+        if img:
+            self._sprite(self._textura(('img', id(img)), lambda: img), nave.pos, angulo=-nave.angle)
+            return
+
+        def fabrica():
+            r = nave.radio
+            surf = superficie((r * 4, r * 4), ALFA)
+            pts = [
+                (2 * r + math.cos(a) * r, 2 * r - math.sin(a) * r)
+                for a in (0.0, 2.5, -2.5)
+            ]
+            pygame.draw.polygon(surf, COLOR_NAVE, pts)
+            pygame.draw.polygon(surf, (20, 20, 30), pts, 2)
+            return surf
+        self._sprite(self._textura(('nave', nave.radio), fabrica), nave.pos, angulo=-nave.angle)
+
+    def _dibujar_haz(self, nave, mouse_pos):
+        dir_beam = pygame.math.Vector2(mouse_pos) - nave.pos
+        dist = dir_beam.length()
+        if dist <= 0:
+            return
+        dir_norm = dir_beam.normalize()
+        largo = min(ALCANCE_BEAM, dist - 26)
+        if largo <= 0:
+            return
+
+        def fabrica():
+            surf = superficie((1, 26), ALFA)
+            surf.fill((*COLOR_BEAM, 255))
+            surf.fill((255, 255, 255, 255), (0, 10, 1, 6))
+            return surf
+        centro = nave.pos + dir_norm * (26 + largo / 2)
+        angulo = math.degrees(math.atan2(dir_norm.y, dir_norm.x))
+        self._sprite(self._textura(('haz',), fabrica), centro, (largo, 26), angulo)
+
+    def presentar(self, offset):
+        r = self.renderer
+        r.target = self.bloom
+        r.draw_color = (0, 0, 0, 255)
+        r.clear()
+        self.escena.draw()
+        r.target = None
+        r.clear()
+        destino = pygame.Rect(int(offset[0]), int(offset[1]), ANCHO, ALTO)
+        self.escena.draw(dstrect=destino)
+        self.bloom.draw(dstrect=destino)
+        if self._hud:
+            entidades, stats, nave, reloj, fuente_ui, perf_monitor = self._hud
+            dibujar_ui(self._lienzo_ui, entidades, stats, nave, reloj, perf_monitor, fuente_ui)
+        if self.grabador:
+            self.grabador.capturar(self._copiar_final)
+        r.present()
+
+    def _copiar_final(self, destino):
+        # Lectura del framebuffer (SDL_RenderReadPixels) directo al buffer del pool
+        self.renderer.to_surface(destino)
+
+    def cerrar(self):
+        self._texturas.clear()
+        self._lienzo_ui.limpiar()
+
+
+def crear_backend(nombre, titulo, renderer_software=False, escala=ESCALA_RENDER, vsync=False,
+                  particulas=PARTICULAS_RENDER):
+    if nombre == BackendTexturas.nombre:
+        if particulas != 'sprites':
+            logger.warning(f"El render de partículas '{particulas}' solo existe en el backend software")
+        try:
+            return BackendTexturas(titulo, renderer_software, escala, vsync)
+        except Exception:
+            logger.exception("No se pudo crear el backend de texturas; usando software")
+    return BackendSoftware(titulo, escala, vsync, particulas)
@@ -0,0 +1,78 @@
+import os
+import sys
+import argparse
+
+from benchmarks.mundo import iniciar_offscreen
+
+# baselines/baseline.json es la referencia versionada y su 'meta' dice en qué
+# máquina se midió. Los tiempos solo se comparan con sentido en una misma
+# máquina: en otra, primero se genera un baseline del commit base
+# (run -o base.json) y luego se compara con el del cambio.
+DIR_BASELINES = os.path.join(os.path.dirname(__file__), 'baselines')
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    run = sub.add_parser('run', help="Ejecuta los casos y guarda un baseline JSON")
+    run.add_argument('-o', '--salida', default=os.path.join(DIR_BASELINES, 'baseline.json'))
+    run.add_argument('-k', '--filtro', default=None, help="Solo casos cuyo nombre contenga este texto")
+    run.add_argument('-r', '--repeticiones', type=int, default=7)
+
+    cmp = sub.add_parser('compare', help="Compara dos baselines y marca regresiones")
+    cmp.add_argument('base')
+    cmp.add_argument('actual')
+    cmp.add_argument('-u', '--umbral', type=float, default=0.10,
+                     help="Aumento relativo de la mediana tolerado (0.10 = 10%%)")
+
+    sub.add_parser('verificar', help="Pruebas de corrección: tunelado de proyectiles y paridad del entorno vectorizado")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parsear_argumentos(argv)
+    from benchmarks import ejecutor
+
+    if args.comando == 'run':
+        iniciar_offscreen()
+        datos = ejecutor.ejecutar_casos(args.filtro, args.repeticiones)
+        os.makedirs(os.path.dirname(os.path.abspath(args.salida)), exist_ok=True)
+        ejecutor.guardar(datos, args.salida)
+        print(f"Baseline guardado en {args.salida}")
+        return 0
+
+    if args.comando == 'verificar':
+        return verificar()
+
+    filas = ejecutor.comparar(ejecutor.cargar(args.base), ejecutor.cargar(args.actual), args.umbral)
+    regresiones = 0
+    for nombre, b, a, ratio, es_regresion in filas:
+        marca = "REGRESION" if es_regresion else ""
+        regresiones += es_regresion
+        print(f"{nombre:<60} {b:10.3f} -> {a:10.3f} ms  x{ratio:5.2f}  {marca}")
+    print(f"{regresiones} regresiones sobre {len(filas)} casos (umbral {args.umbral:.0%})")
+    return 1 if regresiones else 0
+
+
+def verificar():
+    iniciar_offscreen()
+    from benchmarks.tunelado import ejecutar_tunelado
+    from entorno import verificar_paridad
+
+    fallas = 0
+    print(f"{'tunelado':<18}{'Hz':>5}{'casos':>7}{'perdidos':>10}{'puntual':>9}{'falsos':>8}")
+    for escenario, tipo, hz, casos, perdidos, perdidos_puntual, falsos in ejecutar_tunelado():
+        fallas += perdidos + falsos
+        print(f"{escenario + ' ' + tipo:<18}{hz:>5}{casos:>7}{perdidos:>10}{perdidos_puntual:>9}{falsos:>8}")
+
+    for hz in (100, 30):
+        errores = verificar_paridad(dt=1.0 / hz)
+        fallas += len(errores)
+        print(f"paridad entorno vectorizado a {hz} Hz: {'OK' if not errores else errores[0]}")
+    print("OK" if not fallas else f"{fallas} fallas")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+import random
+import pygame
+from pygame.math import Vector2
+
+from config import ANCHO, ALTO, BLOOM_INTENSITY, BLOOM_DOWNSCALE
+from entities import Nave, Enemigo, Star, Nebula, Fog, LaserShot, Misil
+from logic import (
+    procesar_colisiones_laser,
+    procesar_colisiones_misil,
+    procesar_haz,
+    actualizar_entidades,
+    simular_frame,
+)
+from render import dibujar_escena, componer_frame, CapaFondo
+from pipeline import SimulacionPipeline, EntradaFrame
+from backends import BackendTexturas
+from snapshots import codificar, decodificar, restaurar
+from entorno import EntornoVectorizado
+from utils import apply_bloom
+from superficies import superficie, registro, OPACA, ALFA
+from particulas import SplatParticulas, columnas_particulas
+from benchmarks.mundo import (
+    ESCALAS_ENEMIGOS,
+    ESCALAS_PARTICULAS,
+    ESCALAS_PROYECTILES,
+    MUNDOS,
+    crear_mundo,
+    crear_scene,
+    crear_recursos,
+    crear_stats,
+    crear_particula,
+    crear_proyectiles,
+    sin_shake,
+)
+
+# Cada caso es una fábrica: recibe los parámetros de escala, prepara el estado
+# (no se mide) y devuelve la función sin argumentos que se cronometra.
+CASOS = {}
+
+
+def caso(nombre, escalas):
+    def registrar(fabrica):
+        for escala in escalas:
+            etiqueta = ",".join(f"{k}={v}" for k, v in escala.items())
+            CASOS[f"{nombre}[{etiqueta}]"] = (fabrica, escala)
+        return fabrica
+    return registrar
+
+
+def _grilla(**ejes):
+    escalas = [{}]
+    for clave, valores in ejes.items():
+        escalas = [dict(e, **{clave: v}) for e in escalas for v in valores]
+    return escalas
+
+
+def _mundos():
+    return [{'mundo': nombre} for nombre in MUNDOS]
+
+
+@caso("procesar_colisiones_laser", _grilla(enemigos=ESCALAS_ENEMIGOS, proyectiles=ESCALAS_PROYECTILES))
+def _colisiones_laser(enemigos, proyectiles):
+    entidades = crear_mundo(enemigos=enemigos, particulas=0, proyectiles=proyectiles)
+    recursos, stats = crear_recursos(), crear_stats()
+    return lambda: procesar_colisiones_laser(entidades, recursos, stats, sin_shake)
+
+
+@caso("procesar_colisiones_misil", _grilla(enemigos=ESCALAS_ENEMIGOS, proyectiles=ESCALAS_PROYECTILES))
+def _colisiones_misil(enemigos, proyectiles):
+    entidades = crear_mundo(enemigos=enemigos, particulas=0, proyectiles=proyectiles)
+    recursos, stats = crear_recursos(), crear_stats()
+    return lambda: procesar_colisiones_misil(entidades, recursos, stats, sin_shake)
+
+
+@caso("procesar_haz", _grilla(enemigos=ESCALAS_ENEMIGOS))
+def _haz(enemigos):
+    entidades = crear_mundo(enemigos=enemigos, particulas=0, proyectiles=0)
+    recursos, stats = crear_recursos(), crear_stats()
+    nave = entidades['nave']
+    objetivo = (ANCHO, ALTO / 2)
+    return lambda: procesar_haz(True, entidades, recursos, stats, 1 / 100, sin_shake, nave, objetivo)
+
+
+@caso("actualizar_entidades", _mundos())
+def _actualizar_entidades(mundo):
+    enemigos, particulas, proyectiles = MUNDOS[mundo]
+    entidades = crear_mundo(enemigos, particulas, proyectiles)
+    stats = crear_stats()
+    parallax = Vector2(120, -40)
+    return lambda: actualizar_entidades(entidades, 1 / 100, parallax, stats)
+
+
+@caso("dibujar_escena", _mundos())
+def _dibujar_escena(mundo):
+    enemigos, particulas, proyectiles = MUNDOS[mundo]
+    entidades = crear_mundo(enemigos, particulas, proyectiles)
+    recursos, stats = crear_recursos(), crear_stats()
+    nave = entidades['nave']
+    scene = crear_scene()
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+    objetivo = (ANCHO, ALTO / 2)
+    return lambda: dibujar_escena(scene, entidades, recursos, True, nave, objetivo, stats, reloj, fuente)
+
+
+# Frames por medición del fondo: la caché solo se amortiza a lo largo de varios
+# (la primera llamada siempre compone)
+FRAMES_FONDO = 50
+
+
+@caso("dibujar_escena.fondo", _grilla(fondo=('directo', 'cache'), parallax=(0, 30, 330)))
+def _dibujar_escena_fondo(fondo, parallax):
+    # FRAMES_FONDO frames con el fondo avanzando con el parallax de una nave a
+    # `parallax` px/s; mundo sin enemigos, partículas ni proyectiles para que
+    # el fondo sea casi todo lo que se mide
+    entidades = crear_mundo(enemigos=0, particulas=0, proyectiles=0)
+    recursos, stats = crear_recursos(), crear_stats()
+    nave = entidades['nave']
+    scene = crear_scene()
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+    objetivo = (ANCHO, ALTO / 2)
+    velocidad = Vector2(parallax, 0)
+    capa = CapaFondo() if fondo == 'cache' else None
+
+    def medir():
+        for _ in range(FRAMES_FONDO):
+            for clave in ('nebulas', 'stars', 'fogs'):
+                for obj in entidades[clave]:
+                    obj.actualizar(1 / 100, velocidad)
+            dibujar_escena(scene, entidades, recursos, True, nave, objetivo, stats, reloj, fuente, fondo=capa)
+        if capa is not None:
+            return {'recomposiciones': capa.recomposiciones}
+    return medir
+
+
+@caso("dibujar_y_componer", _grilla(escala=(1.0, 0.75, 0.5)))
+def _dibujar_y_componer(escala):
+    entidades = crear_mundo(*MUNDOS['medio'])
+    recursos, stats = crear_recursos(), crear_stats()
+    nave = entidades['nave']
+    scene = superficie((int(ANCHO * escala), int(ALTO * escala)))
+    pantalla, ampliada = crear_scene(), crear_scene()
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+    objetivo = (ANCHO, ALTO / 2)
+
+    def medir():
+        dibujar_escena(scene, entidades, recursos, True, nave, objetivo, stats, reloj, fuente, escala, False)
+        componer_frame(pantalla, scene, (0, 0), ampliada)
+    return medir
+
+
+_backend_texturas = []
+
+
+@caso("dibujar_escena.texturas", _mundos())
+def _dibujar_escena_texturas(mundo):
+    # Renderer por software de SDL: mide el backend sin depender de una GPU
+    if not _backend_texturas:
+        _backend_texturas.append(BackendTexturas("benchmark", renderer_software=True))
+    backend = _backend_texturas[0]
+    enemigos, particulas, proyectiles = MUNDOS[mundo]
+    entidades = crear_mundo(enemigos, particulas, proyectiles)
+    recursos, stats = crear_recursos(), crear_stats()
+    nave = entidades['nave']
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+    objetivo = (ANCHO, ALTO / 2)
+
+    def medir():
+        backend.dibujar_escena(entidades, recursos, True, nave, objetivo, stats, reloj, fuente)
+        backend.presentar((0, 0))
+    return medir
+
+
+@caso("apply_bloom", [{'tam': f"{ANCHO}x{ALTO}"}])
+def _apply_bloom(tam):
+    scene = crear_scene()
+    entidades = crear_mundo(*MUNDOS['medio'])
+    for p in entidades['particles']:
+        p.dibujar(scene)
+    return lambda: apply_bloom(scene, intensity=BLOOM_INTENSITY, downscale=BLOOM_DOWNSCALE)
+
+
+@caso("blit.formato", _grilla(tipo=(OPACA, ALFA), origen=('nativo', 'distinto')))
+def _blit_formato(tipo, origen):
+    # 200 sprites de 32x32 sobre la scene; 'distinto' invierte R y B respecto del
+    # formato de la pantalla, como una superficie creada sin la fábrica
+    scene = crear_scene()
+    flags, bits, masks = registro.formatos()[tipo]
+    if origen == 'distinto':
+        masks = (masks[2], masks[1], masks[0], masks[3])
+    sprite = pygame.Surface((32, 32), flags, bits, masks)
+    sprite.fill((200, 120, 40, 160))
+    posiciones = [(random.uniform(0, ANCHO - 32), random.uniform(0, ALTO - 32)) for _ in range(200)]
+
+    def medir():
+        for pos in posiciones:
+            scene.blit(sprite, pos)
+    return medir
+
+
+def _dibujar_todas(scene, instancias, *args):
+    def medir():
+        for inst in instancias:
+            inst.dibujar(scene, *args)
+    return medir
+
+
+@caso("dibujar.Particle", _grilla(n=ESCALAS_PARTICULAS))
+def _dibujar_particle(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), [crear_particula() for _ in range(n)], (0, 0))
+
+
+@caso("dibujar.particulas_splat", _grilla(n=ESCALAS_PARTICULAS, origen=('objetos', 'columnas')))
+def _dibujar_particulas_splat(n, origen):
+    # Mismas partículas que dibujar.Particle; 'columnas' parte del layout de un almacén vectorizado
+    random.seed(0)
+    scene, splat = crear_scene(), SplatParticulas()
+    particulas = [crear_particula() for _ in range(n)]
+    if origen == 'objetos':
+        return lambda: splat.dibujar(scene, particulas)
+    datos = columnas_particulas(particulas)
+    return lambda: splat.splat(scene, datos[:, 0], datos[:, 1], datos[:, 2], 1 - datos[:, 3], datos[:, 4:7])
+
+
+@caso("dibujar.Enemigo", _grilla(n=ESCALAS_ENEMIGOS))
+def _dibujar_enemigo(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), [Enemigo() for _ in range(n)], (0, 0), None)
+
+
+@caso("dibujar.Enemigo.heridos", _grilla(n=ESCALAS_ENEMIGOS))
+def _dibujar_enemigo_heridos(n):
+    # Con vida parcial: sprite y barra de vida por enemigo, en un solo blits()
+    random.seed(0)
+    enemigos = [Enemigo() for _ in range(n)]
+    for e in enemigos:
+        e.vida = random.uniform(1, e.max_vida - 1)
+    scene = crear_scene()
+
+    def medir():
+        lote = []
+        for e in enemigos:
+            e.agregar_blits(lote, (0, 0), None)
+        scene.blits(lote, doreturn=False)
+    return medir
+
+
+@caso("dibujar.LaserShot", _grilla(n=ESCALAS_PROYECTILES))
+def _dibujar_laser(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), crear_proyectiles(LaserShot, n, []), (0, 0))
+
+
+@caso("dibujar.Misil", _grilla(n=ESCALAS_PROYECTILES))
+def _dibujar_misil(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), crear_proyectiles(Misil, n, []), (0, 0))
+
+
+@caso("dibujar.Star", _grilla(n=(120, 1200)))
+def _dibujar_star(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), [Star() for _ in range(n)])
+
+
+@caso("dibujar.Nebula", _grilla(n=(4, 40)))
+def _dibujar_nebula(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), [Nebula(None) for _ in range(n)])
+
+
+@caso("dibujar.Fog", _grilla(n=(14, 140)))
+def _dibujar_fog(n):
+    random.seed(0)
+    return _dibujar_todas(crear_scene(), [Fog() for _ in range(n)])
+
+
+@caso("dibujar.Nave", [{'n': 1}])
+def _dibujar_nave(n):
+    nave = Nave((ANCHO / 2, ALTO / 2))
+    nave.vel = Vector2(330, 0)
+    scene = crear_scene()
+    return lambda: nave.dibujar(scene, (0, 0), [], None)
+
+
+FRAMES_POR_MEDICION = 10
+
+
+def _preparar_frames(mundo):
+    enemigos, particulas, proyectiles = MUNDOS[mundo]
+    entidades = crear_mundo(enemigos, particulas, proyectiles)
+    entrada = EntradaFrame(1 / 100, (ANCHO, ALTO / 2), (False, False, False), pygame.key.get_pressed())
+    return entidades, crear_recursos(), crear_stats(), entrada, crear_scene(), crear_scene()
+
+
+def _mundos_frames():
+    return [{'mundo': 'chico'}, {'mundo': 'medio'}]
+
+
+@caso("frames.secuencial", _mundos_frames())
+def _frames_secuencial(mundo):
+    entidades, recursos, stats, entrada, scene, pantalla = _preparar_frames(mundo)
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+    nave = entidades['nave']
+
+    def medir():
+        for _ in range(FRAMES_POR_MEDICION):
+            haz = simular_frame(entidades, recursos, stats, entrada.dt, entrada.mouse_pos, sin_shake,
+                                entrada.botones, entrada.teclas)
+            dibujar_escena(scene, entidades, recursos, haz, nave, entrada.mouse_pos, stats, reloj, fuente)
+            componer_frame(pantalla, scene, (0, 0))
+    return medir
+
+
+@caso("frames.pipeline", _mundos_frames())
+def _frames_pipeline(mundo):
+    entidades, recursos, stats, entrada, scene, pantalla = _preparar_frames(mundo)
+    reloj = pygame.time.Clock()
+    fuente = pygame.font.SysFont("consolas", 18)
+
+    def medir():
+        pipeline = SimulacionPipeline(entidades, recursos, stats, sin_shake)
+        pipeline.iniciar()
+        snapshot = pipeline.capturar(False, entrada.mouse_pos)
+        for _ in range(FRAMES_POR_MEDICION):
+            pipeline.enviar(entrada)
+            dibujar_escena(scene, snapshot.entidades, recursos, snapshot.haz_activo, snapshot.nave,
+                           snapshot.mouse_pos, snapshot.stats, reloj, fuente)
+            componer_frame(pantalla, scene, (0, 0))
+            siguiente = pipeline.esperar()
+            entidades['particles'].extend(snapshot.particulas_emitidas())
+            snapshot = siguiente
+        pipeline.detener()
+    return medir
+
+
+# 1000 entidades: 250 enemigos, 500 partículas, 125 láseres y 125 misiles
+MUNDO_SNAPSHOT = (250, 500, 125)
+
+
+@caso("snapshot.codificar", [{'entidades': 1000}])
+def _snapshot_codificar(entidades):
+    mundo, stats = crear_mundo(*MUNDO_SNAPSHOT), crear_stats()
+
+    def medir():
+        return {'bytes': len(codificar(mundo, stats))}
+    return medir
+
+
+@caso("snapshot.decodificar", [{'entidades': 1000}])
+def _snapshot_decodificar(entidades):
+    blob = codificar(crear_mundo(*MUNDO_SNAPSHOT), crear_stats())
+
+    def medir():
+        decodificar(blob)
+    return medir
+
+
+@caso("snapshot.restaurar", [{'entidades': 1000}])
+def _snapshot_restaurar(entidades):
+    mundo, stats = crear_mundo(*MUNDO_SNAPSHOT), crear_stats()
+    blob = codificar(mundo, stats)
+    return lambda: restaurar(blob, mundo, stats)
+
+
+PASOS_ENTORNO = 10
+
+
+@caso("entorno.paso", [{'mundos': k} for k in (1, 16, 256)])
+def _entorno_paso(mundos):
+    entorno = EntornoVectorizado(mundos, semilla=0)
+    acciones = [entorno.acciones_aleatorias() for _ in range(PASOS_ENTORNO)]
+
+    def medir():
+        for a in acciones:
+            entorno.paso(a)
+        return {'pasos_mundo': PASOS_ENTORNO * mundos}
+    return medir
@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import platform
+import statistics
+import numpy as np
+import pygame
+
+from benchmarks.casos import CASOS
+
+
+def medir_caso(fabrica, escala, repeticiones):
+    # Un caso puede devolver un dict de métricas extra (p. ej. bytes por snapshot)
+    tiempos = []
+    extras = None
+    for _ in range(repeticiones):
+        funcion = fabrica(**escala)
+        inicio = time.perf_counter()
+        extras = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000.0)
+    resultado = {
+        'min_ms': min(tiempos),
+        'mediana_ms': statistics.median(tiempos),
+        'media_ms': statistics.fmean(tiempos),
+        'repeticiones': repeticiones,
+    }
+    if isinstance(extras, dict):
+        resultado.update(extras)
+    return resultado
+
+
+def ejecutar_casos(filtro=None, repeticiones=7, reportar=print):
+    resultados = {}
+    for nombre, (fabrica, escala) in CASOS.items():
+        if filtro and filtro not in nombre:
+            continue
+        resultados[nombre] = medir_caso(fabrica, escala, repeticiones)
+        extras = "  ".join(f"{k}={v}" for k, v in resultados[nombre].items() if not k.endswith('_ms') and k != 'repeticiones')
+        reportar(f"{nombre:<60} {resultados[nombre]['mediana_ms']:10.3f} ms  {extras}")
+    return {
+        'meta': {
+            'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'repeticiones': repeticiones,
+        },
+        'resultados': resultados,
+    }
+
+
+def guardar(datos, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+
+
+def cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(base, actual, umbral=0.10):
+    # Devuelve (nombre, base_ms, actual_ms, ratio, es_regresion) por cada caso en común
+    filas = []
+    res_base, res_actual = base['resultados'], actual['resultados']
+    for nombre in sorted(set(res_base) & set(res_actual)):
+        b = res_base[nombre]['mediana_ms']
+        a = res_actual[nombre]['mediana_ms']
+        ratio = a / b if b > 0 else float('inf')
+        filas.append((nombre, b, a, ratio, ratio > 1.0 + umbral))
+    return filas
@@ -0,0 +1,102 @@
+import os
+import random
+import pygame
+from pygame.math import Vector2
+
+from config import ANCHO, ALTO, STAR_COUNT, VELOCIDAD_BASE_ENEMIGO
+from superficies import superficie, registro
+from entities import Nave, Enemigo, Particle, Star, Nebula, Fog, LaserShot, Misil
+
+ESCALAS_ENEMIGOS = (10, 100, 1000)
+ESCALAS_PARTICULAS = (100, 1000, 10000)
+ESCALAS_PROYECTILES = (10, 100, 1000)
+
+# (enemigos, particulas, proyectiles) para los casos que miden el mundo completo
+MUNDOS = {
+    'chico': (10, 100, 10),
+    'medio': (100, 1000, 100),
+    'grande': (1000, 10000, 1000),
+}
+
+
+def iniciar_offscreen():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+        registro.pantalla_cambiada()
+
+
+def crear_scene():
+    return superficie((ANCHO, ALTO))
+
+
+def crear_recursos():
+    return {
+        'jugador': None,
+        'enemigo': None,
+        'nebulosa': None,
+        's_shot': None,
+        's_missile': None,
+        's_explosion': None,
+        's_beam': None,
+    }
+
+
+def crear_stats():
+    return {
+        'muertes_totales': 0,
+        'velocidad_enemigos': float(VELOCIDAD_BASE_ENEMIGO),
+        'spawn_interval': 2.5,
+        'tiempo_spawn': 0.0,
+    }
+
+
+def crear_particula():
+    return Particle(
+        (random.uniform(0, ANCHO), random.uniform(0, ALTO)),
+        (random.uniform(-120, 120), random.uniform(-120, 120)),
+        random.choice([(255, 160, 60), (255, 200, 40), (255, 50, 200)]),
+        random.uniform(2, 6),
+        random.uniform(0.5, 1.5),
+    )
+
+
+def _direccion_aleatoria():
+    ang = random.uniform(0, 360)
+    return Vector2(1, 0).rotate(ang)
+
+
+def crear_proyectiles(cls, cantidad, enemigos):
+    # La mitad de los proyectiles nace sobre un enemigo para ejercitar la rama de impacto
+    proyectiles = []
+    for i in range(cantidad):
+        if enemigos and i % 2 == 0:
+            pos = Vector2(random.choice(enemigos).pos)
+        else:
+            pos = Vector2(random.uniform(0, ANCHO), random.uniform(0, ALTO))
+        proyectiles.append(cls(pos, _direccion_aleatoria()))
+    return proyectiles
+
+
+def crear_mundo(enemigos=10, particulas=100, proyectiles=10, semilla=0):
+    random.seed(semilla)
+    nave = Nave((ANCHO / 2, ALTO / 2))
+    lista_enemigos = [Enemigo(VELOCIDAD_BASE_ENEMIGO) for _ in range(enemigos)]
+    entidades = {
+        'nave': nave,
+        'lasers': crear_proyectiles(LaserShot, proyectiles, lista_enemigos),
+        'misiles': crear_proyectiles(Misil, proyectiles, lista_enemigos),
+        'estelas': [],
+        'enemigos': lista_enemigos,
+        'particles': [crear_particula() for _ in range(particulas)],
+        'stars': [Star() for _ in range(STAR_COUNT)],
+        'nebulas': [Nebula(None) for _ in range(3)],
+        'fogs': [Fog() for _ in range(12)],
+    }
+    return entidades
+
+
+def sin_shake(amount, duration=0.25):
+    pass
@@ -0,0 +1,95 @@
+import numpy as np
+from pygame.math import Vector2
+
+from config import MUNDO_ANCHO, MUNDO_ALTO, RADIO_ENEMIGO, VIDA_ENEMIGO, VELOCIDAD_BASE_ENEMIGO
+from entities import Enemigo, LaserShot, Misil
+from logic import actualizar_proyectiles, descartar_proyectiles, procesar_colisiones_laser, procesar_colisiones_misil
+from utils import colision_punto_circulo
+from benchmarks.mundo import crear_recursos, crear_stats, sin_shake
+
+# Un proyectil cruza un enemigo a distintas frecuencias de simulación,
+# desplazamientos laterales y fases de partida, en tres escenarios:
+#   centro  enemigo quieto en medio del mundo
+#   borde   enemigo quieto pegado al borde derecho: el último segmento del
+#           proyectil termina fuera del mundo
+#   movil   enemigo que cruza la trayectoria en perpendicular y llega a ella
+#           ENCUENTRO segundos después del disparo, a la vez que el proyectil
+# Cuenta los impactos perdidos con la prueba barrida y con la prueba puntual
+# anterior (solo la posición final), y los impactos falsos de los que pasan
+# apenas por fuera del radio (solo con el enemigo quieto).
+FRECUENCIAS_HZ = (100, 60, 30, 20, 10, 5)
+DESPLAZAMIENTOS = (0.0, 0.5, 0.9, 0.99)
+# En movimiento el bamboleo corre el punto de encuentro unos píxeles
+DESPLAZAMIENTOS_MOVIL = (0.0, 0.5)
+FUERA = 1.02
+FASES = 8
+DISTANCIA = 300
+BORDE = 20
+ENCUENTRO = 0.5
+ESCENARIOS = ('centro', 'borde', 'movil')
+
+TIPOS = {
+    'laser': (LaserShot, 'lasers', procesar_colisiones_laser),
+    'misil': (Misil, 'misiles', procesar_colisiones_misil),
+}
+
+
+def _disparo(escenario, tipo, hz, desplazamiento, fase):
+    clase, clave, procesar = TIPOS[tipo]
+    dt = 1.0 / hz
+    velocidad = clase((0, 0), Vector2(1, 0)).vel.x
+    x = MUNDO_ANCHO - BORDE if escenario == 'borde' else MUNDO_ANCHO / 2
+    centro = Vector2(x, MUNDO_ALTO / 2)
+    enemigo = Enemigo()
+    enemigo.pos, enemigo.vel = Vector2(centro), Vector2(0, 0)
+    y = centro.y + desplazamiento * RADIO_ENEMIGO
+    if escenario == 'movil':
+        # La fase corre la grilla de pasos respecto del encuentro; con el
+        # bamboleo centrado en el trayecto, su deriva en x se anula al llegar
+        vuelo = ENCUENTRO + fase * dt
+        enemigo.vel = Vector2(0, VELOCIDAD_BASE_ENEMIGO)
+        enemigo.pos.y -= VELOCIDAD_BASE_ENEMIGO * vuelo
+        enemigo.wobble = -vuelo / 2
+        origen = (centro.x - velocidad * vuelo, y)
+    else:
+        origen = (centro.x - DISTANCIA - fase * velocidad * dt, y)
+    proyectil = clase(origen, Vector2(1, 0))
+    entidades = {'enemigos': [enemigo], 'lasers': [], 'misiles': [], 'estelas': [], 'particles': []}
+    entidades[clave].append(proyectil)
+    recursos, stats = crear_recursos(), crear_stats()
+
+    # Mismo orden que simular_frame: mover, probar colisiones, descartar, mover enemigos
+    puntual = False
+    tiempo = 0.0
+    while proyectil.vivo and proyectil.pos.x < centro.x + DISTANCIA:
+        tiempo += dt
+        actualizar_proyectiles(entidades, dt)
+        puntual = puntual or colision_punto_circulo(proyectil.pos, enemigo.pos, enemigo.radio)
+        if escenario == 'movil':
+            procesar(entidades, recursos, stats, sin_shake, dt=dt, tiempo=tiempo)
+            descartar_proyectiles(entidades)
+            enemigo.actualizar(dt, tiempo)
+        else:
+            procesar(entidades, recursos, stats, sin_shake)
+            descartar_proyectiles(entidades)
+    return enemigo.vida < VIDA_ENEMIGO, puntual
+
+
+def ejecutar_tunelado():
+    filas = []
+    for escenario in ESCENARIOS:
+        desplazamientos = DESPLAZAMIENTOS_MOVIL if escenario == 'movil' else DESPLAZAMIENTOS
+        for tipo in TIPOS:
+            for hz in FRECUENCIAS_HZ:
+                fallas_barrido = fallas_puntual = falsos = casos = 0
+                for fase in np.linspace(0, 1, FASES, endpoint=False):
+                    for desplazamiento in desplazamientos:
+                        barrido, puntual = _disparo(escenario, tipo, hz, desplazamiento, fase)
+                        casos += 1
+                        fallas_barrido += not barrido
+                        fallas_puntual += not puntual
+                    if escenario != 'movil':
+                        barrido, _ = _disparo(escenario, tipo, hz, FUERA, fase)
+                        falsos += barrido
+                filas.append((escenario, tipo, hz, casos, fallas_barrido, fallas_puntual, falsos))
+    return filas
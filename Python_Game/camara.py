@@ -0,0 +1,87 @@
+import itertools
+
+from config import ANCHO, ALTO, MUNDO_ANCHO, MUNDO_ALTO, CAMARA_MARGEN, LOD_MARGEN, LOD_INTERVALO
+
+
+class Camara:
+    # Rectángulo de vista sobre el mundo. Las entidades viven en coordenadas de
+    # mundo; el dibujo les resta (x, y) y descarta las que quedan fuera de la
+    # vista más `margen`. El fondo (estrellas, nebulosas, niebla) sigue en
+    # coordenadas de pantalla.
+    #
+    # También lleva el LOD de simulación: las partículas a más de `margen_lod`
+    # de la vista y el fondo que cae fuera de la pantalla solo se actualizan en
+    # su fase (1 de cada `intervalo_lod` pasos), con todo el tiempo transcurrido
+    # desde su última actualización.
+    def __init__(self, ancho=ANCHO, alto=ALTO, ancho_mundo=MUNDO_ANCHO, alto_mundo=MUNDO_ALTO,
+                 margen=CAMARA_MARGEN, margen_lod=LOD_MARGEN, intervalo_lod=LOD_INTERVALO):
+        self.ancho, self.alto = ancho, alto
+        self.ancho_mundo, self.alto_mundo = ancho_mundo, alto_mundo
+        self.margen = margen
+        self.margen_lod = margen_lod
+        self.intervalo_lod = max(1, intervalo_lod)
+        self.x = self.y = 0.0
+        self.tiempo = 0.0
+        self.fase = 0
+        self._paso = 0
+        self._fases = itertools.count()
+        self.limites_lod = self.limites(margen_lod)
+        self.limites_pantalla = (0.0, 0.0, float(ancho), float(alto))
+        self.contadores = {'dibujados': 0, 'descartados': 0}
+
+    def seguir(self, pos):
+        # Centra la vista en `pos` sin salir del mundo
+        self.x = min(max(pos[0] - self.ancho / 2, 0.0), max(0.0, self.ancho_mundo - self.ancho))
+        self.y = min(max(pos[1] - self.alto / 2, 0.0), max(0.0, self.alto_mundo - self.alto))
+
+    def a_mundo(self, pos):
+        return pos[0] + self.x, pos[1] + self.y
+
+    def desplazamiento(self, escala=1.0):
+        # Offset en píxeles de la scene para los dibujar(..., offset, escala) de las entidades
+        return -self.x * escala, -self.y * escala
+
+    def limites(self, margen):
+        return self.x - margen, self.y - margen, self.x + self.ancho + margen, self.y + self.alto + margen
+
+    def nuevo_frame(self):
+        self.contadores['dibujados'] = self.contadores['descartados'] = 0
+
+    def filtrar_visibles(self, entidades):
+        # Entidades con `pos` dentro de la vista más el margen; cuenta las descartadas
+        x0, y0, x1, y1 = self.limites(self.margen)
+        visibles = [e for e in entidades if x0 <= e.pos.x <= x1 and y0 <= e.pos.y <= y1]
+        self.contadores['dibujados'] += len(visibles)
+        self.contadores['descartados'] += len(entidades) - len(visibles)
+        return visibles
+
+    def caja_visible(self, caja):
+        # Para lo que no tiene `pos` (estelas): caja (x0, y0, x1, y1) en coordenadas de mundo
+        x0, y0, x1, y1 = self.limites(self.margen)
+        visible = caja is not None and caja[0] <= x1 and caja[2] >= x0 and caja[1] <= y1 and caja[3] >= y0
+        self.contadores['dibujados' if visible else 'descartados'] += 1
+        return visible
+
+    def iniciar_paso(self, dt):
+        # Una vez por paso de simulación, antes de actualizar entidades
+        self.tiempo += dt
+        self._paso += 1
+        self.fase = self._paso % self.intervalo_lod
+        self.limites_lod = self.limites(self.margen_lod)
+
+    def dt_lod(self, entidad, x, y, dt, limites):
+        # dt a aplicar a `entidad` este paso (0: se saltea). Guarda en la entidad
+        # el tiempo de su última actualización para que el salto sea exacto, y
+        # la primera vez le asigna una fase por turno para repartir las lejanas
+        # entre los `intervalo_lod` pasos (con id() caen todas en la misma).
+        x0, y0, x1, y1 = limites
+        ultimo = getattr(entidad, 't_lod', None)
+        if ultimo is None:
+            entidad.fase_lod = next(self._fases) % self.intervalo_lod
+        if ultimo is None or (x0 <= x <= x1 and y0 <= y <= y1):
+            entidad.t_lod = self.tiempo
+            return dt
+        if entidad.fase_lod != self.fase:
+            return 0.0
+        entidad.t_lod = self.tiempo
+        return self.tiempo - ultimo
@@ -2,6 +2,32 @@ ANCHO = 1366
 ALTO = 768
 FPS = 100
 
+# Mundo más grande que la pantalla: la cámara sigue a la nave (por defecto, del tamaño de la pantalla)
+MUNDO_ANCHO = ANCHO
+MUNDO_ALTO = ALTO
+CAMARA_MARGEN = 64
+# Lejos de la vista (más de LOD_MARGEN px) partículas y fondo se simulan cada LOD_INTERVALO frames
+LOD_MARGEN = 600
+LOD_INTERVALO = 4
+
+# Ritmo de frames: 'sleep', 'hibrido' (sleep + spin), 'vsync' o 'libre'
+MODO_RITMO = 'hibrido'
+RITMO_MARGEN_SPIN = 0.002
+DT_MAXIMO = 0.05
+DT_SUAVIZADO = 0.3
+JITTER_BORDES_MS = (0.25, 0.5, 1, 2, 4, 8, 16)
+
+METRICAS_INTERVALO = 1.0
+
+PERFIL_FRAMES = 120
+PERFIL_DIRECTORIO = 'perfiles'
+PERFIL_INTERVALO_MUESTREO = 0.001
+
+# Grabación de partidas (--grabar / F10)
+GRABACION_BUFFERS = 8
+GRABACION_DIRECTORIO = 'grabaciones'
+GRABACION_NIVEL_PNG = 1
+
 COLOR_FONDO_BASE = (6, 8, 20)
 COLOR_NAVE = (80, 200, 255)
 COLOR_LASER = (249, 248, 246)
@@ -15,6 +41,7 @@ SPAWN_INTERVAL = 100.0
 
 DANIO_LASER = 80
 COOLDOWN_LASER = 0.28
+VELOCIDAD_LASER = 800
 
 DANIO_BEAM_POR_SEG = 260
 ALCANCE_BEAM = 820
@@ -24,9 +51,21 @@ VELOCIDAD_MISIL = 130
 CADENCIA_MISIL = 0.5
 RADIO_EXPLOSION = 80
 
+ESTELA_PUNTOS = 40
+ESTELA_INTERVALO = 0.015
+ESTELA_VIDA = 0.6
+ESTELA_RADIO = 4.5
+COLOR_ESTELA = (255, 150, 40)
+
 VEL_NAVE = 330
+RADIO_NAVE = 18
+VIDA_NAVE = 200
 ROTACION_SUAVIZADO = 0.18
 
+RADIO_ENEMIGO = 18
+VIDA_ENEMIGO = 200
+# Anchos prerenderizados de la barra de vida (uno por píxel de la barra de 34 px)
+BARRA_VIDA_NIVELES = 34
 VELOCIDAD_BASE_ENEMIGO = 250
 VELOCIDAD_INCREMENTO_POR_MUERTE = 10
 VELOCIDAD_MAXIMA_ENEMIGO = 480
@@ -44,5 +83,38 @@ NEBULA_COUNT_MAX = 4
 FOG_COUNT_MIN = 10
 FOG_COUNT_MAX = 14
 
+# Fondo cacheado (backend software): nebulosas y niebla se recomponen si alguna se movió
+# FONDO_UMBRAL_PX (son manchas grandes y difusas) o cada FONDO_INTERVALO frames
+FONDO_UMBRAL_PX = 2.0
+FONDO_INTERVALO = 8
+
+# Render de partículas (backend software): 'sprites' (un blit por partícula) o
+# 'splat' (buffer de luz aditivo con NumPy, un solo blit)
+PARTICULAS_RENDER = 'sprites'
+PARTICULAS_SPLAT_RADIO_MAX = 12
+PARTICULAS_SPLAT_INTENSIDAD = 1.0
+# Desempaquetar el buffer cuesta ~10 ms fijos; con menos partículas visibles
+# que esto 'splat' dibuja sprites (cruce medido alrededor de 5000)
+PARTICULAS_SPLAT_MINIMO = 5000
+
 BLOOM_DOWNSCALE = 3
 BLOOM_INTENSITY = 220
+
+ESCALA_RENDER = 1.0
+ESCALA_RENDER_MIN = 0.5
+ESCALA_RENDER_PASO = 0.1
+
+REBOBINADO_SLOT_BYTES = 128 * 1024
+REBOBINADO_SALTO = 100
+RUTA_PARTIDA = 'partida.nvs'
+RUTA_CRASH_DUMP = 'crash_dump.nvr'
+
+# Tonos sintetizados cuando faltan los WAV: variantes de tono de la explosión
+SINTESIS_VARIANTES = 8
+SINTESIS_RANGO_TONO = 0.15
+
+# Eventos de juego por frame (la cola crece si hace falta)
+EVENTOS_CAPACIDAD = 256
+
+ENTORNO_RECOMPENSA_MUERTE = 1.0
+ENTORNO_PENALIZACION_NAVE = -10.0
@@ -6,16 +6,18 @@ import pygame
 from pygame.math import Vector2
 
 from config import (
-    ANCHO, ALTO,
+    ANCHO, ALTO, MUNDO_ANCHO, MUNDO_ALTO,
     COLOR_NAVE, COLOR_LASER, COLOR_MISIL, COLOR_ENEMIGO,
-    VEL_NAVE, ROTACION_SUAVIZADO,
+    VEL_NAVE, ROTACION_SUAVIZADO, RADIO_NAVE, VIDA_NAVE,
     VELOCIDAD_MISIL, DANIO_MISIL,
-    DANIO_LASER,
-    VELOCIDAD_BASE_ENEMIGO,
+    DANIO_LASER, VELOCIDAD_LASER,
+    VELOCIDAD_BASE_ENEMIGO, RADIO_ENEMIGO, VIDA_ENEMIGO, BARRA_VIDA_NIVELES,
     COOLDOWN_LASER,
     CADENCIA_MISIL,
+    ESTELA_PUNTOS, ESTELA_INTERVALO, ESTELA_VIDA, ESTELA_RADIO, COLOR_ESTELA,
 )
-from utils import clamp
+from utils import clamp, escalar_sprite
+from superficies import superficie, registro, OPACA, ALFA
 
 logger = logging.getLogger("Naves")
 
@@ -38,11 +40,12 @@ class Particle:
         self.pos += self.vel * dt
         self.vel *= (1 - dt * 1.2)
 
-    def dibujar(self, pantalla, offset=(0,0)):
+    def dibujar(self, pantalla, offset=(0,0), escala=1.0):
         alpha = int(255 * (1 - (self.age / self.lifetime)))
-        surf = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (*self.color, alpha), (self.size, self.size), int(self.size))
-        pantalla.blit(surf, (self.pos.x - self.size + offset[0], self.pos.y - self.size + offset[1]))
+        size = self.size * escala
+        surf = superficie((size*2, size*2), ALFA)
+        pygame.draw.circle(surf, (*self.color, alpha), (size, size), max(1, int(size)))
+        pantalla.blit(surf, (self.pos.x * escala - size + offset[0], self.pos.y * escala - size + offset[1]))
 
 class Star:
     def __init__(self):
@@ -72,9 +75,10 @@ class Star:
         elif self.y > ALTO + 10:
             self.y = -10
 
-    def dibujar(self, pantalla):
+    def dibujar(self, pantalla, escala=1.0):
         col = int(200 + (1 - self.z) * 55)
-        pygame.draw.rect(pantalla, (col, col, col), (int(self.x), int(self.y), self.size, self.size))
+        size = max(1, int(self.size * escala))
+        pygame.draw.rect(pantalla, (col, col, col), (int(self.x * escala), int(self.y * escala), size, size))
 
 class Nebula:
     def __init__(self, img=None):
@@ -102,18 +106,20 @@ class Nebula:
         elif self.y > ALTO + self.size:
             self.y = -self.size
 
-    def dibujar(self, pantalla):
+    def dibujar(self, pantalla, escala=1.0):
+        size = int(self.size * escala)
+        x, y = self.x * escala, self.y * escala
         if self.img:
-            scaled = pygame.transform.scale(self.img, (self.size * 2, self.size * 2))
+            scaled = pygame.transform.scale(self.img, (size * 2, size * 2))
             rotated = pygame.transform.rotate(scaled, self.rotation)
             alpha = int(180 * (1 - self.z))
             rotated.set_alpha(alpha)
-            rect = rotated.get_rect(center=(int(self.x), int(self.y)))
+            rect = rotated.get_rect(center=(int(x), int(y)))
             pantalla.blit(rotated, rect)
         else:
-            surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*self.color, 30), (self.size, self.size), self.size)
-            pantalla.blit(surf, (int(self.x - self.size), int(self.y - self.size)))
+            surf = superficie((size * 2, size * 2), ALFA)
+            pygame.draw.circle(surf, (*self.color, 30), (size, size), size)
+            pantalla.blit(surf, (int(x - size), int(y - size)))
 
 class Fog:
     def __init__(self):
@@ -149,30 +155,35 @@ class Fog:
         elif self.y > ALTO + self.size:
             self.y = -self.size
 
-    def dibujar(self, pantalla):
-        surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
+    def sprite(self, escala=1.0):
+        size = int(self.size * escala)
+        surf = superficie((size * 2, size * 2), ALFA)
         alpha_base = int(10 * (1 - self.z))
         for i in range(5, 0, -1):
-            radius = int(self.size * (i / 5))
+            radius = int(size * (i / 5))
             alpha = int(alpha_base * (i / 5))
             color = (*self.color_base, alpha)
-            pygame.draw.circle(surf, color, (self.size, self.size), radius)
-        pantalla.blit(surf, (int(self.x - self.size), int(self.y - self.size)))
+            pygame.draw.circle(surf, color, (size, size), radius)
+        return surf
+
+    def dibujar(self, pantalla, escala=1.0):
+        size = int(self.size * escala)
+        pantalla.blit(self.sprite(escala), (int(self.x * escala - size), int(self.y * escala - size)))
 
 class Nave:
     def __init__(self, pos):
         self.pos = Vector2(pos)
         self.vel = Vector2(0,0)
         self.angle = 0.0
-        self.radio = 18
+        self.radio = RADIO_NAVE
         self.laser_timer = 0.0
         self.misil_timer = 0.0
         self.misiles_activos = False
-        self.health = 200
+        self.health = VIDA_NAVE
         self.alive = True
 
-    def actualizar(self, dt, mouse_pos):
-        keys = pygame.key.get_pressed()
+    def actualizar(self, dt, mouse_pos, teclas=None):
+        keys = teclas if teclas is not None else pygame.key.get_pressed()
         direccion = Vector2(0,0)
         if keys[pygame.K_w]:
             direccion.y -= 1
@@ -186,8 +197,8 @@ class Nave:
             direccion = direccion.normalize()
         self.vel = direccion * VEL_NAVE
         self.pos += self.vel * dt
-        self.pos.x %= ANCHO
-        self.pos.y %= ALTO
+        self.pos.x %= MUNDO_ANCHO
+        self.pos.y %= MUNDO_ALTO
 
         objetivo = Vector2(mouse_pos) - self.pos
         if objetivo.length_squared() > 0:
@@ -217,45 +228,53 @@ class Nave:
             return True
         return False
 
-    def dibujar(self, pantalla, offset, particles, img=None):
+    def dibujar(self, pantalla, offset, particles, img=None, escala=1.0):
         ang_rad = math.radians(self.angle)
         punta = self.pos + Vector2(math.cos(ang_rad), -math.sin(ang_rad)) * self.radio
         izquierdo = self.pos + Vector2(math.cos(ang_rad + 2.5), -math.sin(ang_rad + 2.5)) * self.radio
         derecho = self.pos + Vector2(math.cos(ang_rad - 2.5), -math.sin(ang_rad - 2.5)) * self.radio
 
-        if self.vel.length_squared() > 1:
-            back = self.pos - Vector2(math.cos(ang_rad), -math.sin(ang_rad)) * (self.radio + 6)
-            for _ in range(4):
-                jitter = Vector2(random.uniform(-4,4), random.uniform(-4,4))
-                p = Particle(back + jitter, Vector2(random.uniform(-80,-40), random.uniform(-10,10)), (255,160,60), random.uniform(2,4), 0.25)
-                particles.append(p)
+        self.emitir_estela_motor(particles)
 
         if img:
             try:
-                rotated = pygame.transform.rotate(img, self.angle)
-                rect = rotated.get_rect(center=(self.pos.x + offset[0], self.pos.y + offset[1]))
+                rotated = pygame.transform.rotate(escalar_sprite(img, escala), self.angle)
+                rect = rotated.get_rect(center=(self.pos.x * escala + offset[0], self.pos.y * escala + offset[1]))
                 pantalla.blit(rotated, rect)
             except Exception:
                 logger.exception("Error al dibujar sprite de jugador; usando fallback")
-                self._dibujar_fallback(pantalla, offset, punta, izquierdo, derecho)
+                self._dibujar_fallback(pantalla, offset, punta, izquierdo, derecho, escala)
         else:
-            self._dibujar_fallback(pantalla, offset, punta, izquierdo, derecho)
+            self._dibujar_fallback(pantalla, offset, punta, izquierdo, derecho, escala)
 
-    def _dibujar_fallback(self, pantalla, offset, punta, izquierdo, derecho):
-        surf = pygame.Surface((self.radio*4, self.radio*4), pygame.SRCALPHA)
+    def emitir_estela_motor(self, particles):
+        if self.vel.length_squared() > 1:
+            ang_rad = math.radians(self.angle)
+            back = self.pos - Vector2(math.cos(ang_rad), -math.sin(ang_rad)) * (self.radio + 6)
+            for _ in range(4):
+                jitter = Vector2(random.uniform(-4,4), random.uniform(-4,4))
+                p = Particle(back + jitter, Vector2(random.uniform(-80,-40), random.uniform(-10,10)), (255,160,60), random.uniform(2,4), 0.25)
+                particles.append(p)
+
+    def _dibujar_fallback(self, pantalla, offset, punta, izquierdo, derecho, escala=1.0):
+        radio = self.radio * escala
+        surf = superficie((radio*4, radio*4), ALFA)
         pts = []
         for v in (punta, izquierdo, derecho):
-            pts.append((v.x - self.pos.x + self.radio*2, v.y - self.pos.y + self.radio*2))
+            pts.append(((v.x - self.pos.x) * escala + radio*2, (v.y - self.pos.y) * escala + radio*2))
         pygame.draw.polygon(surf, COLOR_NAVE, pts)
-        pygame.draw.polygon(surf, (20,20,30), pts, 2)
-        pantalla.blit(surf, (self.pos.x - self.radio*2 + offset[0], self.pos.y - self.radio*2 + offset[1]))
+        pygame.draw.polygon(surf, (20,20,30), pts, max(1, int(2 * escala)))
+        pantalla.blit(surf, (self.pos.x * escala - radio*2 + offset[0], self.pos.y * escala - radio*2 + offset[1]))
 
 class LaserShot:
+    _sprite = None
+
     def __init__(self, pos, dir_vec):
         self.pos = Vector2(pos)
         if dir_vec.length_squared() == 0:
             dir_vec = Vector2(1,0)
-        self.vel = dir_vec.normalize() * 800
+        self.vel = dir_vec.normalize() * VELOCIDAD_LASER
+        self.pos_anterior = Vector2(self.pos)
         self.radio = 4
         self.danio = DANIO_LASER
         self.vivo = True
@@ -263,11 +282,13 @@ class LaserShot:
 
     def actualizar(self, dt):
         self.age += dt
+        self.pos_anterior.update(self.pos)
         self.pos += self.vel * dt
-        if not (0 <= self.pos.x <= ANCHO and 0 <= self.pos.y <= ALTO):
+        if not (0 <= self.pos.x <= MUNDO_ANCHO and 0 <= self.pos.y <= MUNDO_ALTO):
             self.vivo = False
 
-    def dibujar(self, pantalla, offset=(0, 0)):
+    @staticmethod
+    def sprite():
         # Parámetros del láser mejorado
         largo = 30
         ancho_core = 4
@@ -275,12 +296,9 @@ class LaserShot:
         separacion = 16
 
         # Superficie más grande para acomodar el brillo
-        surf = pygame.Surface((largo + 30, largo + 30), pygame.SRCALPHA)
+        surf = superficie((largo + 30, largo + 30), ALFA)
         centro = (largo + 30) // 2
 
-        # Calcular ángulo de rotación
-        angulo = math.degrees(math.atan2(-self.vel.y, self.vel.x)) - 90
-
         # Función auxiliar para dibujar un láser individual
         def dibujar_laser(x_centro):
             # Capa 1: Brillo exterior más difuso
@@ -329,110 +347,184 @@ class LaserShot:
 
         dibujar_laser(x1)
         dibujar_laser(x2)
+        return surf
+
+    def angulo(self):
+        return math.degrees(math.atan2(-self.vel.y, self.vel.x)) - 90
+
+    def dibujar(self, pantalla, offset=(0, 0), escala=1.0):
+        if LaserShot._sprite is None:
+            LaserShot._sprite = LaserShot.sprite()
 
         # Rotar y dibujar
-        surf_rotada = pygame.transform.rotate(surf, angulo)
-        rect = surf_rotada.get_rect(center=(self.pos.x + offset[0], self.pos.y + offset[1]))
+        surf_rotada = pygame.transform.rotate(escalar_sprite(LaserShot._sprite, escala), self.angulo())
+        rect = surf_rotada.get_rect(center=(self.pos.x * escala + offset[0], self.pos.y * escala + offset[1]))
         pantalla.blit(surf_rotada, rect)
 
 
+# Sprites generados en el formato de la pantalla: se regeneran si cambia el modo de video
+registro.al_cambiar(lambda: setattr(LaserShot, '_sprite', None))
+
+
+class Estela:
+    # Buffer circular de posiciones pasadas; se dibuja como una tira de sprites
+    # cacheados que se afinan y desvanecen con la edad de cada punto.
+    NIVELES_ALPHA = 16
+    _sprites = {}
+
+    def __init__(self, capacidad=ESTELA_PUNTOS, vida=ESTELA_VIDA):
+        self.capacidad = capacidad
+        self.vida = vida
+        self.xs = [0.0] * capacidad
+        self.ys = [0.0] * capacidad
+        self.ts = [0.0] * capacidad
+        self.inicio = 0
+        self.n = 0
+        self.tiempo = 0.0
+        self.emisor_vivo = True
+
+    @property
+    def vivo(self):
+        return self.emisor_vivo or self.n > 0
+
+    def agregar(self, pos):
+        i = (self.inicio + self.n) % self.capacidad
+        if self.n == self.capacidad:
+            self.inicio = (self.inicio + 1) % self.capacidad
+        else:
+            self.n += 1
+        self.xs[i] = pos[0]
+        self.ys[i] = pos[1]
+        self.ts[i] = self.tiempo
+
+    def actualizar(self, dt):
+        self.tiempo += dt
+        while self.n and self.tiempo - self.ts[self.inicio] >= self.vida:
+            self.inicio = (self.inicio + 1) % self.capacidad
+            self.n -= 1
+
+    def puntos(self):
+        # (x, y, fraccion de vida restante) del más viejo al más nuevo
+        for k in range(self.n):
+            i = (self.inicio + k) % self.capacidad
+            yield self.xs[i], self.ys[i], 1 - (self.tiempo - self.ts[i]) / self.vida
+
+    def caja(self):
+        # (x0, y0, x1, y1) de los puntos vivos, o None si no queda ninguno
+        if not self.n:
+            return None
+        xs = [self.xs[(self.inicio + k) % self.capacidad] for k in range(self.n)]
+        ys = [self.ys[(self.inicio + k) % self.capacidad] for k in range(self.n)]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def congelar(self):
+        copia = Estela.__new__(Estela)
+        copia.__dict__.update(self.__dict__)
+        copia.xs, copia.ys, copia.ts = self.xs[:], self.ys[:], self.ts[:]
+        return copia
+
+    @classmethod
+    def sprite(cls, radio, nivel):
+        clave = (radio, nivel)
+        surf = cls._sprites.get(clave)
+        if surf is None:
+            alpha = int(255 * nivel / cls.NIVELES_ALPHA)
+            surf = superficie((radio * 2, radio * 2), ALFA)
+            pygame.draw.circle(surf, (*COLOR_ESTELA, alpha), (radio, radio), radio)
+            cls._sprites[clave] = surf
+        return surf
+
+    def dibujar(self, pantalla, offset=(0, 0), escala=1.0):
+        for x, y, restante in self.puntos():
+            nivel = int(restante * self.NIVELES_ALPHA)
+            if nivel <= 0:
+                continue
+            radio = max(1, int((1 + (ESTELA_RADIO - 1) * restante) * escala))
+            pantalla.blit(Estela.sprite(radio, nivel), (x * escala - radio + offset[0], y * escala - radio + offset[1]))
+
+
+registro.al_cambiar(Estela._sprites.clear)
+
+
 class Misil:
     def __init__(self, pos, dir_vec):
         self.pos = Vector2(pos)
         if dir_vec.length_squared() == 0:
             dir_vec = Vector2(1, 0)
         self.vel = dir_vec.normalize() * VELOCIDAD_MISIL
+        self.pos_anterior = Vector2(self.pos)
         self.radio = 8
         self.danio = DANIO_MISIL
         self.vivo = True
         self.tail_timer = 0.0
+        self.estela = Estela()
+        self.estela.agregar(self.pos - self.vel.normalize() * 8)
 
-    def actualizar(self, dt, particles):
+    def actualizar(self, dt):
+        self.pos_anterior.update(self.pos)
         self.pos += self.vel * dt
         self.tail_timer += dt
+        self.estela.actualizar(dt)
 
-        if self.tail_timer > 0.015:
+        if self.tail_timer > ESTELA_INTERVALO:
             self.tail_timer = 0.0
-            back = self.pos - self.vel.normalize() * 8
-
-            for _ in range(6):
-                vel = Vector2(random.uniform(-40, -5), random.uniform(-15, 15)) + -self.vel.normalize() * 30
-                particles.append(Particle(
-                    back + Vector2(random.uniform(-6, 6), random.uniform(-6, 6)),
-                    vel,
-                    random.choice([(255, 140, 40), (255, 180, 60), (255, 100, 20)]),
-                    random.uniform(1.5, 3), # Ancho
-                    random.uniform(0.5, 0.8)
-                ))
-        if not (0 <= self.pos.x <= ANCHO and 0 <= self.pos.y <= ALTO):
+            self.estela.agregar(self.pos - self.vel.normalize() * 8)
+        if not (0 <= self.pos.x <= MUNDO_ANCHO and 0 <= self.pos.y <= MUNDO_ALTO):
             self.vivo = False
 
-    def dibujar(self, pantalla, offset=(0, 0)):
+    def dibujar(self, pantalla, offset=(0, 0), escala=1.0):
+        self.estela.dibujar(pantalla, offset, escala)
+
         # Calcular puntos de inicio y fin de la línea
         dir_norm = self.vel.normalize()
         largo = 20
         end_pos = self.pos + dir_norm * largo
+        inicio = (int(self.pos.x * escala + offset[0]), int(self.pos.y * escala + offset[1]))
+        fin = (int(end_pos.x * escala + offset[0]), int(end_pos.y * escala + offset[1]))
 
         # Capa 1: Brillo exterior
         for i in range(4, 0, -1):
             alpha = int(30 * i)
             width = 2 + (i * 2)
-            pygame.draw.line(
-                pantalla,
-                (*COLOR_MISIL, alpha),
-                (int(self.pos.x + offset[0]), int(self.pos.y + offset[1])),
-                (int(end_pos.x + offset[0]), int(end_pos.y + offset[1])),
-                width
-            )
+            pygame.draw.line(pantalla, (*COLOR_MISIL, alpha), inicio, fin, max(1, int(width * escala)))
 
         # Capa 2: Brillo medio
         for i in range(3, 0, -1):
             alpha = int(80 * i)
             width = 1 + (i * 1)
-            pygame.draw.line(
-                pantalla,
-                (*COLOR_MISIL, alpha),
-                (int(self.pos.x + offset[0]), int(self.pos.y + offset[1])),
-                (int(end_pos.x + offset[0]), int(end_pos.y + offset[1])),
-                width
-            )
+            pygame.draw.line(pantalla, (*COLOR_MISIL, alpha), inicio, fin, max(1, int(width * escala)))
 
         # Capa 3: Núcleo brillante
-        pygame.draw.line(
-            pantalla,
-            (255, 255, 255, 200),
-            (int(self.pos.x + offset[0]), int(self.pos.y + offset[1])),
-            (int(end_pos.x + offset[0]), int(end_pos.y + offset[1])),
-            4
-        )
+        pygame.draw.line(pantalla, (255, 255, 255, 200), inicio, fin, max(1, int(4 * escala)))
 
         # Capa 4: Centro ultra brillante
-        pygame.draw.line(
-            pantalla,
-            (255, 255, 255, 255),
-            (int(self.pos.x + offset[0]), int(self.pos.y + offset[1])),
-            (int(end_pos.x + offset[0]), int(end_pos.y + offset[1])),
-            2
-        )
+        pygame.draw.line(pantalla, (255, 255, 255, 255), inicio, fin, max(1, int(2 * escala)))
 
 
 class Enemigo:
     def __init__(self, velocidad_nivel=VELOCIDAD_BASE_ENEMIGO):
-        self.pos = Vector2(random.uniform(0,ANCHO), random.uniform(0,ALTO))
+        self.pos = Vector2(random.uniform(0,MUNDO_ANCHO), random.uniform(0,MUNDO_ALTO))
         self.vel = Vector2(random.uniform(-velocidad_nivel, velocidad_nivel),
                            random.uniform(-velocidad_nivel, velocidad_nivel))
-        self.radio = 18
-        self.vida = 200
-        self.max_vida = 200
+        self.radio = RADIO_ENEMIGO
+        self.vida = VIDA_ENEMIGO
+        self.max_vida = VIDA_ENEMIGO
         self.vivo = True
         self.wobble = random.random() * 200
 
-    def actualizar(self, dt):
-        wob = math.sin(time.time() + self.wobble) * 40
-        self.pos += (self.vel + Vector2(wob, -wob*0.3)) * dt
-        if self.pos.x < 0 or self.pos.x > ANCHO:
+    def desplazamiento(self, dt, tiempo=None):
+        # Lo que se mueve en un paso de `dt` (velocidad + bamboleo). `tiempo` fija
+        # el reloj del bamboleo (simulación determinista); por defecto, el de pared
+        if tiempo is None:
+            tiempo = time.time()
+        wob = math.sin(tiempo + self.wobble) * 40
+        return (self.vel + Vector2(wob, -wob*0.3)) * dt
+
+    def actualizar(self, dt, tiempo=None):
+        self.pos += self.desplazamiento(dt, tiempo)
+        if self.pos.x < 0 or self.pos.x > MUNDO_ANCHO:
             self.vel.x *= -1
-        if self.pos.y < 0 or self.pos.y > ALTO:
+        if self.pos.y < 0 or self.pos.y > MUNDO_ALTO:
             self.vel.y *= -1
         if self.vida <= 0:
             self.vivo = False
@@ -444,28 +536,67 @@ class Enemigo:
             return True
         return False
 
-    def dibujar(self, pantalla, offset=(0,0), img=None):
+    # Sprites horneados una vez por escala: halo + núcleo del fallback y la
+    # barra de vida (fondo + relleno) en BARRA_VIDA_NIVELES anchos. Un enemigo
+    # se dibuja con a lo sumo dos blits cacheados; con la vida llena, sin barra.
+    _sprites = {}
+    _barras = {}
+
+    @classmethod
+    def sprite_fallback(cls, radio, escala=1.0):
+        clave = (radio, escala)
+        surf = cls._sprites.get(clave)
+        if surf is None:
+            r = radio * escala
+            surf = superficie((r*3, r*3), ALFA)
+            c = int(r * 1.5)
+            pygame.draw.circle(surf, (*COLOR_ENEMIGO, 90), (c, c), int(r + 6 * escala))
+            pygame.draw.circle(surf, COLOR_ENEMIGO, (c, c), int(r))
+            cls._sprites[clave] = surf
+        return surf
+
+    @classmethod
+    def barra(cls, nivel, escala=1.0):
+        clave = (nivel, escala)
+        surf = cls._barras.get(clave)
+        if surf is None:
+            w, h = int(34 * escala), max(1, int(6 * escala))
+            surf = superficie((w, h), OPACA)
+            surf.fill((40,40,40))
+            surf.fill((0,200,0), (0, 0, int(34 * escala * nivel / BARRA_VIDA_NIVELES), h))
+            cls._barras[clave] = surf
+        return surf
+
+    def nivel_barra(self):
+        # Ancho cuantizado de la barra; BARRA_VIDA_NIVELES con la vida llena
+        return int(clamp(self.vida / self.max_vida, 0, 1) * BARRA_VIDA_NIVELES)
+
+    def agregar_blits(self, lote, offset=(0,0), img=None, escala=1.0):
+        # Agrega a `lote` los (surface, posición) del enemigo para un Surface.blits()
+        sprite = None
         if img:
             try:
-                rect = img.get_rect(center=(self.pos.x + offset[0], self.pos.y + offset[1]))
-                pantalla.blit(img, rect)
+                sprite = escalar_sprite(img, escala)
+                lote.append((sprite, sprite.get_rect(center=(self.pos.x * escala + offset[0], self.pos.y * escala + offset[1]))))
             except Exception:
                 logger.exception("Error dibujando sprite enemigo; usando fallback")
-                self._dibujar_fallback(pantalla, offset)
-        else:
-            self._dibujar_fallback(pantalla, offset)
-
-        porc = clamp(self.vida / self.max_vida, 0, 1)
-        w, h = 34, 6
-        x = int(self.pos.x - w/2 + offset[0])
-        y = int(self.pos.y - self.radio - 14 + offset[1])
-        pygame.draw.rect(pantalla, (40,40,40), (x, y, w, h))
-        pygame.draw.rect(pantalla, (0,200,0), (x, y, int(w * porc), h))
-
-    def _dibujar_fallback(self, pantalla, offset):
-        surf = pygame.Surface((self.radio*3, self.radio*3), pygame.SRCALPHA)
-        cx = cy = self.radio * 1.5
-        pygame.draw.circle(surf, (*COLOR_ENEMIGO, 90), (int(cx), int(cy)), int(self.radio+6))
-        pygame.draw.circle(surf, COLOR_ENEMIGO, (int(cx), int(cy)), int(self.radio))
-        pantalla.blit(surf, (self.pos.x - cx + offset[0], self.pos.y - cy + offset[1]))
+                sprite = None
+        if sprite is None:
+            c = self.radio * escala * 1.5
+            lote.append((Enemigo.sprite_fallback(self.radio, escala), (self.pos.x * escala - c + offset[0], self.pos.y * escala - c + offset[1])))
+
+        nivel = self.nivel_barra()
+        if nivel < BARRA_VIDA_NIVELES:
+            x = int((self.pos.x - 17) * escala + offset[0])
+            y = int((self.pos.y - self.radio - 14) * escala + offset[1])
+            lote.append((Enemigo.barra(nivel, escala), (x, y)))
+
+    def dibujar(self, pantalla, offset=(0,0), img=None, escala=1.0):
+        lote = []
+        self.agregar_blits(lote, offset, img, escala)
+        pantalla.blits(lote, doreturn=False)
+
+
+registro.al_cambiar(Enemigo._sprites.clear)
+registro.al_cambiar(Enemigo._barras.clear)
 
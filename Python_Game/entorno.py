@@ -0,0 +1,486 @@
+import sys
+import math
+import random
+import logging
+import numpy as np
+
+from config import (
+    MUNDO_ANCHO, MUNDO_ALTO, FPS,
+    VEL_NAVE, ROTACION_SUAVIZADO, RADIO_NAVE, VIDA_NAVE,
+    DANIO_LASER, COOLDOWN_LASER, VELOCIDAD_LASER,
+    DANIO_BEAM_POR_SEG, ALCANCE_BEAM,
+    DANIO_MISIL, VELOCIDAD_MISIL, CADENCIA_MISIL, RADIO_EXPLOSION,
+    RADIO_ENEMIGO, VIDA_ENEMIGO,
+    CANT_ENEMIGOS_INICIAL, MAX_ENEMIGOS_EN_PANTALLA,
+    VELOCIDAD_BASE_ENEMIGO, VELOCIDAD_MAXIMA_ENEMIGO, VELOCIDAD_INCREMENTO_POR_MUERTE,
+    SPAWN_INTERVAL_BASE, SPAWN_INTERVAL_MINIMO, SPAWN_REDUCCION_POR_MUERTE,
+    ENTORNO_RECOMPENSA_MUERTE, ENTORNO_PENALIZACION_NAVE,
+)
+from utils import primer_impacto
+
+logger = logging.getLogger("Naves")
+
+# K mundos independientes en arrays apilados, avanzados en lockstep con las
+# mismas reglas que logic.simular_frame (sin partículas, sonido ni pantalla).
+# Las entidades de cada mundo ocupan los primeros n slots de su fila, en el
+# mismo orden que tendrían las listas de `entidades`.
+
+# Columnas del array de acciones (K, ACCION_DIM)
+MOV_X, MOV_Y, APUNTE_X, APUNTE_Y, LASER, HAZ, MISILES = range(7)
+ACCION_DIM = 7
+
+# Un proyectil vive a lo sumo lo que tarda en cruzar la diagonal de la pantalla
+_DIAGONAL = math.hypot(MUNDO_ANCHO, MUNDO_ALTO)
+CAP_LASERS = math.ceil(_DIAGONAL / VELOCIDAD_LASER / COOLDOWN_LASER) + 2
+CAP_MISILES = math.ceil(_DIAGONAL / VELOCIDAD_MISIL / CADENCIA_MISIL) + 2
+
+OBS_NAVE = 9
+OBS_ENEMIGO = 5
+OBS_DIM = OBS_NAVE + OBS_ENEMIGO * MAX_ENEMIGOS_EN_PANTALLA
+
+
+def _normalizar(v):
+    # Igual que Vector2.normalize(); los vectores nulos pasan a (1, 0) como en LaserShot/Misil
+    largo = np.sqrt(v[:, 0] * v[:, 0] + v[:, 1] * v[:, 1])
+    nulo = largo == 0
+    v = np.where(nulo[:, None], (1.0, 0.0), v)
+    largo = np.where(nulo, 1.0, largo)
+    return v / largo[:, None]
+
+
+def _compactar(n, vivos, *arrays):
+    # Mueve los slots vivos al frente conservando el orden (como filtrar una lista)
+    orden = np.argsort(~vivos, axis=1, kind='stable')
+    for a in arrays:
+        extra = orden.reshape(orden.shape + (1,) * (a.ndim - 2))
+        a[...] = np.take_along_axis(a, extra, axis=1)
+    n[:] = vivos.sum(axis=1)
+
+
+def _dentro(pos):
+    x, y = pos[..., 0], pos[..., 1]
+    return (0 <= x) & (x <= MUNDO_ANCHO) & (0 <= y) & (y <= MUNDO_ALTO)
+
+
+def _restar_repetido(vida, impactos, danio):
+    # Resta `danio` una vez por impacto, en secuencia, para redondear igual que la versión escalar
+    for j in range(int(impactos.max(initial=0))):
+        vida -= np.where(impactos > j, danio, 0.0)
+
+
+class EntornoVectorizado:
+    def __init__(self, mundos, semilla=None, auto_reinicio=True):
+        self.k = mundos
+        self.auto_reinicio = auto_reinicio
+        self.rng = np.random.default_rng(semilla)
+        k, e = mundos, MAX_ENEMIGOS_EN_PANTALLA
+
+        self.nave_pos = np.zeros((k, 2))
+        self.nave_vel = np.zeros((k, 2))
+        self.nave_angulo = np.zeros(k)
+        self.laser_timer = np.zeros(k)
+        self.misil_timer = np.zeros(k)
+        self.nave_vida = np.zeros(k)
+        self.nave_viva = np.zeros(k, bool)
+        self.misiles_activos = np.zeros(k, bool)
+
+        self.enemigo_pos = np.zeros((k, e, 2))
+        self.enemigo_vel = np.zeros((k, e, 2))
+        self.enemigo_vida = np.zeros((k, e))
+        self.enemigo_max_vida = np.zeros((k, e))
+        self.enemigo_wobble = np.zeros((k, e))
+        self.n_enemigos = np.zeros(k, np.int64)
+
+        # *_ant: posición al inicio del paso, para las pruebas barridas
+        self.laser_pos = np.zeros((k, CAP_LASERS, 2))
+        self.laser_ant = np.zeros((k, CAP_LASERS, 2))
+        self.laser_vel = np.zeros((k, CAP_LASERS, 2))
+        self.n_lasers = np.zeros(k, np.int64)
+        self.misil_pos = np.zeros((k, CAP_MISILES, 2))
+        self.misil_ant = np.zeros((k, CAP_MISILES, 2))
+        self.misil_vel = np.zeros((k, CAP_MISILES, 2))
+        self.n_misiles = np.zeros(k, np.int64)
+
+        self.muertes = np.zeros(k, np.int64)
+        self.velocidad_enemigos = np.zeros(k)
+        self.spawn_interval = np.zeros(k)
+        self.tiempo_spawn = np.zeros(k)
+        # Reloj de simulación del bamboleo de los enemigos (el juego usa time.time())
+        self.tiempo = np.zeros(k)
+        self.pasos = np.zeros(k, np.int64)
+
+        self.spawneados = np.zeros(k, bool)
+        self.disparos_descartados = 0
+        self.reiniciar()
+
+    def reiniciar(self, mascara=None):
+        idx = np.arange(self.k) if mascara is None else np.flatnonzero(mascara)
+        if len(idx) == 0:
+            return self.observaciones()
+        self.nave_pos[idx] = (MUNDO_ANCHO / 2, MUNDO_ALTO / 2)
+        self.nave_vel[idx] = 0.0
+        self.nave_angulo[idx] = 0.0
+        self.laser_timer[idx] = 0.0
+        self.misil_timer[idx] = 0.0
+        self.nave_vida[idx] = VIDA_NAVE
+        self.nave_viva[idx] = True
+        self.misiles_activos[idx] = False
+
+        self.n_enemigos[idx] = 0
+        self.n_lasers[idx] = 0
+        self.n_misiles[idx] = 0
+        self.muertes[idx] = 0
+        self.velocidad_enemigos[idx] = VELOCIDAD_BASE_ENEMIGO
+        self.spawn_interval[idx] = SPAWN_INTERVAL_BASE
+        self.tiempo_spawn[idx] = 0.0
+        self.tiempo[idx] = 0.0
+        self.pasos[idx] = 0
+        for _ in range(CANT_ENEMIGOS_INICIAL):
+            self._agregar_enemigos(idx)
+        return self.observaciones()
+
+    def cargar_mundo(self, k, entidades, stats):
+        # Copia un mundo de logic.py (listas de entidades + stats) al slot k
+        nave = entidades['nave']
+        self.nave_pos[k] = nave.pos
+        self.nave_vel[k] = nave.vel
+        self.nave_angulo[k] = nave.angle
+        self.laser_timer[k] = nave.laser_timer
+        self.misil_timer[k] = nave.misil_timer
+        self.nave_vida[k] = nave.health
+        self.nave_viva[k] = nave.alive
+        self.misiles_activos[k] = nave.misiles_activos
+
+        enemigos = [e for e in entidades['enemigos'] if e.vivo][:MAX_ENEMIGOS_EN_PANTALLA]
+        self.n_enemigos[k] = len(enemigos)
+        for i, e in enumerate(enemigos):
+            self.enemigo_pos[k, i] = e.pos
+            self.enemigo_vel[k, i] = e.vel
+            self.enemigo_vida[k, i] = e.vida
+            self.enemigo_max_vida[k, i] = e.max_vida
+            self.enemigo_wobble[k, i] = e.wobble
+        for clave, pos, ant, vel, n in (('lasers', self.laser_pos, self.laser_ant, self.laser_vel, self.n_lasers),
+                                        ('misiles', self.misil_pos, self.misil_ant, self.misil_vel, self.n_misiles)):
+            proyectiles = [p for p in entidades[clave] if p.vivo][:pos.shape[1]]
+            n[k] = len(proyectiles)
+            for i, p in enumerate(proyectiles):
+                pos[k, i] = p.pos
+                ant[k, i] = p.pos_anterior
+                vel[k, i] = p.vel
+
+        self.muertes[k] = stats['muertes_totales']
+        self.velocidad_enemigos[k] = stats['velocidad_enemigos']
+        self.spawn_interval[k] = stats['spawn_interval']
+        self.tiempo_spawn[k] = stats['tiempo_spawn']
+
+    def _agregar_enemigos(self, idx):
+        idx = idx[self.n_enemigos[idx] < MAX_ENEMIGOS_EN_PANTALLA]
+        m = len(idx)
+        slot = self.n_enemigos[idx]
+        velocidad = self.velocidad_enemigos[idx, None]
+        self.enemigo_pos[idx, slot] = self.rng.uniform((0.0, 0.0), (MUNDO_ANCHO, MUNDO_ALTO), (m, 2))
+        self.enemigo_vel[idx, slot] = self.rng.uniform(-1.0, 1.0, (m, 2)) * velocidad
+        self.enemigo_vida[idx, slot] = VIDA_ENEMIGO
+        self.enemigo_max_vida[idx, slot] = VIDA_ENEMIGO
+        self.enemigo_wobble[idx, slot] = self.rng.random(m) * 200
+        self.n_enemigos[idx] += 1
+        return idx
+
+    def _agregar_proyectiles(self, dispara, origen, direccion, velocidad, pos, ant, vel, n):
+        lleno = n >= pos.shape[1]
+        self.disparos_descartados += int((dispara & lleno).sum())
+        idx = np.flatnonzero(dispara & ~lleno)
+        slot = n[idx]
+        pos[idx, slot] = origen[idx]
+        ant[idx, slot] = origen[idx]
+        vel[idx, slot] = _normalizar(direccion[idx]) * velocidad
+        n[idx] += 1
+
+    def paso(self, acciones, dt=1.0 / FPS):
+        acciones = np.asarray(acciones, np.float64)
+        muertes_previas = self.muertes.copy()
+        viva_previa = self.nave_viva.copy()
+
+        haz = self._procesar_inputs(acciones, dt)
+        self._actualizar_proyectiles(dt)
+        self._procesar_colisiones(acciones, haz, dt)
+        self._actualizar_enemigos(dt)
+        self.pasos += 1
+
+        recompensas = (self.muertes - muertes_previas) * ENTORNO_RECOMPENSA_MUERTE
+        recompensas += np.where(viva_previa & ~self.nave_viva, ENTORNO_PENALIZACION_NAVE, 0.0)
+        terminados = ~self.nave_viva
+        if self.auto_reinicio and terminados.any():
+            self.reiniciar(terminados)
+        return self.observaciones(), recompensas.astype(np.float32), terminados
+
+    def _procesar_inputs(self, acciones, dt):
+        # procesar_inputs + Nave.actualizar; las naves muertas no se actualizan
+        viva = self.nave_viva
+        mov = np.clip(np.rint(acciones[:, MOV_X:MOV_Y + 1]), -1, 1)
+        largo = np.sqrt(mov[:, 0] * mov[:, 0] + mov[:, 1] * mov[:, 1])
+        direccion = mov / np.where(largo > 0, largo, 1.0)[:, None]
+        vel = direccion * VEL_NAVE
+        pos = self.nave_pos + vel * dt
+        pos[:, 0] %= MUNDO_ANCHO
+        pos[:, 1] %= MUNDO_ALTO
+        self.nave_vel[viva] = vel[viva]
+        self.nave_pos[viva] = pos[viva]
+
+        apunte = acciones[:, APUNTE_X:APUNTE_Y + 1]
+        objetivo = apunte - self.nave_pos
+        apunta = viva & (objetivo[:, 0] * objetivo[:, 0] + objetivo[:, 1] * objetivo[:, 1] > 0)
+        ang_deseado = np.degrees(np.arctan2(-objetivo[:, 1], objetivo[:, 0]))
+        diff = (ang_deseado - self.nave_angulo + 180) % 360 - 180
+        self.nave_angulo = np.where(apunta, self.nave_angulo + diff * ROTACION_SUAVIZADO, self.nave_angulo)
+        self.laser_timer[viva] -= dt
+        self.misil_timer[viva] -= dt
+
+        dispara = viva & (acciones[:, LASER] > 0.5) & (self.laser_timer <= 0)
+        self.laser_timer[dispara] = COOLDOWN_LASER
+        self._agregar_proyectiles(dispara, self.nave_pos, objetivo, VELOCIDAD_LASER,
+                                  self.laser_pos, self.laser_ant, self.laser_vel, self.n_lasers)
+
+        self.misiles_activos[viva] = acciones[viva, MISILES] > 0.5
+        dispara = viva & self.misiles_activos & (self.misil_timer <= 0)
+        self.misil_timer[dispara] = CADENCIA_MISIL
+        self._agregar_proyectiles(dispara, self.nave_pos, objetivo, VELOCIDAD_MISIL,
+                                  self.misil_pos, self.misil_ant, self.misil_vel, self.n_misiles)
+
+        return viva & (acciones[:, HAZ] > 0.5)
+
+    def _actualizar_proyectiles(self, dt):
+        for pos, ant, vel, n in ((self.laser_pos, self.laser_ant, self.laser_vel, self.n_lasers),
+                                 (self.misil_pos, self.misil_ant, self.misil_vel, self.n_misiles)):
+            # Los que salen del mundo se descartan después de las colisiones
+            ant[...] = pos
+            pos += vel * dt
+
+    def _desplazamiento_enemigos(self, dt):
+        # Igual que Enemigo.desplazamiento con el reloj que usará _actualizar_enemigos
+        wob = np.sin((self.tiempo + dt)[:, None] + self.enemigo_wobble) * 40
+        vel = self.enemigo_vel
+        return np.stack(((vel[..., 0] + wob) * dt, (vel[..., 1] + -wob * 0.3) * dt), axis=-1)
+
+    def _primeros_impactos(self, pos, ant, n, desplazamientos):
+        # Igual que logic.primeros_impactos: (K, P) índice del primer enemigo tocado (-1 si ninguno) y t
+        activos = np.arange(pos.shape[1]) < n[:, None]
+        enemigos = np.arange(MAX_ENEMIGOS_EN_PANTALLA) < self.n_enemigos[:, None]
+        radios = np.full(self.enemigo_vida.shape, RADIO_ENEMIGO, np.float64)
+        indice, t = primer_impacto(ant, pos, self.enemigo_pos, radios,
+                                   activos[:, :, None] & enemigos[:, None, :], desplazamientos)
+        return indice, t
+
+    def _procesar_colisiones(self, acciones, haz, dt):
+        # Todos los enemigos de la lista empiezan el frame vivos; los que mueren
+        # siguen en la lista (y chocan con la nave) hasta _actualizar_enemigos.
+        en_lista = np.arange(MAX_ENEMIGOS_EN_PANTALLA) < self.n_enemigos[:, None]
+        vida = self.enemigo_vida
+        desplazamientos = self._desplazamiento_enemigos(dt)
+
+        indice, _ = self._primeros_impactos(self.laser_pos, self.laser_ant, self.n_lasers, desplazamientos)
+        impactos = indice[:, :, None] == np.arange(MAX_ENEMIGOS_EN_PANTALLA)
+        _restar_repetido(vida, impactos.sum(axis=1), DANIO_LASER)
+        _compactar(self.n_lasers,
+                   (np.arange(CAP_LASERS) < self.n_lasers[:, None]) & (indice < 0) & _dentro(self.laser_pos),
+                   self.laser_pos, self.laser_ant, self.laser_vel)
+
+        # Los misiles explotan en el punto de contacto del segmento barrido
+        indice, t = self._primeros_impactos(self.misil_pos, self.misil_ant, self.n_misiles, desplazamientos)
+        explota = indice >= 0
+        t = np.where(explota, t, 0.0)[..., None]
+        punto = self.misil_ant + t * (self.misil_pos - self.misil_ant)
+        d = self.enemigo_pos[:, None, :, :] - punto[:, :, None, :]
+        area = np.sqrt(d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1]) <= RADIO_EXPLOSION
+        area &= explota[:, :, None] & en_lista[:, None, :]
+        _restar_repetido(vida, area.sum(axis=1), DANIO_MISIL)
+        _compactar(self.n_misiles,
+                   (np.arange(CAP_MISILES) < self.n_misiles[:, None]) & ~explota & _dentro(self.misil_pos),
+                   self.misil_pos, self.misil_ant, self.misil_vel)
+
+        dir_beam = acciones[:, APUNTE_X:APUNTE_Y + 1] - self.nave_pos
+        dist = np.sqrt(dir_beam[:, 0] * dir_beam[:, 0] + dir_beam[:, 1] * dir_beam[:, 1])
+        dist = np.where(dist == 0, 1.0, dist)
+        dir_norm = _normalizar(dir_beam)
+        rel = self.enemigo_pos - self.nave_pos[:, None, :]
+        t = rel[..., 0] * dir_norm[:, None, 0] + rel[..., 1] * dir_norm[:, None, 1]
+        perp = rel - dir_norm[:, None, :] * t[..., None]
+        perp = np.sqrt(perp[..., 0] * perp[..., 0] + perp[..., 1] * perp[..., 1])
+        en_haz = (0 <= t) & (t <= np.minimum(ALCANCE_BEAM, dist)[:, None]) & (perp <= RADIO_ENEMIGO + 6)
+        en_haz &= haz[:, None] & en_lista
+        vida -= np.where(en_haz, DANIO_BEAM_POR_SEG * dt, 0.0)
+
+        self.muertes += (en_lista & (vida <= 0)).sum(axis=1)
+        self.velocidad_enemigos = np.minimum(
+            VELOCIDAD_MAXIMA_ENEMIGO, VELOCIDAD_BASE_ENEMIGO + self.muertes * VELOCIDAD_INCREMENTO_POR_MUERTE)
+        self.spawn_interval = np.maximum(
+            SPAWN_INTERVAL_MINIMO, SPAWN_INTERVAL_BASE - self.muertes * SPAWN_REDUCCION_POR_MUERTE)
+
+        d = self.nave_pos[:, None, :] - self.enemigo_pos
+        choque = (d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1] <= (RADIO_NAVE + RADIO_ENEMIGO) ** 2) & en_lista
+        choca = self.nave_viva & choque.any(axis=1)
+        self.nave_viva[choca] = False
+        self.nave_vida[choca] = 0
+
+    def _actualizar_enemigos(self, dt):
+        self.tiempo += dt
+        wob = np.sin(self.tiempo[:, None] + self.enemigo_wobble) * 40
+        vel = self.enemigo_vel
+        self.enemigo_pos[..., 0] += (vel[..., 0] + wob) * dt
+        self.enemigo_pos[..., 1] += (vel[..., 1] + -wob * 0.3) * dt
+        x, y = self.enemigo_pos[..., 0], self.enemigo_pos[..., 1]
+        vel[..., 0] *= np.where((x < 0) | (x > MUNDO_ANCHO), -1.0, 1.0)
+        vel[..., 1] *= np.where((y < 0) | (y > MUNDO_ALTO), -1.0, 1.0)
+
+        vivos = (np.arange(MAX_ENEMIGOS_EN_PANTALLA) < self.n_enemigos[:, None]) & (self.enemigo_vida > 0)
+        _compactar(self.n_enemigos, vivos, self.enemigo_pos, self.enemigo_vel, self.enemigo_vida,
+                   self.enemigo_max_vida, self.enemigo_wobble)
+
+        self.tiempo_spawn += dt
+        toca = self.tiempo_spawn >= self.spawn_interval
+        self.tiempo_spawn[toca] = 0.0
+        self.spawneados[:] = False
+        self.spawneados[self._agregar_enemigos(np.flatnonzero(toca))] = True
+
+    def observaciones(self):
+        # float32 (K, OBS_DIM): nave normalizada + enemigos relativos a la nave (slots vacíos en cero)
+        obs = np.zeros((self.k, OBS_DIM), np.float32)
+        ang = np.radians(self.nave_angulo)
+        obs[:, 0] = self.nave_pos[:, 0] / MUNDO_ANCHO
+        obs[:, 1] = self.nave_pos[:, 1] / MUNDO_ALTO
+        obs[:, 2:4] = self.nave_vel / VEL_NAVE
+        obs[:, 4] = np.cos(ang)
+        obs[:, 5] = np.sin(ang)
+        obs[:, 6] = np.clip(self.laser_timer / COOLDOWN_LASER, 0, 1)
+        obs[:, 7] = np.clip(self.misil_timer / CADENCIA_MISIL, 0, 1)
+        obs[:, 8] = self.nave_viva
+
+        activos = np.arange(MAX_ENEMIGOS_EN_PANTALLA) < self.n_enemigos[:, None]
+        enemigos = obs[:, OBS_NAVE:].reshape(self.k, MAX_ENEMIGOS_EN_PANTALLA, OBS_ENEMIGO)
+        rel = self.enemigo_pos - self.nave_pos[:, None, :]
+        enemigos[..., 0] = rel[..., 0] / MUNDO_ANCHO
+        enemigos[..., 1] = rel[..., 1] / MUNDO_ALTO
+        enemigos[..., 2:4] = self.enemigo_vel / VELOCIDAD_MAXIMA_ENEMIGO
+        enemigos[..., 4] = self.enemigo_vida / VIDA_ENEMIGO
+        enemigos[~activos] = 0.0
+        return obs
+
+    def acciones_aleatorias(self, prob_laser=0.5, prob_haz=0.2, prob_misiles=0.3):
+        acciones = np.zeros((self.k, ACCION_DIM))
+        acciones[:, MOV_X:MOV_Y + 1] = self.rng.integers(-1, 2, (self.k, 2))
+        acciones[:, APUNTE_X] = self.rng.uniform(0, MUNDO_ANCHO, self.k)
+        acciones[:, APUNTE_Y] = self.rng.uniform(0, MUNDO_ALTO, self.k)
+        acciones[:, LASER] = self.rng.random(self.k) < prob_laser
+        acciones[:, HAZ] = self.rng.random(self.k) < prob_haz
+        acciones[:, MISILES] = self.rng.random(self.k) < prob_misiles
+        return acciones
+
+
+def _teclas_accion(accion):
+    import pygame
+    mov_x, mov_y = int(np.rint(accion[MOV_X])), int(np.rint(accion[MOV_Y]))
+    return {pygame.K_a: mov_x < 0, pygame.K_d: mov_x > 0, pygame.K_w: mov_y < 0, pygame.K_s: mov_y > 0}
+
+
+def _comparar(entorno, k, entidades, stats, tol):
+    nave = entidades['nave']
+    enemigos = [e for e in entidades['enemigos'] if e.vivo]
+    lasers = [l for l in entidades['lasers'] if l.vivo]
+    misiles = [m for m in entidades['misiles'] if m.vivo]
+    pares = [
+        ('nave.pos', entorno.nave_pos[k], tuple(nave.pos)),
+        ('nave.angle', entorno.nave_angulo[k], nave.angle),
+        ('nave.laser_timer', entorno.laser_timer[k], nave.laser_timer),
+        ('nave.misil_timer', entorno.misil_timer[k], nave.misil_timer),
+        ('nave.alive', entorno.nave_viva[k], nave.alive),
+        ('muertes', entorno.muertes[k], stats['muertes_totales']),
+        ('spawn_interval', entorno.spawn_interval[k], stats['spawn_interval']),
+        ('tiempo_spawn', entorno.tiempo_spawn[k], stats['tiempo_spawn']),
+        ('n_enemigos', entorno.n_enemigos[k], len(enemigos)),
+        ('n_lasers', entorno.n_lasers[k], len(lasers)),
+        ('n_misiles', entorno.n_misiles[k], len(misiles)),
+    ]
+    if len(enemigos) == entorno.n_enemigos[k]:
+        n = len(enemigos)
+        pares += [
+            ('enemigos.pos', entorno.enemigo_pos[k, :n], [tuple(e.pos) for e in enemigos]),
+            ('enemigos.vel', entorno.enemigo_vel[k, :n], [tuple(e.vel) for e in enemigos]),
+            ('enemigos.vida', entorno.enemigo_vida[k, :n], [e.vida for e in enemigos]),
+        ]
+    if len(lasers) == entorno.n_lasers[k]:
+        pares.append(('lasers.pos', entorno.laser_pos[k, :len(lasers)], [tuple(l.pos) for l in lasers]))
+    if len(misiles) == entorno.n_misiles[k]:
+        pares.append(('misiles.pos', entorno.misil_pos[k, :len(misiles)], [tuple(m.pos) for m in misiles]))
+
+    errores = []
+    for nombre, vectorizado, referencia in pares:
+        vectorizado = np.asarray(vectorizado, np.float64)
+        referencia = np.asarray(referencia, np.float64).reshape(vectorizado.shape)
+        if not np.allclose(vectorizado, referencia, rtol=0, atol=tol):
+            errores.append(f"{nombre}: {vectorizado.tolist()} != {referencia.tolist()}")
+    return errores
+
+
+def verificar_paridad(mundos=8, pasos=600, dt=1.0 / FPS, semilla=0, tol=1e-6):
+    # Avanza `mundos` mundos de referencia (logic.simular_frame) y el entorno
+    # vectorizado con las mismas acciones, y compara el estado tras cada paso.
+    # Las posiciones/velocidades de los enemigos recién creados salen del
+    # `random` de la referencia y se copian al entorno: lo demás es independiente.
+    # Devuelve una lista de discrepancias (vacía si hay paridad).
+    from entities import Nave, Enemigo
+    from logic import simular_frame
+
+    random.seed(semilla)
+    entorno = EntornoVectorizado(mundos, semilla, auto_reinicio=False)
+    referencias = []
+    for k in range(mundos):
+        entidades = {
+            'nave': Nave((MUNDO_ANCHO / 2, MUNDO_ALTO / 2)),
+            'lasers': [], 'misiles': [], 'estelas': [], 'particles': [],
+            'enemigos': [Enemigo(VELOCIDAD_BASE_ENEMIGO) for _ in range(CANT_ENEMIGOS_INICIAL)],
+            'stars': [], 'nebulas': [], 'fogs': [],
+        }
+        stats = {
+            'muertes_totales': 0,
+            'velocidad_enemigos': float(VELOCIDAD_BASE_ENEMIGO),
+            'spawn_interval': SPAWN_INTERVAL_BASE,
+            'tiempo_spawn': 0.0,
+        }
+        entorno.cargar_mundo(k, entidades, stats)
+        referencias.append((entidades, stats))
+
+    sin_shake = lambda intensidad, duracion: None
+    for paso in range(pasos):
+        acciones = entorno.acciones_aleatorias()
+        tiempo = entorno.tiempo + dt
+        entorno.paso(acciones, dt)
+        for k, (entidades, stats) in enumerate(referencias):
+            accion = acciones[k]
+            nave = entidades['nave']
+            if nave.alive:
+                nave.misiles_activos = bool(accion[MISILES] > 0.5)
+            botones = (bool(accion[LASER] > 0.5), False, bool(accion[HAZ] > 0.5))
+            simular_frame(entidades, {}, stats, dt, (accion[APUNTE_X], accion[APUNTE_Y]), sin_shake,
+                          botones=botones, teclas=_teclas_accion(accion), tiempo=tiempo[k])
+            entidades['particles'].clear()
+
+            if entorno.spawneados[k] and entidades['enemigos']:
+                nuevo, i = entidades['enemigos'][-1], entorno.n_enemigos[k] - 1
+                entorno.enemigo_pos[k, i] = nuevo.pos
+                entorno.enemigo_vel[k, i] = nuevo.vel
+                entorno.enemigo_wobble[k, i] = nuevo.wobble
+
+            errores = _comparar(entorno, k, entidades, stats, tol)
+            if errores:
+                return [f"paso {paso}, mundo {k}: {error}" for error in errores]
+    return []
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    errores = verificar_paridad()
+    for error in errores:
+        logger.error(error)
+    if not errores:
+        logger.info("Paridad OK entre EntornoVectorizado y logic.simular_frame")
+    sys.exit(1 if errores else 0)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from config import EVENTOS_CAPACIDAD
+
+# Tipos de evento de juego
+IMPACTO = 0          # un proyectil o el haz dañó a un enemigo
+MUERTE = 1           # un enemigo murió
+EXPLOSION = 2        # un misil explotó
+NAVE_DESTRUIDA = 3
+TIPOS_EVENTO = 4
+
+# Origen de un IMPACTO (decide las partículas)
+FUENTE_LASER = 0
+FUENTE_HAZ = 1
+
+
+class ColaEventos:
+    # Cola de eventos en columnas preallocadas (tipo, fuente, x, y). La etapa de
+    # colisiones solo agrega filas; logic.drenar_eventos la recorre una vez por
+    # frame con consumidores por lotes y la vacía. Crece al doble si se llena.
+    def __init__(self, capacidad=EVENTOS_CAPACIDAD):
+        self.tipo = np.empty(capacidad, np.uint8)
+        self.fuente = np.empty(capacidad, np.uint8)
+        self.pos = np.empty((capacidad, 2), np.float64)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def _crecer(self):
+        capacidad = len(self.tipo) * 2
+        for nombre in ('tipo', 'fuente', 'pos'):
+            viejo = getattr(self, nombre)
+            nuevo = np.empty((capacidad,) + viejo.shape[1:], viejo.dtype)
+            nuevo[:self.n] = viejo[:self.n]
+            setattr(self, nombre, nuevo)
+
+    def emitir(self, tipo, pos, fuente=0):
+        n = self.n
+        if n == len(self.tipo):
+            self._crecer()
+        self.tipo[n] = tipo
+        self.fuente[n] = fuente
+        self.pos[n] = pos.x, pos.y
+        self.n = n + 1
+
+    def seleccionar(self, tipo, fuente=None):
+        # Posiciones (k, 2) de los eventos de ese tipo (y fuente)
+        mascara = self.tipo[:self.n] == tipo
+        if fuente is not None:
+            mascara &= self.fuente[:self.n] == fuente
+        return self.pos[:self.n][mascara]
+
+    def conteos(self):
+        # Cantidad de eventos por tipo, indexada por tipo
+        return np.bincount(self.tipo[:self.n], minlength=TIPOS_EVENTO).tolist()
+
+    def vaciar(self):
+        self.n = 0
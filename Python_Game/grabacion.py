@@ -0,0 +1,181 @@
+import os
+import sys
+import time
+import zlib
+import queue
+import struct
+import logging
+import threading
+import numpy as np
+import pygame
+
+from config import ANCHO, ALTO, FPS, GRABACION_BUFFERS, GRABACION_NIVEL_PNG
+
+logger = logging.getLogger("Naves")
+
+FORMATOS_GRABACION = ('raw', 'png')
+
+
+def _chunk_png(tipo, datos):
+    return struct.pack('>I', len(datos)) + tipo + datos + struct.pack('>I', zlib.crc32(tipo + datos) & 0xffffffff)
+
+
+def codificar_png(rgb, nivel=GRABACION_NIVEL_PNG):
+    # PNG RGB8 sin filtros; zlib.compress suelta el GIL mientras comprime
+    alto, ancho, _ = rgb.shape
+    filas = np.empty((alto, ancho * 3 + 1), np.uint8)
+    filas[:, 0] = 0
+    filas[:, 1:] = rgb.reshape(alto, -1)
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        _chunk_png(b'IHDR', struct.pack('>IIBBBBB', ancho, alto, 8, 2, 0, 0, 0)),
+        _chunk_png(b'IDAT', zlib.compress(filas.tobytes(), nivel)),
+        _chunk_png(b'IEND', b''),
+    ))
+
+
+class Grabador:
+    # El hilo principal solo hace una copia por frame: toma un buffer libre del
+    # pool, copia ahí el frame final (blit o lectura del renderer) y lo encola.
+    # Si no hay buffer libre, el frame se descarta y se cuenta: nunca se espera
+    # al disco. Un hilo escritor vacía la cola y devuelve los buffers al pool.
+    #   raw  frames.raw con los píxeles tal cual (ver frames.txt para ffmpeg)
+    #   png  frame_NNNNNN.png; los huecos en la numeración son frames descartados
+    def __init__(self, directorio, formato='raw', buffers=GRABACION_BUFFERS, tam=(ANCHO, ALTO)):
+        if formato not in FORMATOS_GRABACION:
+            raise ValueError(f"Formato de grabación desconocido: {formato}")
+        self.directorio = directorio
+        self.formato = formato
+        self.tam = tam
+        self._pool = [pygame.Surface(tam, 0, 32) for _ in range(buffers)]
+        self._libres = queue.SimpleQueue()
+        for buf in self._pool:
+            self._libres.put(buf)
+        self._pendientes = queue.Queue(maxsize=buffers)
+        self.frame = 0
+        self.capturados = 0
+        self.descartados = 0
+        self.escritos = 0
+        self.errores = 0
+        self._archivo = self._indices = None
+        self._hilo = threading.Thread(target=self._bucle, name="grabacion", daemon=True)
+
+    def _orden_bytes(self):
+        # Posición de cada canal dentro del píxel de 4 bytes, según las máscaras de la Surface
+        shifts = self._pool[0].get_shifts()
+        if sys.byteorder == 'little':
+            return [s // 8 for s in shifts[:3]]
+        return [3 - s // 8 for s in shifts[:3]]
+
+    def iniciar(self):
+        # Directorio y archivos se abren aquí, en el hilo principal: si fallan,
+        # la excepción le llega a quien pidió grabar y el escritor no arranca
+        os.makedirs(self.directorio, exist_ok=True)
+        if self.formato == 'raw':
+            try:
+                self._archivo = open(os.path.join(self.directorio, 'frames.raw'), 'wb')
+                self._indices = open(os.path.join(self.directorio, 'frames_indices.txt'), 'w')
+            except OSError:
+                self._cerrar_archivos()
+                raise
+        self._t_inicio = time.perf_counter()
+        self._hilo.start()
+        logger.info(f"Grabando ({self.formato}) en {self.directorio}")
+
+    def capturar(self, copiar):
+        # `copiar(destino)` vuelca el frame final en la Surface `destino`
+        indice = self.frame
+        self.frame += 1
+        try:
+            buf = self._libres.get_nowait()
+        except queue.Empty:
+            self.descartados += 1
+            return False
+        try:
+            copiar(buf)
+        except Exception:
+            self._libres.put(buf)
+            self.errores += 1
+            logger.exception("Error copiando el frame a grabar")
+            return False
+        self._pendientes.put_nowait((indice, buf))
+        self.capturados += 1
+        return True
+
+    def _bajar_prioridad(self):
+        # Igual que el muestreador de métricas: el escritor no debe competir con el juego
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            logger.debug("No se pudo bajar la prioridad del hilo de grabación")
+
+    def _cerrar_archivos(self):
+        for archivo in (self._archivo, self._indices):
+            if archivo:
+                archivo.close()
+        self._archivo = self._indices = None
+
+    def _bucle(self):
+        archivo, indices = self._archivo, self._indices
+        try:
+            self._bajar_prioridad()
+            ancho, alto = self.tam
+            r, g, b = self._orden_bytes()
+            while True:
+                item = self._pendientes.get()
+                if item is None:
+                    break
+                indice, buf = item
+                try:
+                    vista = buf.get_view('0')
+                    pixeles = np.frombuffer(vista, np.uint8).reshape(alto, buf.get_pitch())[:, :ancho * 4]
+                    if archivo:
+                        # Sin relleno por fila se escribe la vista tal cual, sin copiar
+                        archivo.write(pixeles.data if pixeles.flags.c_contiguous else pixeles.tobytes())
+                        indices.write(f"{indice}\n")
+                    else:
+                        rgb = pixeles.reshape(alto, ancho, 4)[:, :, [r, g, b]]
+                        ruta = os.path.join(self.directorio, f"frame_{indice:06d}.png")
+                        with open(ruta, 'wb') as f:
+                            f.write(codificar_png(rgb))
+                    self.escritos += 1
+                except Exception:
+                    self.errores += 1
+                    logger.exception("Error escribiendo frame grabado")
+                finally:
+                    pixeles = vista = None
+                    self._libres.put(buf)
+        except Exception:
+            logger.exception("El hilo de grabación terminó por un error")
+        finally:
+            self._cerrar_archivos()
+
+    def _escribir_descripcion(self, duracion):
+        canales = ['0'] * 4
+        r, g, b = self._orden_bytes()
+        canales[r], canales[g], canales[b] = 'r', 'g', 'b'
+        formato_pixel = ''.join(canales)
+        ancho, alto = self.tam
+        with open(os.path.join(self.directorio, 'frames.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"tam: {ancho}x{alto}\nformato: {self.formato}\n")
+            f.write(f"frames: {self.frame} capturados: {self.capturados} descartados: {self.descartados} "
+                    f"escritos: {self.escritos} errores: {self.errores}\n")
+            f.write(f"fps efectivos: {self.frame / duracion if duracion > 0 else 0:.1f}\n")
+            if self.formato == 'raw':
+                f.write(f"ffmpeg -f rawvideo -pix_fmt {formato_pixel} -s {ancho}x{alto} -r {FPS} "
+                        f"-i frames.raw -pix_fmt yuv420p grabacion.mp4\n")
+
+    def detener(self):
+        # Si el escritor murió nadie vacía la cola: no se bloquea esperándolo
+        while self._hilo.is_alive():
+            try:
+                self._pendientes.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._hilo.join()
+        duracion = time.perf_counter() - self._t_inicio
+        self._escribir_descripcion(duracion)
+        logger.info(f"Grabación terminada: {self.capturados} frames capturados, {self.descartados} descartados, "
+                    f"{self.escritos} escritos en {self.directorio}")
+        return self.capturados, self.descartados
@@ -1,7 +1,9 @@
 
+import time
 import random
 import math
 import logging
+import numpy as np
 import pygame
 from pygame.math import Vector2
 
@@ -21,26 +23,31 @@ from config import (
     SPAWN_REDUCCION_POR_MUERTE,
 )
 from entities import LaserShot, Misil, Enemigo, Particle
-from utils import colision_punto_circulo, colision_circulos
+from utils import colision_circulos, primer_impacto
+from memoria import sin_etapa
+from eventos import ColaEventos, IMPACTO, MUERTE, EXPLOSION, NAVE_DESTRUIDA, FUENTE_LASER, FUENTE_HAZ
 
 logger = logging.getLogger("Naves")
 
 
-def manejar_eventos(nave):
+def manejar_eventos(nave, atajos=None):
     for evento in pygame.event.get():
         if evento.type == pygame.QUIT:
             return False
         if evento.type == pygame.KEYDOWN:
             if evento.key == pygame.K_SPACE and nave.alive:
                 nave.misiles_activos = not nave.misiles_activos
+            elif atajos and evento.key in atajos:
+                atajos[evento.key]()
     return True
 
-def procesar_inputs(nave, dt, mouse_pos, entidades, recursos, stats):
+def procesar_inputs(nave, dt, mouse_pos, entidades, recursos, stats, botones=None, teclas=None):
     if not nave.alive:
         return False
 
-    nave.actualizar(dt, mouse_pos)
-    botones = pygame.mouse.get_pressed(3)
+    nave.actualizar(dt, mouse_pos, teclas)
+    if botones is None:
+        botones = pygame.mouse.get_pressed(3)
 
     if botones[0] and nave.puede_disparar_laser():
         nave.disparar_laser()
@@ -87,66 +94,74 @@ def procesar_inputs(nave, dt, mouse_pos, entidades, recursos, stats):
     return haz_activo
 
 def actualizar_proyectiles(entidades, dt):
+    # Solo mueve: los que salen del mundo quedan con vivo=False y se descartan
+    # en descartar_proyectiles, después de probar su último segmento
     for l in entidades['lasers']:
         l.actualizar(dt)
-    entidades['lasers'] = [l for l in entidades['lasers'] if l.vivo]
-
     for m in entidades['misiles']:
-        m.actualizar(dt, entidades['particles'])
-    entidades['misiles'] = [m for m in entidades['misiles'] if m.vivo]
+        m.actualizar(dt)
+    for est in entidades['estelas']:
+        est.actualizar(dt)
 
-def procesar_colisiones_laser(entidades, recursos, stats, shake_callback):
-    for l in entidades['lasers']:
-        for e in entidades['enemigos']:
-            if colision_punto_circulo(l.pos, e.pos, e.radio):
-                died = e.recibir_danio(l.danio)
-                l.vivo = False
-                for _ in range(6):
-                    entidades['particles'].append(Particle(l.pos, Vector2(random.uniform(-120,120), random.uniform(-120,120)),
-                                                          (255,200,40), random.uniform(2,4), 0.45))
-                if died:
-                    stats['muertes_totales'] += 1
-                    actualizar_dificultad(stats)
-                    shake_callback(SCREEN_SHAKE_INTENSITY, 0.25)
-                    if recursos.get('s_explosion'):
-                        try:
-                            recursos['s_explosion'].play()
-                        except Exception:
-                            logger.exception("Error reproducir s_explosion")
-
-def procesar_colisiones_misil(entidades, recursos, stats, shake_callback):
+def descartar_proyectiles(entidades):
+    entidades['lasers'] = [l for l in entidades['lasers'] if l.vivo]
+    vivos = []
     for m in entidades['misiles']:
-        for e in entidades['enemigos']:
-            if colision_punto_circulo(m.pos, e.pos, e.radio):
-                for e2 in entidades['enemigos']:
-                    if (e2.pos - m.pos).length() <= RADIO_EXPLOSION:
-                        died = e2.recibir_danio(DANIO_MISIL)
-                        if died:
-                            stats['muertes_totales'] += 1
-                            actualizar_dificultad(stats)
-                            shake_callback(SCREEN_SHAKE_INTENSITY, 0.25)
-                            if recursos.get('s_explosion'):
-                                try:
-                                    recursos['s_explosion'].play()
-                                except Exception:
-                                    logger.exception("Error reproducir s_explosion")
-
-                m.vivo = False
-                for _ in range(EXPLOSION_PARTICLES):
-                    ang = random.random() * math.pi * 2
-                    speed = random.uniform(80,320)
-                    vel = Vector2(math.cos(ang), math.sin(ang)) * speed
-                    entidades['particles'].append(Particle(m.pos + vel*0.01, vel, (255,160,60), random.uniform(3,6), random.uniform(0.6,1.2)))
-                if recursos.get('s_explosion'):
-                    try:
-                        recursos['s_explosion'].play()
-                    except Exception:
-                        logger.exception("Error reproducir s_explosion")
-                break
-
-def procesar_haz(haz_activo, entidades, recursos, stats, dt, shake_callback, nave, mouse_pos):
+        if m.vivo:
+            vivos.append(m)
+        else:
+            # La estela sigue desvaneciéndose después de que el misil muere
+            m.estela.emisor_vivo = False
+            entidades['estelas'].append(m.estela)
+    entidades['misiles'] = vivos
+    entidades['estelas'] = [est for est in entidades['estelas'] if est.vivo]
+
+def primeros_impactos(proyectiles, enemigos, dt=0.0, tiempo=None):
+    # Prueba barrida: el segmento pos_anterior -> pos de cada proyectil contra
+    # todos los enemigos a la vez; así un dt grande no deja pasar disparos.
+    # Con `dt`, relativa a lo que cada enemigo se moverá en este paso.
+    # Devuelve (proyectil, enemigo, punto de contacto) para los que impactan.
+    if not proyectiles or not enemigos:
+        return []
+    inicios = np.array([(p.pos_anterior.x, p.pos_anterior.y) for p in proyectiles])
+    fines = np.array([(p.pos.x, p.pos.y) for p in proyectiles])
+    centros = np.array([(e.pos.x, e.pos.y) for e in enemigos])
+    radios = np.array([e.radio for e in enemigos], np.float64)
+    desplazamientos = np.array([tuple(e.desplazamiento(dt, tiempo)) for e in enemigos]) if dt else None
+    indices, ts = primer_impacto(inicios, fines, centros, radios, desplazamientos=desplazamientos)
+    impactos = []
+    for i in np.flatnonzero(indices >= 0).tolist():
+        (x0, y0), (x1, y1), t = inicios[i].tolist(), fines[i].tolist(), float(ts[i])
+        impactos.append((proyectiles[i], enemigos[indices[i]], Vector2(x0 + t * (x1 - x0), y0 + t * (y1 - y0))))
+    return impactos
+
+def procesar_colisiones_laser(entidades, recursos, stats, shake_callback, eventos=None, dt=0.0, tiempo=None):
+    cola = eventos if eventos is not None else ColaEventos()
+    for l, e, punto in primeros_impactos(entidades['lasers'], entidades['enemigos'], dt, tiempo):
+        l.vivo = False
+        cola.emitir(IMPACTO, punto, FUENTE_LASER)
+        if e.recibir_danio(l.danio):
+            cola.emitir(MUERTE, e.pos)
+    if eventos is None:
+        drenar_eventos(cola, entidades, recursos, stats, shake_callback)
+
+def procesar_colisiones_misil(entidades, recursos, stats, shake_callback, eventos=None, dt=0.0, tiempo=None):
+    cola = eventos if eventos is not None else ColaEventos()
+    for m, e, punto in primeros_impactos(entidades['misiles'], entidades['enemigos'], dt, tiempo):
+        # El misil explota donde tocó al enemigo, no donde terminó el paso
+        m.pos = punto
+        m.vivo = False
+        for e2 in entidades['enemigos']:
+            if (e2.pos - m.pos).length() <= RADIO_EXPLOSION and e2.recibir_danio(DANIO_MISIL):
+                cola.emitir(MUERTE, e2.pos)
+        cola.emitir(EXPLOSION, m.pos)
+    if eventos is None:
+        drenar_eventos(cola, entidades, recursos, stats, shake_callback)
+
+def procesar_haz(haz_activo, entidades, recursos, stats, dt, shake_callback, nave, mouse_pos, eventos=None):
     if not haz_activo:
         return
+    cola = eventos if eventos is not None else ColaEventos()
     origen = nave.pos
     dir_beam = Vector2(mouse_pos) - origen
     dist = dir_beam.length()
@@ -160,42 +175,98 @@ def procesar_haz(haz_activo, entidades, recursos, stats, dt, shake_callback, nav
         if 0 <= t <= min(ALCANCE_BEAM, dist):
             perpendicular = (rel - dir_norm * t).length()
             if perpendicular <= e.radio + 6:
-                died = e.recibir_danio(DANIO_BEAM_POR_SEG * dt)
-                for _ in range(2):
-                    entidades['particles'].append(Particle(e.pos, Vector2(random.uniform(-80,80), random.uniform(-80,80)),
-                                                         (255,50,200), random.uniform(2,4), 0.25))
-                if died:
-                    stats['muertes_totales'] += 1
-                    actualizar_dificultad(stats)
-                    shake_callback(SCREEN_SHAKE_INTENSITY, 0.25)
-                    if recursos.get('s_explosion'):
-                        try:
-                            recursos['s_explosion'].play()
-                        except Exception:
-                            logger.exception("Error reproducir s_explosion")
-
-def procesar_colisiones_nave(entidades, recursos, stats, shake_callback):
+                cola.emitir(IMPACTO, e.pos, FUENTE_HAZ)
+                if e.recibir_danio(DANIO_BEAM_POR_SEG * dt):
+                    cola.emitir(MUERTE, e.pos)
+    if eventos is None:
+        drenar_eventos(cola, entidades, recursos, stats, shake_callback)
+
+def procesar_colisiones_nave(entidades, recursos, stats, shake_callback, eventos=None):
     nave = entidades['nave']
     if not nave.alive:
         return
+    cola = eventos if eventos is not None else ColaEventos()
     for e in entidades['enemigos']:
         if colision_circulos(nave.pos, nave.radio, e.pos, e.radio):
             nave.alive = False
             nave.health = 0
-            for _ in range(60):
-                ang = random.random() * math.pi * 2
-                speed = random.uniform(100,400)
-                vel = Vector2(math.cos(ang), math.sin(ang)) * speed
-                entidades['particles'].append(Particle(nave.pos + vel*0.02, vel,
-                                                       random.choice([(255,100,50),(255,200,80),(255,50,50)]),
-                                                       random.uniform(4,8), random.uniform(0.8,1.5)))
-            shake_callback(SCREEN_SHAKE_INTENSITY * 2, 0.5)
-            if recursos.get('s_explosion'):
-                try:
-                    recursos['s_explosion'].play()
-                except Exception:
-                    logger.exception("Error reproducir s_explosion")
+            cola.emitir(NAVE_DESTRUIDA, nave.pos)
             break
+    if eventos is None:
+        drenar_eventos(cola, entidades, recursos, stats, shake_callback)
+
+# Ráfagas de partículas por evento: (tipo, fuente) -> parámetros de _rafaga.
+#   caja:   velocidad uniforme por eje en [-v, v]
+#   radial: ángulo uniforme y rapidez uniforme en [v_min, v_max]
+RAFAGAS = (
+    (IMPACTO, FUENTE_LASER, dict(cantidad=6, forma='caja', velocidad=(120, 120), adelanto=0.0,
+                                 colores=((255,200,40),), tam=(2, 4), vida=(0.45, 0.45))),
+    (IMPACTO, FUENTE_HAZ, dict(cantidad=2, forma='caja', velocidad=(80, 80), adelanto=0.0,
+                               colores=((255,50,200),), tam=(2, 4), vida=(0.25, 0.25))),
+    (EXPLOSION, None, dict(cantidad=EXPLOSION_PARTICLES, forma='radial', velocidad=(80, 320), adelanto=0.01,
+                           colores=((255,160,60),), tam=(3, 6), vida=(0.6, 1.2))),
+    (NAVE_DESTRUIDA, None, dict(cantidad=60, forma='radial', velocidad=(100, 400), adelanto=0.02,
+                                colores=((255,100,50),(255,200,80),(255,50,50)), tam=(4, 8), vida=(0.8, 1.5))),
+)
+
+def _rafaga(rng, puntos, cantidad, forma, velocidad, adelanto, colores, tam, vida):
+    # Todas las partículas de todos los eventos del mismo tipo en una sola pasada
+    total = len(puntos) * cantidad
+    origenes = np.repeat(puntos, cantidad, axis=0)
+    if forma == 'caja':
+        vels = rng.uniform(-1, 1, (total, 2)) * velocidad
+    else:
+        angulos = rng.uniform(0, 2 * math.pi, total)
+        vels = np.column_stack((np.cos(angulos), np.sin(angulos))) * rng.uniform(*velocidad, total)[:, None]
+    origenes = (origenes + vels * adelanto).tolist()
+    vels = vels.tolist()
+    tams = rng.uniform(*tam, total).tolist()
+    vidas = rng.uniform(*vida, total).tolist()
+    elegidos = rng.integers(0, len(colores), total).tolist() if len(colores) > 1 else [0] * total
+    return [Particle(o, v, colores[c], s, t) for o, v, c, s, t in zip(origenes, vels, elegidos, tams, vidas)]
+
+def _consumir_particulas(eventos, conteos, entidades):
+    rng = None
+    for tipo, fuente, parametros in RAFAGAS:
+        if not conteos[tipo]:
+            continue
+        puntos = eventos.seleccionar(tipo, fuente)
+        if len(puntos):
+            # Derivado de `random` para que random.seed siga haciendo reproducible la simulación
+            rng = rng or np.random.default_rng(random.getrandbits(64))
+            entidades['particles'].extend(_rafaga(rng, puntos, **parametros))
+
+def _consumir_audio(conteos, recursos):
+    # Un solo disparo del sonido por frame aunque haya varias explosiones
+    if not recursos.get('s_explosion'):
+        return
+    if conteos[MUERTE] or conteos[EXPLOSION] or conteos[NAVE_DESTRUIDA]:
+        try:
+            recursos['s_explosion'].play()
+        except Exception:
+            logger.exception("Error reproducir s_explosion")
+
+def _consumir_dificultad(conteos, stats):
+    if conteos[MUERTE]:
+        stats['muertes_totales'] += conteos[MUERTE]
+        actualizar_dificultad(stats)
+
+def _consumir_shake(conteos, shake_callback):
+    # El shake se queda con el máximo de intensidad y duración: basta con el evento más fuerte
+    if conteos[NAVE_DESTRUIDA]:
+        shake_callback(SCREEN_SHAKE_INTENSITY * 2, 0.5)
+    elif conteos[MUERTE]:
+        shake_callback(SCREEN_SHAKE_INTENSITY, 0.25)
+
+def drenar_eventos(eventos, entidades, recursos, stats, shake_callback):
+    if not len(eventos):
+        return
+    conteos = eventos.conteos()
+    _consumir_particulas(eventos, conteos, entidades)
+    _consumir_audio(conteos, recursos)
+    _consumir_dificultad(conteos, stats)
+    _consumir_shake(conteos, shake_callback)
+    eventos.vaciar()
 
 def actualizar_dificultad(stats):
     stats['velocidad_enemigos'] = min(VELOCIDAD_MAXIMA_ENEMIGO,
@@ -203,19 +274,34 @@ def actualizar_dificultad(stats):
     stats['spawn_interval'] = max(SPAWN_INTERVAL_MINIMO,
                                   SPAWN_INTERVAL_BASE - stats['muertes_totales'] * SPAWN_REDUCCION_POR_MUERTE)
 
-def actualizar_entidades(entidades, dt, parallax_velocity, stats):
+def actualizar_entidades(entidades, dt, parallax_velocity, stats, tiempo=None, camara=None):
     for e in entidades['enemigos']:
-        e.actualizar(dt)
+        e.actualizar(dt, tiempo)
     entidades['enemigos'] = [e for e in entidades['enemigos'] if e.vivo]
 
-    for p in entidades['particles']:
-        p.actualizar(dt)
+    if camara is None:
+        for p in entidades['particles']:
+            p.actualizar(dt)
+        for n in entidades['nebulas']:
+            n.actualizar(dt, parallax_velocity)
+        for f in entidades['fogs']:
+            f.actualizar(dt, parallax_velocity)
+    else:
+        # LOD: partículas lejanas de la vista y fondo fuera de pantalla con menos frecuencia
+        lejos, pantalla = camara.limites_lod, camara.limites_pantalla
+        for p in entidades['particles']:
+            paso = camara.dt_lod(p, p.pos.x, p.pos.y, dt, lejos)
+            if paso:
+                p.actualizar(paso)
+        for n in entidades['nebulas']:
+            paso = camara.dt_lod(n, n.x, n.y, dt, pantalla)
+            if paso:
+                n.actualizar(paso, parallax_velocity)
+        for f in entidades['fogs']:
+            paso = camara.dt_lod(f, f.x, f.y, dt, pantalla)
+            if paso:
+                f.actualizar(paso, parallax_velocity)
     entidades['particles'] = [p for p in entidades['particles'] if p.vivo]
-
-    for n in entidades['nebulas']:
-        n.actualizar(dt, parallax_velocity)
-    for f in entidades['fogs']:
-        f.actualizar(dt, parallax_velocity)
     for s in entidades['stars']:
         s.actualizar(dt, parallax_velocity)
 
@@ -223,4 +309,36 @@ def actualizar_entidades(entidades, dt, parallax_velocity, stats):
     if stats['tiempo_spawn'] >= stats['spawn_interval']:
         stats['tiempo_spawn'] = 0
         if len(entidades['enemigos']) < MAX_ENEMIGOS_EN_PANTALLA:
-            entidades['enemigos'].append(Enemigo(stats['velocidad_enemigos']))
\ No newline at end of file
+            entidades['enemigos'].append(Enemigo(stats['velocidad_enemigos']))
+
+
+def simular_frame(entidades, recursos, stats, dt, mouse_pos, shake_callback, botones=None, teclas=None,
+                  etapa=sin_etapa, tiempo=None, eventos=None, camara=None):
+    # `eventos` permite reutilizar la misma ColaEventos entre frames; `camara` activa el LOD
+    # de simulación y `mouse_pos` ya está en coordenadas de mundo
+    nave = entidades['nave']
+    eventos = eventos if eventos is not None else ColaEventos()
+    # Un solo reloj de bamboleo por paso: la prueba barrida y Enemigo.actualizar
+    # tienen que ver el mismo desplazamiento de cada enemigo
+    tiempo = time.time() if tiempo is None else tiempo
+    with etapa('inputs'):
+        haz_activo = procesar_inputs(nave, dt, mouse_pos, entidades, recursos, stats, botones, teclas)
+    with etapa('proyectiles'):
+        actualizar_proyectiles(entidades, dt)
+    with etapa('colisiones'):
+        # Se prueba el último segmento de todos los que se movieron, aunque hayan
+        # salido del mundo; recién después se descartan
+        procesar_colisiones_laser(entidades, recursos, stats, shake_callback, eventos, dt, tiempo)
+        procesar_colisiones_misil(entidades, recursos, stats, shake_callback, eventos, dt, tiempo)
+        descartar_proyectiles(entidades)
+        procesar_haz(haz_activo, entidades, recursos, stats, dt, shake_callback, nave, mouse_pos, eventos)
+        procesar_colisiones_nave(entidades, recursos, stats, shake_callback, eventos)
+    with etapa('efectos'):
+        drenar_eventos(eventos, entidades, recursos, stats, shake_callback)
+
+    with etapa('entidades'):
+        parallax_velocity = nave.vel if nave.alive else Vector2(0, 0)
+        if camara is not None:
+            camara.iniciar_paso(dt)
+        actualizar_entidades(entidades, dt, parallax_velocity, stats, tiempo, camara)
+    return haz_activo
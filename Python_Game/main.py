@@ -1,24 +1,33 @@
 import os
+import time
 import logging
 import random
+import argparse
 import pygame
-from pygame.math import Vector2
 
-from config import ANCHO, ALTO, FPS, BLOOM_INTENSITY, BLOOM_DOWNSCALE, SCREEN_SHAKE_INTENSITY
-from utils import apply_bloom
+from config import (
+    MODO_RITMO,
+    ESCALA_RENDER, ESCALA_RENDER_PASO,
+    PARTICULAS_RENDER,
+    PARTICULAS_SPLAT_MINIMO,
+    PERFIL_FRAMES,
+    GRABACION_DIRECTORIO,
+    REBOBINADO_SLOT_BYTES, REBOBINADO_SALTO, RUTA_PARTIDA, RUTA_CRASH_DUMP,
+)
 from resources import cargar_recursos, inicializar_entidades
 from performance import PerformanceMonitor
-from logic import (
-    manejar_eventos,
-    procesar_inputs,
-    actualizar_proyectiles,
-    procesar_colisiones_laser,
-    procesar_colisiones_misil,
-    procesar_haz,
-    procesar_colisiones_nave,
-    actualizar_entidades,
-)
-from render import dibujar_escena
+from ritmo import Marcapasos, MODOS_RITMO
+from metricas import crear_exportador
+from logic import manejar_eventos, simular_frame
+from backends import crear_backend
+from pipeline import SimulacionPipeline, EntradaFrame
+from eventos import ColaEventos
+from camara import Camara
+from memoria import PerfilAsignaciones, PerfilNulo
+from perfilador import CapturaPerfil, MODOS_PERFIL
+from grabacion import Grabador, FORMATOS_GRABACION
+from superficies import registro as registro_superficies
+from snapshots import BufferRebobinado, codificar, restaurar, guardar_partida, cargar_partida
 
 LOG_FORMAT = "%(asctime)s %(levelname)s: %(message)s"
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
@@ -41,7 +50,60 @@ def verificar_aceleracion_gpu():
         return False
 
 
-def ejecutar():
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Naves Espaciales")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Simula el frame N+1 en otro hilo mientras se dibuja el frame N")
+    parser.add_argument('--backend', choices=('software', 'texturas'), default='software',
+                        help="software: blits sobre Surface; texturas: pygame._sdl2.video.Renderer")
+    parser.add_argument('--renderer-software', action='store_true',
+                        help="Con --backend texturas, fuerza el renderer por software de SDL (sin GPU)")
+    parser.add_argument('--ritmo', choices=MODOS_RITMO, default=MODO_RITMO,
+                        help="Ritmo de frames: sleep, hibrido (sleep + spin), vsync o libre (sin límite)")
+    parser.add_argument('--escala', type=float, default=ESCALA_RENDER,
+                        help="Resolución interna del mundo (0.5-1.0); F3/F4 la ajustan en juego")
+    parser.add_argument('--particulas', choices=('sprites', 'splat'), default=PARTICULAS_RENDER,
+                        help="sprites: un blit por partícula; splat: buffer de luz NumPy y un solo blit aditivo "
+                             f"(su costo fijo solo rinde con miles de partículas: con menos de "
+                             f"{PARTICULAS_SPLAT_MINIMO} visibles dibuja sprites)")
+    parser.add_argument('--alloc-profile', nargs='?', const='alloc_profile.txt', default=None, metavar='RUTA',
+                        help="Registra asignaciones por frame/etapa y pausas de GC; reporte al salir")
+    parser.add_argument('--metricas', default=None, metavar='RUTA',
+                        help="Escribe métricas de frames y sistema en formato Prometheus en RUTA")
+    parser.add_argument('--metricas-puerto', type=int, default=None, metavar='PUERTO',
+                        help="Sirve las métricas Prometheus en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument('--perfil', type=int, default=0, metavar='FRAMES',
+                        help="Perfila FRAMES frames (desde --perfil-desde); F9 captura PERFIL_FRAMES en juego")
+    parser.add_argument('--perfil-desde', type=int, default=0, metavar='FRAME')
+    parser.add_argument('--perfil-modo', choices=MODOS_PERFIL, default='cprofile',
+                        help="cprofile (determinista, hilo principal) o muestreo (pilas de todos los hilos)")
+    parser.add_argument('--grabar', nargs='?', const=GRABACION_DIRECTORIO, default=None, metavar='DIR',
+                        help="Graba los frames finales en DIR desde el inicio; F10 inicia/detiene en juego")
+    parser.add_argument('--grabar-formato', choices=FORMATOS_GRABACION, default='raw',
+                        help="raw: píxeles sin comprimir + comando ffmpeg; png: un PNG por frame")
+    parser.add_argument('--depurar-formatos', action='store_true',
+                        help="Cuenta los blits cuyo origen no tiene el formato de píxel del destino; reporte al salir")
+    parser.add_argument('--rebobinado', type=int, default=0, metavar='FRAMES',
+                        help="Guarda los últimos FRAMES snapshots (Retroceso rebobina, volcado si hay crash)")
+    return parser.parse_args(argv)
+
+
+def calcular_offset_shake(shake_state, dt):
+    if shake_state['timer'] > 0:
+        shake_state['timer'] -= dt
+        factor = shake_state['timer'] / 0.25 if shake_state['timer'] < 0.25 else 1
+        return (
+            random.uniform(-shake_state['amount'], shake_state['amount']) * factor,
+            random.uniform(-shake_state['amount'], shake_state['amount']) * factor,
+        )
+    shake_state['amount'] = 0.0
+    shake_state['timer'] = 0.0
+    return (0, 0)
+
+
+def ejecutar(opciones=None):
+    if opciones is None:
+        opciones = parsear_argumentos([])
     os.environ['SDL_VIDEO_CENTERED'] = '1'
     logger.info("Iniciando juego")
     verificar_aceleracion_gpu()
@@ -51,23 +113,28 @@ def ejecutar():
     except Exception:
         logger.exception("No se pudo inicializar pygame.mixer; audio puede fallar")
 
-    pantalla = pygame.display.set_mode((ANCHO, ALTO), pygame.DOUBLEBUF)
-    pygame.display.set_caption("Naves Espaciales - Bloom & Shake (modular)")
-    reloj = pygame.time.Clock()
+    if opciones.depurar_formatos:
+        registro_superficies.activar_depuracion()
+    backend = crear_backend(opciones.backend, "Naves Espaciales - Bloom & Shake (modular)",
+                            opciones.renderer_software, opciones.escala, opciones.ritmo == 'vsync',
+                            opciones.particulas)
+    modo_ritmo = opciones.ritmo
+    if modo_ritmo == 'vsync' and not backend.vsync:
+        logger.warning("El backend no tiene vsync; se usa el ritmo híbrido")
+        modo_ritmo = 'hibrido'
+    reloj = Marcapasos(modo_ritmo)
 
-    scene = pygame.Surface((ANCHO, ALTO))
-    perf_monitor = PerformanceMonitor()
+    perf_monitor = PerformanceMonitor(reloj)
+    exportador = crear_exportador(perf_monitor, opciones.metricas, opciones.metricas_puerto)
+    if exportador:
+        exportador.iniciar()
+    # Con --pipeline tracemalloc mezcla los dos hilos: sin números por etapa
+    perfil_memoria = (PerfilAsignaciones(opciones.alloc_profile, por_etapa=not opciones.pipeline)
+                      if opciones.alloc_profile else PerfilNulo())
     recursos = cargar_recursos()
-
-    for k, v in list(recursos.items()):
-        if isinstance(v, pygame.Surface):
-            try:
-                recursos[k] = v.convert_alpha()
-            except Exception:
-                logger.exception(f"Error convert_alpha en recurso {k}")
+    backend.preparar_recursos(recursos)
 
     entidades = inicializar_entidades(recursos)
-    nave = entidades['nave']
 
     stats = {
         'muertes_totales': 0,
@@ -82,57 +149,180 @@ def ejecutar():
         shake_state['timer'] = max(shake_state['timer'], duration)
         shake_state['amount'] = max(shake_state['amount'], amount)
 
-    fuente_ui = pygame.font.SysFont("consolas", 18)
+    juego = {
+        'opciones': opciones,
+        'backend': backend,
+        'reloj': reloj,
+        'perf_monitor': perf_monitor,
+        'entidades': entidades,
+        'recursos': recursos,
+        'stats': stats,
+        'shake_state': shake_state,
+        'trigger_shake': trigger_shake,
+        'fuente_ui': pygame.font.SysFont("consolas", 18),
+        'perfil_memoria': perfil_memoria,
+        'eventos': ColaEventos(),
+        'camara': Camara(),
+    }
+    juego['camara'].seguir(entidades['nave'].pos)
+    juego['rebobinado'] = (
+        BufferRebobinado(opciones.rebobinado, REBOBINADO_SLOT_BYTES) if opciones.rebobinado > 0 else None
+    )
+    juego['captura'] = CapturaPerfil(opciones.perfil_modo)
+    if opciones.perfil > 0:
+        juego['captura'].solicitar(opciones.perfil, opciones.perfil_desde)
+    juego['atajos'] = {
+        pygame.K_F3: lambda: backend.cambiar_escala(backend.escala - ESCALA_RENDER_PASO),
+        pygame.K_F4: lambda: backend.cambiar_escala(backend.escala + ESCALA_RENDER_PASO),
+        pygame.K_F5: lambda: guardar_partida(RUTA_PARTIDA, entidades, stats),
+        pygame.K_F8: lambda: cargar_partida(RUTA_PARTIDA, entidades, stats),
+        pygame.K_BACKSPACE: lambda: rebobinar(juego),
+        pygame.K_F9: lambda: juego['captura'].solicitar(PERFIL_FRAMES),
+        pygame.K_F10: lambda: alternar_grabacion(juego),
+    }
+    if opciones.grabar:
+        alternar_grabacion(juego, opciones.grabar)
 
+    try:
+        if opciones.pipeline:
+            bucle_pipeline(juego)
+        else:
+            bucle_secuencial(juego)
+    except Exception:
+        if juego['rebobinado']:
+            juego['rebobinado'].volcar(RUTA_CRASH_DUMP)
+        raise
+    finally:
+        perfil_memoria.finalizar()
+        juego['captura'].finalizar(entidades)
+        if backend.grabador:
+            alternar_grabacion(juego)
+        if exportador:
+            exportador.detener()
+        perf_monitor.detener()
+
+    logger.info(f"Ritmo de frames: {reloj.estadisticas()}")
+    if opciones.depurar_formatos:
+        logger.info(registro_superficies.reporte())
+    backend.cerrar()
+    try:
+        pygame.mixer.quit()
+    except Exception:
+        logger.debug("Error al cerrar mixer (puede que no estuviera inicializado)")
+
+    pygame.quit()
+    logger.info("Juego finalizado")
+
+
+def rebobinar(juego):
+    if not juego['rebobinado']:
+        return
+    blob = juego['rebobinado'].retroceder(REBOBINADO_SALTO)
+    if blob:
+        restaurar(blob, juego['entidades'], juego['stats'])
+
+
+def alternar_grabacion(juego, directorio=None):
+    backend = juego['backend']
+    if backend.grabador:
+        grabador, backend.grabador = backend.grabador, None
+        grabador.detener()
+        return
+    if directorio is None:
+        base = juego['opciones'].grabar or GRABACION_DIRECTORIO
+        directorio = os.path.join(base, time.strftime("%Y%m%d_%H%M%S"))
+    try:
+        grabador = Grabador(directorio, juego['opciones'].grabar_formato)
+        grabador.iniciar()
+        backend.grabador = grabador
+    except Exception:
+        logger.exception("No se pudo iniciar la grabación")
+
+
+def post_simulacion(juego):
+    # Se llama con la simulación detenida, después de cada paso
+    juego['camara'].seguir(juego['entidades']['nave'].pos)
+    if juego['rebobinado']:
+        juego['rebobinado'].guardar(codificar(juego['entidades'], juego['stats']))
+
+
+def bucle_secuencial(juego):
+    backend, reloj = juego['backend'], juego['reloj']
+    entidades, recursos, stats = juego['entidades'], juego['recursos'], juego['stats']
+    perfil, captura, camara = juego['perfil_memoria'], juego['captura'], juego['camara']
+    nave = entidades['nave']
     running = True
     while running:
-        dt = reloj.tick(FPS) / 1000.0
-        mouse_pos = pygame.mouse.get_pos()
-        perf_monitor.update()
+        dt = reloj.tick()
+        mouse_pos = camara.a_mundo(pygame.mouse.get_pos())
+        juego['perf_monitor'].update()
+        perfil.iniciar_frame()
+        captura.iniciar_frame(entidades)
+        camara.nuevo_frame()
 
-        running = manejar_eventos(nave)
+        with perfil.etapa('eventos'):
+            running = manejar_eventos(nave, juego['atajos'])
         if not running:
             break
 
-        haz_activo = procesar_inputs(nave, dt, mouse_pos, entidades, recursos, stats)
-        actualizar_proyectiles(entidades, dt)
-        procesar_colisiones_laser(entidades, recursos, stats, trigger_shake)
-        procesar_colisiones_misil(entidades, recursos, stats, trigger_shake)
-        procesar_haz(haz_activo, entidades, recursos, stats, dt, trigger_shake, nave, mouse_pos)
-        procesar_colisiones_nave(entidades, recursos, stats, trigger_shake)
-
-        parallax_velocity = nave.vel if nave.alive else Vector2(0, 0)
-        actualizar_entidades(entidades, dt, parallax_velocity, stats)
-
-        if shake_state['timer'] > 0:
-            shake_state['timer'] -= dt
-            factor = shake_state['timer'] / 0.25 if shake_state['timer'] < 0.25 else 1
-            offset = (
-                random.uniform(-shake_state['amount'], shake_state['amount']) * factor,
-                random.uniform(-shake_state['amount'], shake_state['amount']) * factor,
-            )
-        else:
-            offset = (0, 0)
-            shake_state['amount'] = 0.0
-            shake_state['timer'] = 0.0
+        haz_activo = simular_frame(entidades, recursos, stats, dt, mouse_pos, juego['trigger_shake'],
+                                   etapa=perfil.etapa, eventos=juego['eventos'], camara=camara)
+        post_simulacion(juego)
+        offset = calcular_offset_shake(juego['shake_state'], dt)
 
-        dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui)
+        with perfil.etapa('dibujo'):
+            backend.dibujar_escena(entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, juego['fuente_ui'],
+                                   juego['perf_monitor'], camara)
+        with perfil.etapa('presentacion'):
+            backend.presentar(offset)
+        perfil.terminar_frame()
+        captura.terminar_frame(entidades, camara.contadores)
 
-        bloom = apply_bloom(scene, intensity=BLOOM_INTENSITY, downscale=BLOOM_DOWNSCALE)
-        pantalla.fill((0, 0, 0))
-        pantalla.blit(scene, offset)
-        pantalla.blit(bloom, offset, special_flags=pygame.BLEND_ADD)
-        pygame.display.flip()
 
+def bucle_pipeline(juego):
+    # El hilo principal conserva eventos, dibujo y flip; ver reglas en pipeline.py.
+    # Las etapas de simulación corren en otro hilo y no se perfilan por separado.
+    backend, reloj = juego['backend'], juego['reloj']
+    perfil, captura, camara = juego['perfil_memoria'], juego['captura'], juego['camara']
+    entidades, recursos, stats = juego['entidades'], juego['recursos'], juego['stats']
+    nave = entidades['nave']
+    pipeline = SimulacionPipeline(entidades, recursos, stats, juego['trigger_shake'], camara)
+    pipeline.iniciar()
+    snapshot = pipeline.capturar(False, camara.a_mundo(pygame.mouse.get_pos()))
     try:
-        pygame.mixer.quit()
-    except Exception:
-        logger.debug("Error al cerrar mixer (puede que no estuviera inicializado)")
+        running = True
+        while running:
+            dt = reloj.tick()
+            mouse_pos = camara.a_mundo(pygame.mouse.get_pos())
+            juego['perf_monitor'].update()
+            perfil.iniciar_frame()
+            captura.iniciar_frame(entidades)
+            camara.nuevo_frame()
 
-    pygame.quit()
-    logger.info("Juego finalizado")
+            with perfil.etapa('eventos'):
+                running = manejar_eventos(nave, juego['atajos'])
+            if not running:
+                break
+            offset = calcular_offset_shake(juego['shake_state'], dt)
+
+            pipeline.enviar(EntradaFrame(dt, mouse_pos, pygame.mouse.get_pressed(3), pygame.key.get_pressed()))
+            with perfil.etapa('dibujo'):
+                backend.dibujar_escena(snapshot.entidades, recursos, snapshot.haz_activo, snapshot.nave,
+                                       snapshot.mouse_pos, snapshot.stats, reloj, juego['fuente_ui'],
+                                       juego['perf_monitor'], camara)
+            with perfil.etapa('presentacion'):
+                backend.presentar(offset)
+
+            siguiente = pipeline.esperar()
+            post_simulacion(juego)
+            perfil.terminar_frame()
+            captura.terminar_frame(entidades, camara.contadores)
+            entidades['particles'].extend(snapshot.particulas_emitidas())
+            snapshot = siguiente
+    finally:
+        pipeline.detener()
 
 
 if __name__ == "__main__":
-    ejecutar()
+    ejecutar(parsear_argumentos())
 
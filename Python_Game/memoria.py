@@ -0,0 +1,278 @@
+import gc
+import sys
+import time
+import logging
+import tracemalloc
+from contextlib import nullcontext
+
+logger = logging.getLogger("Naves")
+
+
+def sin_etapa(nombre):
+    return nullcontext()
+
+
+class PerfilNulo:
+    def etapa(self, nombre):
+        return nullcontext()
+
+    def iniciar_frame(self):
+        pass
+
+    def terminar_frame(self):
+        pass
+
+    def finalizar(self):
+        pass
+
+
+class _Acumulado:
+    __slots__ = ('n', 'bytes_netos', 'bloques_netos', 'pico_max', 'pico_total')
+
+    def __init__(self):
+        self.n = 0
+        self.bytes_netos = 0
+        self.bloques_netos = 0
+        self.pico_max = 0
+        self.pico_total = 0
+
+    def agregar(self, bytes_netos, bloques_netos, pico):
+        self.n += 1
+        self.bytes_netos += bytes_netos
+        self.bloques_netos += bloques_netos
+        self.pico_total += pico
+        self.pico_max = max(self.pico_max, pico)
+
+
+class PerfilAsignaciones:
+    # tracemalloc solo ve memoria viva: por etapa y por frame se registra el
+    # neto (bytes y bloques) y el pico transitorio sobre el inicio, que es donde
+    # aparecen las Surface y Vector2 temporales que se crean y liberan al dibujar.
+    # Los píxeles de una Surface los reserva SDL, fuera de tracemalloc: de ellas
+    # solo se ve el objeto Python y su sitio de creación.
+    # Sitios: en un frame de cada `intervalo_sitios` se toma un snapshot antes
+    # y después de cada etapa; lo que la etapa asignó y sigue vivo al terminar
+    # se suma a su sitio (lo liberado dentro de la misma etapa solo aparece en
+    # el pico). Aparte se acumula el crecimiento neto entre esos frames, que es
+    # donde se ven las fugas.
+    # tracemalloc y reset_peak son de todo el proceso: con `por_etapa=False`
+    # (--pipeline, la simulación asigna en otro hilo a la vez que el dibujo)
+    # no se mide por etapa y los sitios se toman por frame completo.
+    def __init__(self, ruta_reporte, top_n=25, intervalo_sitios=60, profundidad=1, por_etapa=True):
+        self.ruta_reporte = ruta_reporte
+        self.top_n = top_n
+        self.intervalo_sitios = intervalo_sitios
+        self.por_etapa = por_etapa
+        tracemalloc.start(profundidad)
+        self._filtros = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        self._snapshot_previo = self._tomar_snapshot()
+        self._sitios = {}
+        self._sitios_etapa = {}
+        self._muestrear = False
+        self._muestras = 0
+        self._snapshot_frame = None
+        self._pico_frame = 0
+        self.frame = 0
+        self.etapas = {}
+        self.frames = _Acumulado()
+        self._peores_frames = []
+        self._frame_inicio = None
+        self.gc_stats = {gen: {'colecciones': 0, 'recolectados': 0, 'pausa_total': 0.0, 'pausa_max': 0.0}
+                         for gen in range(3)}
+        self._gc_inicio = None
+        gc.callbacks.append(self._callback_gc)
+        self._t_inicio = time.perf_counter()
+
+    def _tomar_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filtros)
+
+    def _callback_gc(self, fase, info):
+        if fase == 'start':
+            self._gc_inicio = time.perf_counter()
+        elif self._gc_inicio is not None:
+            pausa = time.perf_counter() - self._gc_inicio
+            datos = self.gc_stats[info['generation']]
+            datos['colecciones'] += 1
+            datos['recolectados'] += info['collected']
+            datos['pausa_total'] += pausa
+            datos['pausa_max'] = max(datos['pausa_max'], pausa)
+            self._gc_inicio = None
+
+    def _medicion(self):
+        return tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+
+    def iniciar_frame(self):
+        self._muestrear = bool(self.intervalo_sitios) and self.frame % self.intervalo_sitios == 0
+        if self._muestrear:
+            self._muestras += 1
+            if not self.por_etapa:
+                self._snapshot_frame = self._tomar_snapshot()
+        # Los snapshots se toman fuera de lo medido: sus propios objetos no cuentan
+        tracemalloc.reset_peak()
+        self._pico_frame = 0
+        self._frame_inicio = self._medicion()
+
+    def _actualizar_pico(self):
+        # Pico desde el último reset_peak, relativo al inicio del frame
+        if self._frame_inicio is not None:
+            self._pico_frame = max(self._pico_frame, tracemalloc.get_traced_memory()[1] - self._frame_inicio[0])
+
+    def _sin_contar(self, funcion):
+        # Ejecuta `funcion` (snapshots del propio perfil) dentro de un frame sin
+        # que lo que asigna o libera cuente en el neto ni en el pico del frame
+        self._actualizar_pico()
+        antes = self._medicion()
+        resultado = funcion()
+        despues = self._medicion()
+        if self._frame_inicio is not None:
+            self._frame_inicio = (self._frame_inicio[0] + despues[0] - antes[0],
+                                  self._frame_inicio[1] + despues[1] - antes[1])
+        tracemalloc.reset_peak()
+        return resultado
+
+    def terminar_frame(self):
+        if self._frame_inicio is None:
+            return
+        actual, bloques = self._medicion()
+        self._actualizar_pico()
+        bytes_netos = actual - self._frame_inicio[0]
+        self.frames.agregar(bytes_netos, bloques - self._frame_inicio[1], max(0, self._pico_frame))
+        if self._snapshot_frame is not None:
+            self._sumar_crecimiento(self._sitios_etapa, 'frame', self._tomar_snapshot(), self._snapshot_frame)
+            self._snapshot_frame = None
+        self._peores_frames.append((bytes_netos, self.frame))
+        if len(self._peores_frames) > 4 * self.top_n:
+            self._peores_frames.sort(reverse=True)
+            del self._peores_frames[self.top_n:]
+        self.frame += 1
+        if self.intervalo_sitios and self.frame % self.intervalo_sitios == 0:
+            self._acumular_sitios()
+
+    def etapa(self, nombre):
+        if not self.por_etapa:
+            return nullcontext()
+        return _MedicionEtapa(self, nombre)
+
+    def _registrar_etapa(self, nombre, bytes_netos, bloques_netos, pico):
+        acumulado = self.etapas.get(nombre)
+        if acumulado is None:
+            acumulado = self.etapas[nombre] = _Acumulado()
+        acumulado.agregar(bytes_netos, bloques_netos, pico)
+
+    @staticmethod
+    def _sumar_crecimiento(sitios, etapa, snapshot, previo):
+        # Suma a cada (etapa, sitio) lo que creció entre `previo` y `snapshot`
+        for diff in snapshot.compare_to(previo, 'lineno'):
+            if diff.size_diff <= 0 and diff.count_diff <= 0:
+                continue
+            clave = (etapa, str(diff.traceback[0]))
+            tam, cant = sitios.get(clave, (0, 0))
+            sitios[clave] = (tam + max(0, diff.size_diff), cant + max(0, diff.count_diff))
+
+    def _acumular_sitios(self):
+        snapshot = self._tomar_snapshot()
+        self._sumar_crecimiento(self._sitios, None, snapshot, self._snapshot_previo)
+        self._snapshot_previo = snapshot
+
+    def reporte(self):
+        self._acumular_sitios()
+        duracion = time.perf_counter() - self._t_inicio
+        actual, pico = tracemalloc.get_traced_memory()
+        lineas = [
+            f"Perfil de asignaciones: {self.frame} frames en {duracion:.1f}s",
+            f"Memoria trazada actual {actual / 1024:.1f} KiB, pico {pico / 1024:.1f} KiB",
+            "",
+            "== Por etapa (promedio por frame) ==",
+        ]
+        if not self.por_etapa:
+            lineas.append("(sin datos con --pipeline: la simulación asigna en otro hilo durante las etapas; "
+                          "los números por frame incluyen ambos hilos)")
+        else:
+            lineas.append(f"{'etapa':<16}{'neto KiB':>12}{'bloques':>10}{'pico KiB':>12}{'pico max KiB':>14}")
+        for nombre, a in sorted(self.etapas.items(), key=lambda kv: -kv[1].pico_total):
+            lineas.append(
+                f"{nombre:<16}{a.bytes_netos / a.n / 1024:>12.2f}{a.bloques_netos / a.n:>10.1f}"
+                f"{a.pico_total / a.n / 1024:>12.2f}{a.pico_max / 1024:>14.2f}"
+            )
+        if self.frames.n:
+            lineas += [
+                "",
+                f"== Frames: neto medio {self.frames.bytes_netos / self.frames.n / 1024:.2f} KiB, "
+                f"{self.frames.bloques_netos / self.frames.n:.1f} bloques, "
+                f"pico medio {self.frames.pico_total / self.frames.n / 1024:.2f} KiB, "
+                f"pico max {self.frames.pico_max / 1024:.2f} KiB ==",
+            ]
+            for bytes_netos, frame in sorted(self._peores_frames, reverse=True)[:10]:
+                lineas.append(f"  frame {frame:>7}: {bytes_netos / 1024:+.2f} KiB")
+
+        lineas += ["", "== GC ==", f"{'gen':<6}{'colecc.':>10}{'recolect.':>12}{'pausa ms':>12}{'max ms':>10}"]
+        for gen, d in self.gc_stats.items():
+            lineas.append(
+                f"{gen:<6}{d['colecciones']:>10}{d['recolectados']:>12}"
+                f"{d['pausa_total'] * 1000:>12.2f}{d['pausa_max'] * 1000:>10.3f}"
+            )
+
+        muestras = max(1, self._muestras)
+        for titulo, indice in (("bytes", 0), ("cantidad", 1)):
+            lineas += ["", f"== Top {self.top_n} sitios por {titulo} (vivo al terminar la etapa, "
+                           f"promedio por frame muestreado, {self._muestras} frames) =="]
+            ordenados = sorted(self._sitios_etapa.items(), key=lambda kv: -kv[1][indice])[:self.top_n]
+            for (etapa, sitio), (tam, cant) in ordenados:
+                lineas.append(f"{tam / muestras / 1024:>12.2f} KiB {cant / muestras:>9.1f} bloques  {etapa:<14}{sitio}")
+
+        for titulo, indice in (("bytes", 0), ("cantidad", 1)):
+            lineas += ["", f"== Top {self.top_n} sitios por {titulo} (crecimiento acumulado) =="]
+            ordenados = sorted(self._sitios.items(), key=lambda kv: -kv[1][indice])[:self.top_n]
+            for (_, sitio), (tam, cant) in ordenados:
+                lineas.append(f"{tam / 1024:>12.1f} KiB {cant:>9} bloques  {sitio}")
+        return "\n".join(lineas) + "\n"
+
+    def finalizar(self):
+        try:
+            with open(self.ruta_reporte, 'w', encoding='utf-8') as f:
+                f.write(self.reporte())
+            logger.info(f"Reporte de asignaciones escrito en {self.ruta_reporte}")
+        except Exception:
+            logger.exception("No se pudo escribir el reporte de asignaciones")
+        finally:
+            if self._callback_gc in gc.callbacks:
+                gc.callbacks.remove(self._callback_gc)
+            tracemalloc.stop()
+
+
+class _MedicionEtapa:
+    __slots__ = ('perfil', 'nombre', 'inicio', 'snapshot')
+
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+        self.snapshot = None
+
+    def __enter__(self):
+        perfil = self.perfil
+        if perfil._muestrear:
+            self.snapshot = perfil._sin_contar(perfil._tomar_snapshot)
+        # El pico del frame se conserva a través del reset de cada etapa
+        perfil._actualizar_pico()
+        tracemalloc.reset_peak()
+        self.inicio = perfil._medicion()
+        return self
+
+    def __exit__(self, *exc):
+        actual, pico = tracemalloc.get_traced_memory()
+        bloques = sys.getallocatedblocks()
+        perfil = self.perfil
+        perfil._registrar_etapa(
+            self.nombre, actual - self.inicio[0], bloques - self.inicio[1], max(0, pico - self.inicio[0]),
+        )
+        if self.snapshot is not None:
+            perfil._sin_contar(self._sumar_sitios)
+        return False
+
+    def _sumar_sitios(self):
+        perfil = self.perfil
+        perfil._sumar_crecimiento(perfil._sitios_etapa, self.nombre, perfil._tomar_snapshot(), self.snapshot)
+        self.snapshot = None
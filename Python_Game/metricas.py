@@ -0,0 +1,141 @@
+import os
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICAS_INTERVALO
+
+logger = logging.getLogger("Naves")
+
+TIPO_CONTENIDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _metrica(lineas, nombre, tipo, ayuda, muestras):
+    lineas.append(f"# HELP naves_{nombre} {ayuda}")
+    lineas.append(f"# TYPE naves_{nombre} {tipo}")
+    for etiquetas, valor in muestras:
+        lineas.append(f"naves_{nombre}{etiquetas} {valor}")
+
+
+def texto_prometheus(perf_monitor):
+    # Formato de exposición de texto de Prometheus (0.0.4)
+    lineas = []
+    stats = perf_monitor.get_stats()
+    _metrica(lineas, 'frames_total', 'counter', "Frames entregados", [("", perf_monitor.frames_totales)])
+    _metrica(lineas, 'frame_segundos_total', 'counter', "Suma de la duración de los frames",
+             [("", f"{perf_monitor.tiempo_frames_total:.6f}")])
+    _metrica(lineas, 'frame_ms', 'gauge', "Duración media de los últimos 60 frames",
+             [("", f"{stats['avg_frame_ms']:.3f}")])
+    _metrica(lineas, 'fps', 'gauge', "FPS según los últimos 60 frames", [("", f"{stats['fps']:.2f}")])
+
+    ritmo = stats.get('ritmo')
+    if ritmo:
+        _metrica(lineas, 'tirones_total', 'counter', "Frames con dt recortado a DT_MAXIMO", [("", ritmo['tirones'])])
+        # `ritmo` puede tener hasta un intervalo de muestreo de atraso: los
+        # buckets, +Inf y count salen de una misma copia del histograma
+        bordes = perf_monitor.marcapasos.bordes_jitter_ms
+        histograma = list(perf_monitor.marcapasos.histograma)
+        acumulado, muestras = 0, []
+        for borde, cuenta in zip(bordes, histograma):
+            acumulado += cuenta
+            muestras.append((f'{{le="{borde}"}}', acumulado))
+        muestras.append(('{le="+Inf"}', sum(histograma)))
+        lineas.append(f"# HELP naves_jitter_ms Desvío de la entrega de frames respecto al objetivo (modo {ritmo['modo']})")
+        lineas.append("# TYPE naves_jitter_ms histogram")
+        for etiquetas, valor in muestras:
+            lineas.append(f"naves_jitter_ms_bucket{etiquetas} {valor}")
+        lineas.append(f"naves_jitter_ms_sum {perf_monitor.marcapasos.jitter_total_ms:.3f}")
+        lineas.append(f"naves_jitter_ms_count {sum(histograma)}")
+
+    sistema = perf_monitor.sistema()
+    if sistema:
+        _metrica(lineas, 'cpu_porcentaje', 'gauge', "CPU del proceso", [("", f"{sistema['cpu']:.1f}")])
+        _metrica(lineas, 'rss_bytes', 'gauge', "Memoria residente del proceso", [("", sistema['rss_bytes'])])
+        _metrica(lineas, 'hilos', 'gauge', "Hilos del proceso", [("", sistema['hilos'])])
+        _metrica(lineas, 'gc_colecciones_total', 'counter', "Colecciones del GC por generación",
+                 [(f'{{generacion="{gen}"}}', n) for gen, n in enumerate(sistema['gc_colecciones'])])
+        _metrica(lineas, 'gc_pendientes', 'gauge', "Contadores de asignación del GC por generación",
+                 [(f'{{generacion="{gen}"}}', n) for gen, n in enumerate(sistema['gc_pendientes'])])
+    return "\n".join(lineas) + "\n"
+
+
+class ExportadorArchivo:
+    # Reescribe el archivo cada `intervalo` segundos; os.replace lo hace atómico
+    # para el textfile collector de node_exporter o cualquier lector.
+    def __init__(self, perf_monitor, ruta, intervalo=METRICAS_INTERVALO):
+        self.perf_monitor = perf_monitor
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="metricas-archivo", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+        logger.info(f"Métricas Prometheus en {self.ruta} cada {self.intervalo}s")
+
+    def _escribir(self):
+        temporal = self.ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.write(texto_prometheus(self.perf_monitor))
+        os.replace(temporal, self.ruta)
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self._escribir()
+            except Exception:
+                logger.exception("Error escribiendo métricas")
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo.is_alive():
+            self._hilo.join(timeout=self.intervalo + 1.0)
+        try:
+            self._escribir()
+        except Exception:
+            logger.exception("Error escribiendo métricas finales")
+
+
+class ExportadorHTTP:
+    # Sirve GET /metrics solo en 127.0.0.1; cada scrape arma el texto en el hilo del servidor
+    def __init__(self, perf_monitor, puerto, host='127.0.0.1'):
+        perf = perf_monitor
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                cuerpo = texto_prometheus(perf).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', TIPO_CONTENIDO)
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                logger.debug("metricas http: " + formato % args)
+
+        self.servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        self.servidor.daemon_threads = True
+        self._hilo = threading.Thread(target=self.servidor.serve_forever, name="metricas-http", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+        host, puerto = self.servidor.server_address[:2]
+        logger.info(f"Métricas Prometheus en http://{host}:{puerto}/metrics")
+
+    def detener(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+def crear_exportador(perf_monitor, ruta=None, puerto=None):
+    try:
+        if puerto is not None:
+            return ExportadorHTTP(perf_monitor, puerto)
+        if ruta:
+            return ExportadorArchivo(perf_monitor, ruta)
+    except Exception:
+        logger.exception("No se pudo crear el exportador de métricas")
+    return None
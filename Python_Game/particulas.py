@@ -0,0 +1,149 @@
+import numpy as np
+import pygame
+
+from config import PARTICULAS_SPLAT_RADIO_MAX, PARTICULAS_SPLAT_INTENSIDAD, PARTICULAS_SPLAT_MINIMO
+from superficies import superficie, ADITIVA
+
+# Columnas de partículas (una fila por partícula), el layout que usaría un
+# almacén vectorizado y el que produce columnas_particulas():
+#   x, y, size, edad relativa (age / lifetime), r, g, b
+COLUMNAS_PARTICULA = ('x', 'y', 'size', 'edad', 'r', 'g', 'b')
+
+
+def columnas_particulas(particulas):
+    # Una sola pasada por los objetos Particle; el resto es NumPy
+    if not particulas:
+        return np.empty((0, len(COLUMNAS_PARTICULA)))
+    return np.array([(p.pos.x, p.pos.y, p.size, p.age / p.lifetime, *p.color) for p in particulas], np.float64)
+
+
+# Los tres canales se acumulan juntos en un uint64, BITS_CANAL bits por canal
+# (R arriba, B abajo): cada aporte es color * peso del núcleo con el peso en
+# NIVELES_NUCLEO niveles, y el núcleo escala los tres campos por igual, así
+# que una sola multiplicación entera pondera los tres canales sin acarreos.
+# Un campo desborda (y acarrea al vecino) si los colores que caen sobre un
+# píxel suman más de LIMITE_CANAL, p. ej. más de 257 partículas a plena
+# intensidad; splat() lo detecta antes y entonces suma canal por canal.
+BITS_CANAL = 21
+BITS_NUCLEO = 5
+NIVELES_NUCLEO = 1 << BITS_NUCLEO
+LIMITE_CANAL = ((1 << BITS_CANAL) - 1) // NIVELES_NUCLEO
+# Campo ya dividido por NIVELES_NUCLEO
+_MASCARA_CANAL = np.uint64((1 << BITS_CANAL - BITS_NUCLEO) - 1)
+
+
+class SplatParticulas:
+    # Dibuja todas las partículas en una pasada: cada una suma un núcleo de
+    # caída radial (uno precalculado por radio entero) ponderado por su color
+    # y su alfa (1 - edad relativa) en un buffer de luz empaquetado, con
+    # np.add.at como scatter-add. El buffer tiene un margen de 2 * radio_max,
+    # así que ningún núcleo se sale. Se desempaqueta recortado a 255 sobre
+    # los bytes de una Surface aditiva, que se suma a la scene con un único
+    # blit BLEND_ADD del rectángulo ocupado; solo ese rectángulo vuelve a cero.
+    #
+    # Desempaquetar el rectángulo cuesta lo mismo con 10 partículas que con
+    # 10000, así que con menos de `minimo` visibles el render dibuja sprites.
+    def __init__(self, radio_max=PARTICULAS_SPLAT_RADIO_MAX, intensidad=PARTICULAS_SPLAT_INTENSIDAD,
+                 minimo=PARTICULAS_SPLAT_MINIMO):
+        self.radio_max = radio_max
+        self.intensidad = intensidad
+        self.minimo = minimo
+        self.luz = None
+        self._acumulado = None
+        self._nucleos = {}
+
+    def nucleo(self, radio):
+        # (desplazamientos en el buffer, pesos en NIVELES_NUCLEO) de los píxeles con peso > 0
+        nucleo = self._nucleos.get(radio)
+        if nucleo is None:
+            d = np.arange(-radio, radio + 1)
+            dy, dx = np.meshgrid(d, d, indexing='ij')
+            pesos = np.rint(np.clip(1 - (dx * dx + dy * dy) / (radio + 0.5) ** 2, 0, 1) * NIVELES_NUCLEO)
+            usados = pesos > 0
+            desplazamientos = dy[usados] * self._acumulado.shape[1] + dx[usados]
+            nucleo = (desplazamientos.astype(np.int32), pesos[usados].astype(np.uint64))
+            self._nucleos[radio] = nucleo
+        return nucleo
+
+    def _preparar(self, tam):
+        if self.luz is not None and self.luz.get_size() == tam:
+            return
+        w, h = tam
+        margen = 2 * self.radio_max
+        self.luz = superficie(tam, ADITIVA)
+        self._acumulado = np.zeros((h + 2 * margen, w + 2 * margen), np.uint64)
+        # Los desplazamientos dependen del ancho del buffer
+        self._nucleos.clear()
+
+    def dibujar(self, scene, particulas, offset=(0, 0), escala=1.0):
+        datos = columnas_particulas(particulas)
+        self.splat(scene, datos[:, 0] * escala + offset[0], datos[:, 1] * escala + offset[1],
+                   datos[:, 2] * escala, 1 - datos[:, 3], datos[:, 4:7])
+
+    def splat(self, scene, x, y, tam, alfa, color):
+        # x, y: centros en píxeles de `scene`; tam: radio en píxeles; alfa en [0, 1]; color (n, 3) 0-255
+        w, h = scene.get_size()
+        r_max = self.radio_max
+        margen = 2 * r_max
+        cx = np.rint(x).astype(np.int32)
+        cy = np.rint(y).astype(np.int32)
+        visibles = (cx >= -r_max) & (cx < w + r_max) & (cy >= -r_max) & (cy < h + r_max) & (alfa > 0)
+        if not visibles.any():
+            return
+        self._preparar((w, h))
+        acumulado = self._acumulado
+        cx, cy = cx[visibles], cy[visibles]
+        radios = np.clip(np.rint(tam[visibles]), 1, r_max).astype(np.int32)
+        # Color ponderado por alfa e intensidad
+        canales = np.minimum(color[visibles] * (alfa[visibles, None] * self.intensidad), 255).astype(np.uint64)
+        base = (cy + margen) * acumulado.shape[1] + (cx + margen)
+
+        # Rectángulo ocupado (todo lo que se suma, incluso fuera de la scene,
+        # vuelve a cero) y su parte dentro de la scene
+        bx0, by0 = int(cx.min()) - r_max, int(cy.min()) - r_max
+        bx1, by1 = int(cx.max()) + r_max + 1, int(cy.max()) + r_max + 1
+        x0, y0, x1, y1 = max(0, bx0), max(0, by0), min(w, bx1), min(h, by1)
+        ocupado = acumulado[by0 + margen:by1 + margen, bx0 + margen:bx1 + margen]
+        region = acumulado[y0 + margen:y1 + margen, x0 + margen:x1 + margen]
+        campo = np.empty(region.shape, np.uint64)
+        pixeles = pygame.surfarray.pixels3d(self.luz).transpose(1, 0, 2)[y0:y1, x0:x1]
+        if self.desborda(cx, cy, canales):
+            # Sin empaquetar, un canal por vez: el uint64 entero no desborda
+            for canal in range(3):
+                self._sumar(base, radios, canales[:, canal])
+                np.right_shift(region, BITS_NUCLEO, out=campo)
+                np.minimum(campo, 255, out=pixeles[..., canal], casting='unsafe')
+                ocupado[...] = 0
+        else:
+            empaquetado = (canales[:, 0] << 2 * BITS_CANAL) | (canales[:, 1] << BITS_CANAL) | canales[:, 2]
+            self._sumar(base, radios, empaquetado)
+            for canal in range(3):
+                np.right_shift(region, (2 - canal) * BITS_CANAL + BITS_NUCLEO, out=campo)
+                campo &= _MASCARA_CANAL
+                np.minimum(campo, 255, out=pixeles[..., canal], casting='unsafe')
+            ocupado[...] = 0
+        del pixeles
+        if x0 < x1 and y0 < y1:
+            scene.blit(self.luz, (x0, y0), pygame.Rect(x0, y0, x1 - x0, y1 - y0), special_flags=pygame.BLEND_ADD)
+
+    def _sumar(self, base, radios, valores):
+        # Scatter-add del núcleo de cada partícula ponderado por su valor
+        plano = self._acumulado.reshape(-1)
+        for radio in np.unique(radios).tolist():
+            desplazamientos, nucleo = self.nucleo(radio)
+            sel = radios == radio
+            np.add.at(plano, (base[sel, None] + desplazamientos[None, :]).ravel(),
+                      (valores[sel, None] * nucleo[None, :]).ravel())
+
+    def desborda(self, cx, cy, canales):
+        # Cota de la suma de colores sobre cada píxel (el peso del núcleo es
+        # <= 1): los centros que alcanzan un píxel caen en a lo sumo 2x2 celdas
+        # de lado 2 * radio_max + 1, así que basta la carga de cada ventana de
+        # 2x2 celdas. Una bincount sobre los centros, barata frente al splat.
+        r_max = self.radio_max
+        lado = 2 * r_max + 1
+        gx, gy = (cx + r_max) // lado, (cy + r_max) // lado
+        forma = (int(gy.max()) + 2, int(gx.max()) + 2)
+        carga = np.bincount(gy * forma[1] + gx, canales.max(axis=1), forma[0] * forma[1]).reshape(forma)
+        ventanas = carga[:-1, :-1] + carga[1:, :-1] + carga[:-1, 1:] + carga[1:, 1:]
+        return ventanas.max() > LIMITE_CANAL
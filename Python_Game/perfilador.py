@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+
+from config import PERFIL_FRAMES, PERFIL_DIRECTORIO, PERFIL_INTERVALO_MUESTREO
+
+logger = logging.getLogger("Naves")
+
+MODOS_PERFIL = ('cprofile', 'muestreo')
+
+
+def _nombre(filename, funcname):
+    base = os.path.basename(filename) if filename != '~' else ''
+    nombre = f"{base}:{funcname}" if base else funcname
+    return nombre.replace(';', ',')
+
+
+def _contar_entidades(entidades):
+    return {clave: len(v) for clave, v in entidades.items() if isinstance(v, list)}
+
+
+def pilas_desde_pstats(stats, peso_minimo=1e-6, profundidad=64):
+    # cProfile solo guarda aristas llamador -> llamado, no pilas completas: el
+    # tottime de cada función se reparte hacia arriba entre sus llamadores en
+    # proporción al tiempo acumulado por cada arista. Es una aproximación.
+    pilas = Counter()
+
+    def subir(func, peso, pila, visitados):
+        llamadores = stats[func][4]
+        total = sum(v[3] for v in llamadores.values())
+        if not llamadores or total <= 0 or len(pila) >= profundidad:
+            pilas[';'.join(reversed(pila))] += peso
+            return
+        for llamador, v in llamadores.items():
+            parte = peso * v[3] / total
+            if parte < peso_minimo:
+                continue
+            if llamador in visitados or llamador not in stats:
+                pilas[';'.join(reversed(pila + [_nombre(llamador[0], llamador[2])]))] += parte
+            else:
+                subir(llamador, parte, pila + [_nombre(llamador[0], llamador[2])], visitados | {llamador})
+
+    for func, (cc, nc, tt, ct, llamadores) in stats.items():
+        if tt > 0:
+            subir(func, tt, [_nombre(func[0], func[2])], {func})
+    return pilas
+
+
+class _Muestreador:
+    # Toma la pila de cada hilo (menos el propio) cada `intervalo` segundos
+    def __init__(self, intervalo):
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.muestras = 0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="perfil-muestreo", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+
+    def _bucle(self):
+        propio = threading.get_ident()
+        nombres = {}
+        while not self._detener.wait(self.intervalo):
+            for hilo in threading.enumerate():
+                nombres.setdefault(hilo.ident, hilo.name)
+            for ident, frame in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila = []
+                while frame is not None:
+                    pila.append(_nombre(frame.f_code.co_filename, frame.f_code.co_name))
+                    frame = frame.f_back
+                pila.append(nombres.get(ident, f"hilo-{ident}"))
+                self.pilas[';'.join(reversed(pila))] += 1
+            self.muestras += 1
+
+
+class CapturaPerfil:
+    # Perfila solo los próximos N frames y escribe, en segundo plano:
+    #   <base>.pstats     (modo cprofile; solo el hilo principal)
+    #   <base>.collapsed  pilas "a;b;c peso" para flamegraph.pl / speedscope
+    #   <base>.txt        frames, conteo de entidades y las funciones más costosas
+    # <base> lleva el rango de frames y el conteo de entidades al iniciar.
+    def __init__(self, modo='cprofile', directorio=PERFIL_DIRECTORIO, intervalo_muestreo=PERFIL_INTERVALO_MUESTREO):
+        if modo not in MODOS_PERFIL:
+            raise ValueError(f"Modo de perfil desconocido: {modo}")
+        self.modo = modo
+        self.directorio = directorio
+        self.intervalo_muestreo = intervalo_muestreo
+        self.frame = 0
+        self._solicitud = None
+        self._activa = None
+        self._escritores = []
+
+    @property
+    def activa(self):
+        return self._activa is not None
+
+    def solicitar(self, frames=PERFIL_FRAMES, desde=None):
+        if self._activa or self._solicitud:
+            logger.info("Ya hay una captura de perfil en curso")
+            return
+        self._solicitud = (frames, self.frame if desde is None else desde)
+        logger.info(f"Captura de perfil ({self.modo}) de {frames} frames solicitada")
+
+    def iniciar_frame(self, entidades):
+        if self._solicitud is None or self.frame < self._solicitud[1]:
+            return
+        frames, _ = self._solicitud
+        self._solicitud = None
+        captura = {
+            'frames': frames,
+            'restantes': frames,
+            'frame_inicio': self.frame,
+            'entidades_inicio': _contar_entidades(entidades),
+            'dibujo': Counter(),
+            't_inicio': time.perf_counter(),
+        }
+        if self.modo == 'cprofile':
+            captura['perfil'] = cProfile.Profile()
+            captura['perfil'].enable()
+        else:
+            captura['muestreador'] = _Muestreador(self.intervalo_muestreo)
+            captura['muestreador'].iniciar()
+        self._activa = captura
+
+    def terminar_frame(self, entidades, contadores=None):
+        # `contadores`: dibujados/descartados por la cámara en este frame
+        captura = self._activa
+        self.frame += 1
+        if captura is None:
+            return
+        if contadores:
+            captura['dibujo'].update(contadores)
+        captura['restantes'] -= 1
+        if captura['restantes'] > 0:
+            return
+        if self.modo == 'cprofile':
+            captura['perfil'].disable()
+        else:
+            captura['muestreador'].detener()
+        captura['duracion'] = time.perf_counter() - captura['t_inicio']
+        captura['frame_fin'] = self.frame - 1
+        captura['entidades_fin'] = _contar_entidades(entidades)
+        self._activa = None
+
+        escritor = threading.Thread(target=self._escribir, args=(captura,), name="perfil-escritura", daemon=True)
+        escritor.start()
+        self._escritores.append(escritor)
+
+    def finalizar(self, entidades=None):
+        # Cierra una captura a medias (p. ej. al salir) y espera las escrituras pendientes
+        if self._activa:
+            self._activa['restantes'] = 1
+            self.frame -= 1
+            self.terminar_frame(entidades or {})
+        for escritor in self._escritores:
+            escritor.join()
+        self._escritores.clear()
+
+    def _ruta_base(self, captura):
+        conteos = captura['entidades_inicio']
+        etiqueta = "_".join(f"{clave[:3]}{n}" for clave, n in conteos.items()
+                            if clave in ('enemigos', 'particles', 'lasers', 'misiles'))
+        nombre = f"perfil_{self.modo}_f{captura['frame_inicio']}-{captura['frame_fin']}_{etiqueta}"
+        return os.path.join(self.directorio, nombre)
+
+    def _escribir(self, captura):
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            base = self._ruta_base(captura)
+            lineas = [
+                f"modo: {self.modo}",
+                f"frames: {captura['frame_inicio']}-{captura['frame_fin']} ({captura['frames']})",
+                f"duración: {captura['duracion'] * 1000:.1f} ms "
+                f"({captura['duracion'] * 1000 / captura['frames']:.2f} ms/frame)",
+                f"entidades al iniciar: {captura['entidades_inicio']}",
+                f"entidades al terminar: {captura['entidades_fin']}",
+            ]
+            if captura['dibujo']:
+                lineas.append("por frame (media): " + ", ".join(
+                    f"{clave} {n / captura['frames']:.1f}" for clave, n in sorted(captura['dibujo'].items())))
+            lineas.append("")
+            if self.modo == 'cprofile':
+                captura['perfil'].dump_stats(base + '.pstats')
+                stats = pstats.Stats(captura['perfil'])
+                # Pesos en microsegundos de tottime
+                pilas = {pila: round(peso * 1e6) for pila, peso in pilas_desde_pstats(stats.stats).items()}
+                with open(base + '.txt', 'w', encoding='utf-8') as f:
+                    f.write("\n".join(lineas))
+                    stats.stream = f
+                    stats.sort_stats('cumulative').print_stats(30)
+            else:
+                muestreador = captura['muestreador']
+                # Pesos en cantidad de muestras
+                pilas = muestreador.pilas
+                lineas.append(f"muestras: {muestreador.muestras} cada {self.intervalo_muestreo * 1000:.1f} ms")
+                hojas = Counter()
+                for pila, n in pilas.items():
+                    hojas[pila.rsplit(';', 1)[-1]] += n
+                lineas += ["", "Funciones con más muestras propias:"]
+                lineas += [f"{n:>8}  {hoja}" for hoja, n in hojas.most_common(30)]
+                with open(base + '.txt', 'w', encoding='utf-8') as f:
+                    f.write("\n".join(lineas) + "\n")
+
+            with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+                for pila, peso in sorted(pilas.items()):
+                    if peso > 0:
+                        f.write(f"{pila} {peso}\n")
+            logger.info(f"Perfil escrito en {base}.*")
+        except Exception:
+            logger.exception("Error escribiendo la captura de perfil")
@@ -1,40 +1,116 @@
+import os
+import gc
 import time
 import logging
+import threading
 import psutil
 
+from config import METRICAS_INTERVALO
+
 logger = logging.getLogger("Naves")
 
 
+class MuestreadorSistema:
+    # Hilo daemon de baja prioridad que muestrea el proceso cada `intervalo` segundos.
+    # El hilo del juego solo lee `ultima`, que se reemplaza entera en cada muestra.
+    def __init__(self, intervalo=METRICAS_INTERVALO):
+        self.intervalo = intervalo
+        self.process = psutil.Process()
+        self.ultima = {'cpu': 0.0, 'memory': 0.0, 'rss_bytes': 0, 'hilos': 0, 'gc_colecciones': (0, 0, 0),
+                       'gc_pendientes': (0, 0, 0), 'muestras': 0}
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="muestreo-sistema", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo.is_alive():
+            self._hilo.join(timeout=self.intervalo + 1.0)
+
+    def _bajar_prioridad(self):
+        # En Linux cada hilo es una tarea con su propio nice
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            logger.debug("No se pudo bajar la prioridad del hilo de métricas")
+
+    def _bucle(self):
+        self._bajar_prioridad()
+        self.process.cpu_percent()
+        muestras = 0
+        while not self._detener.wait(self.intervalo):
+            try:
+                with self.process.oneshot():
+                    cpu = self.process.cpu_percent()
+                    rss = self.process.memory_info().rss
+                    hilos = self.process.num_threads()
+                muestras += 1
+                self.ultima = {
+                    'cpu': cpu,
+                    'memory': rss / 1024.0 / 1024.0,
+                    'rss_bytes': rss,
+                    'hilos': hilos,
+                    'gc_colecciones': tuple(g['collections'] for g in gc.get_stats()),
+                    'gc_pendientes': gc.get_count(),
+                    'muestras': muestras,
+                }
+            except Exception:
+                logger.exception("Error muestreando métricas del sistema")
+
+
 class PerformanceMonitor:
-    def __init__(self):
+    def __init__(self, marcapasos=None, intervalo_muestreo=METRICAS_INTERVALO):
+        self.marcapasos = marcapasos
+        self.intervalo_muestreo = intervalo_muestreo
+        self._ritmo = None
+        self._t_ritmo = 0.0
         try:
-            self.process = psutil.Process()
+            self.muestreador = MuestreadorSistema(intervalo_muestreo)
+            self.muestreador.iniciar()
         except Exception:
             logger.exception("psutil no disponible; se deshabilitarán métricas avanzadas")
-            self.process = None
+            self.muestreador = None
         self.last_time = time.time()
         self.frame_times = []
+        self.frames_totales = 0
+        self.tiempo_frames_total = 0.0
 
     def update(self):
         current = time.time()
         frame_ms = (current - self.last_time) * 1000.0
         self.last_time = current
         self.frame_times.append(frame_ms)
+        self.frames_totales += 1
+        self.tiempo_frames_total += frame_ms / 1000.0
         if len(self.frame_times) > 60:
             self.frame_times.pop(0)
 
+    def sistema(self):
+        return self.muestreador.ultima if self.muestreador else None
+
     def get_stats(self):
-        cpu_percent = self.process.cpu_percent() if self.process else 0.0
-        memory_mb = (
-            self.process.memory_info().rss / 1024.0 / 1024.0
-            if self.process
-            else 0.0
-        )
-        avg_frame = sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+        sistema = self.sistema()
+        frame_times = list(self.frame_times)
+        avg_frame = sum(frame_times) / len(frame_times) if frame_times else 0.0
         fps = 1000.0 / avg_frame if avg_frame > 0 else 0.0
-        return {
-            'cpu': cpu_percent,
-            'memory': memory_mb,
+        stats = {
+            'cpu': sistema['cpu'] if sistema else 0.0,
+            'memory': sistema['memory'] if sistema else 0.0,
             'avg_frame_ms': avg_frame,
             'fps': fps,
         }
+        if self.marcapasos is not None:
+            # estadisticas() ordena la ventana de jitter: se recalcula al ritmo
+            # del muestreador, no en cada frame del HUD
+            ahora = time.time()
+            if self._ritmo is None or ahora - self._t_ritmo >= self.intervalo_muestreo:
+                self._ritmo = self.marcapasos.estadisticas()
+                self._t_ritmo = ahora
+            stats['ritmo'] = self._ritmo
+        return stats
+
+    def detener(self):
+        if self.muestreador:
+            self.muestreador.detener()
@@ -0,0 +1,123 @@
+import queue
+import logging
+import threading
+from collections import namedtuple
+from pygame.math import Vector2
+
+from logic import simular_frame
+from eventos import ColaEventos
+
+logger = logging.getLogger("Naves")
+
+# Reglas de propiedad del estado compartido en modo pipeline:
+#  - `entidades` y `stats` pertenecen al hilo de simulación desde `enviar()`
+#    hasta que `esperar()` devuelve. En ese intervalo el hilo principal solo
+#    puede leer el snapshot del frame anterior.
+#  - Entre `esperar()` y el siguiente `enviar()` la simulación está detenida y
+#    el hilo principal puede tocar `entidades`/`stats` (eventos, toggles, shake,
+#    partículas emitidas al dibujar).
+#  - Un snapshot nunca se modifica después de publicarse, salvo la lista de
+#    partículas, donde `Nave.dibujar` agrega la estela del motor; esas
+#    partículas se devuelven a la simulación con `particulas_emitidas()`.
+
+EntradaFrame = namedtuple('EntradaFrame', ['dt', 'mouse_pos', 'botones', 'teclas'])
+
+CLAVES_DIBUJABLES = ('lasers', 'misiles', 'estelas', 'enemigos', 'particles', 'stars', 'nebulas', 'fogs')
+
+
+# Atributos mutables por clase que la simulación modifica in-place: los
+# Vector2 se copian y los objetos con `congelar()` (p. ej. Estela) se delegan.
+_ATRIBUTOS_MUTABLES = {}
+
+
+def _congelar(obj):
+    if hasattr(obj, 'congelar'):
+        return obj.congelar()
+    cls = obj.__class__
+    copia = object.__new__(cls)
+    estado = copia.__dict__
+    estado.update(obj.__dict__)
+    mutables = _ATRIBUTOS_MUTABLES.get(cls)
+    if mutables is None:
+        mutables = (
+            tuple(k for k, v in estado.items() if isinstance(v, Vector2)),
+            tuple(k for k, v in estado.items() if hasattr(v, 'congelar')),
+        )
+        _ATRIBUTOS_MUTABLES[cls] = mutables
+    vectores, congelables = mutables
+    for clave in vectores:
+        estado[clave] = Vector2(estado[clave])
+    for clave in congelables:
+        estado[clave] = estado[clave].congelar()
+    return copia
+
+
+class SnapshotMundo:
+    __slots__ = ('entidades', 'nave', 'stats', 'haz_activo', 'mouse_pos', '_n_particulas')
+
+    def __init__(self, entidades, stats, haz_activo, mouse_pos):
+        self.nave = _congelar(entidades['nave'])
+        self.entidades = {'nave': self.nave}
+        for clave in CLAVES_DIBUJABLES:
+            self.entidades[clave] = [_congelar(e) for e in entidades[clave]]
+        self.stats = dict(stats)
+        self.haz_activo = haz_activo
+        self.mouse_pos = mouse_pos
+        self._n_particulas = len(self.entidades['particles'])
+
+    def particulas_emitidas(self):
+        return self.entidades['particles'][self._n_particulas:]
+
+
+class SimulacionPipeline:
+    def __init__(self, entidades, recursos, stats, shake_callback, camara=None):
+        self.entidades = entidades
+        self.recursos = recursos
+        self.stats = stats
+        self.shake_callback = shake_callback
+        self.eventos = ColaEventos()
+        # Solo se mueve con la simulación detenida (post_simulacion); aquí se usa para el LOD
+        self.camara = camara
+        self._entradas = queue.Queue(maxsize=1)
+        self._salidas = queue.Queue(maxsize=1)
+        self._hilo = None
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._bucle, name="simulacion", daemon=True)
+        self._hilo.start()
+
+    def capturar(self, haz_activo=False, mouse_pos=(0, 0)):
+        return SnapshotMundo(self.entidades, self.stats, haz_activo, mouse_pos)
+
+    def enviar(self, entrada):
+        self._entradas.put(entrada)
+
+    def esperar(self):
+        resultado = self._salidas.get()
+        if isinstance(resultado, BaseException):
+            raise resultado
+        return resultado
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        self._entradas.put(None)
+        self._hilo.join()
+        self._hilo = None
+
+    def _bucle(self):
+        while True:
+            entrada = self._entradas.get()
+            if entrada is None:
+                return
+            try:
+                haz_activo = simular_frame(
+                    self.entidades, self.recursos, self.stats, entrada.dt, entrada.mouse_pos,
+                    self.shake_callback, entrada.botones, entrada.teclas, eventos=self.eventos,
+                    camara=self.camara,
+                )
+                self._salidas.put(self.capturar(haz_activo, entrada.mouse_pos))
+            except Exception as exc:
+                logger.exception("Error en el hilo de simulación")
+                self._salidas.put(exc)
+                return
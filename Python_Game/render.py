@@ -1,7 +1,12 @@
 import pygame
 from pygame.math import Vector2
 
-from config import ANCHO, ALTO, COLOR_FONDO_BASE, ALCANCE_BEAM, COLOR_BEAM
+from config import (
+    ANCHO, ALTO, COLOR_FONDO_BASE, ALCANCE_BEAM, COLOR_BEAM, BLOOM_INTENSITY, BLOOM_DOWNSCALE,
+    FONDO_UMBRAL_PX, FONDO_INTERVALO,
+)
+from utils import apply_bloom
+from superficies import superficie
 
 
 def dibujar_ui(scene, entidades, stats, nave, reloj, perf_monitor=None, fuente=None):
@@ -33,24 +38,116 @@ def dibujar_ui(scene, entidades, stats, nave, reloj, perf_monitor=None, fuente=N
         surf_perf = fuente.render(perf_text, True, (180,180,255))
         scene.blit(surf_perf, (10,60))
 
-def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui):
-    scene.fill(COLOR_FONDO_BASE)
-    for n in entidades['nebulas']:
-        n.dibujar(scene)
-    for s in entidades['stars']:
-        s.dibujar(scene)
-    for f in entidades['fogs']:
-        f.dibujar(scene)
-    for e in entidades['enemigos']:
-        e.dibujar(scene, (0,0), recursos.get('enemigo'))
-    for m in entidades['misiles']:
-        m.dibujar(scene, (0,0))
-    for l in entidades['lasers']:
-        l.dibujar(scene, (0,0))
+class CapaFondo:
+    # Capas lentas del fondo (nebulosas y niebla, parallax <= 0.2) compuestas
+    # en una Surface que se reutiliza como base de la scene. Se recompone
+    # cuando alguna se movió al menos `umbral` px (en coordenadas de
+    # pantalla) desde la última composición, o cada `intervalo` frames por la
+    # rotación de las nebulosas. Las estrellas (parallax hasta 0.4, ~1 px por
+    # frame a velocidad máxima) se siguen dibujando directo encima, así que
+    # quedan sobre la niebla en vez de debajo (su alfa es de 10 como mucho).
+    # No se usa Surface.scroll: cada objeto tiene su propio factor de parallax
+    # y un scroll uniforme los desalinearía.
+    CLAVES = ('nebulas', 'fogs')
+
+    def __init__(self, umbral=FONDO_UMBRAL_PX, intervalo=FONDO_INTERVALO):
+        self.umbral = umbral
+        self.intervalo = intervalo
+        self.superficie = None
+        self.recomposiciones = 0
+        self._escala = None
+        self._frames = 0
+        self._posiciones = []
+
+    def _movido(self, entidades):
+        # Compara por índice: los snapshots del pipeline copian los objetos en cada frame
+        umbral = self.umbral
+        i = 0
+        posiciones = self._posiciones
+        for clave in self.CLAVES:
+            for obj in entidades[clave]:
+                if i >= len(posiciones):
+                    return True
+                x, y = posiciones[i]
+                if abs(obj.x - x) >= umbral or abs(obj.y - y) >= umbral:
+                    return True
+                i += 1
+        return i != len(posiciones)
+
+    def _componer(self, entidades, tam, escala):
+        if self.superficie is None or self.superficie.get_size() != tam:
+            self.superficie = superficie(tam)
+        self.superficie.fill(COLOR_FONDO_BASE)
+        for n in entidades['nebulas']:
+            n.dibujar(self.superficie, escala)
+        for f in entidades['fogs']:
+            f.dibujar(self.superficie, escala)
+        self._posiciones = [(obj.x, obj.y) for clave in self.CLAVES for obj in entidades[clave]]
+        self._escala = escala
+        self._frames = 0
+        self.recomposiciones += 1
+
+    def base(self, entidades, tam, escala=1.0):
+        self._frames += 1
+        if (self.superficie is None or self.superficie.get_size() != tam or self._escala != escala
+                or self._frames >= self.intervalo or self._movido(entidades)):
+            self._componer(entidades, tam, escala)
+        return self.superficie
+
+
+def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stats, reloj, fuente_ui,
+                   escala=1.0, hud=True, perf_monitor=None, camara=None, fondo=None, splat=None):
+    # `escala` es la resolución interna: el mundo se dibuja en coordenadas de
+    # pantalla multiplicadas por ella sobre una `scene` proporcionalmente menor.
+    # Con `camara`, las entidades están en coordenadas de mundo: se desplazan
+    # por la vista y las que quedan fuera no se dibujan. Con `fondo` (CapaFondo)
+    # las capas del fondo se copian de la composición cacheada. Con `splat`
+    # (SplatParticulas) y al menos splat.minimo partículas visibles, estas se
+    # suman en un solo blit aditivo.
+    if fondo is not None:
+        scene.blit(fondo.base(entidades, scene.get_size(), escala), (0, 0))
+        for s in entidades['stars']:
+            s.dibujar(scene, escala)
+    else:
+        scene.fill(COLOR_FONDO_BASE)
+        for n in entidades['nebulas']:
+            n.dibujar(scene, escala)
+        for s in entidades['stars']:
+            s.dibujar(scene, escala)
+        for f in entidades['fogs']:
+            f.dibujar(scene, escala)
+
+    if camara is None:
+        offset = (0, 0)
+        enemigos, estelas = entidades['enemigos'], entidades['estelas']
+        misiles, lasers, particulas = entidades['misiles'], entidades['lasers'], entidades['particles']
+    else:
+        offset = camara.desplazamiento(escala)
+        enemigos = camara.filtrar_visibles(entidades['enemigos'])
+        estelas = [est for est in entidades['estelas'] if camara.caja_visible(est.caja())]
+        misiles = camara.filtrar_visibles(entidades['misiles'])
+        lasers = camara.filtrar_visibles(entidades['lasers'])
+    # Sprite y barra de vida de todos los enemigos en un solo Surface.blits()
+    lote, img_enemigo = [], recursos.get('enemigo')
+    for e in enemigos:
+        e.agregar_blits(lote, offset, img_enemigo, escala)
+    scene.blits(lote, doreturn=False)
+    for est in estelas:
+        est.dibujar(scene, offset, escala)
+    for m in misiles:
+        m.dibujar(scene, offset, escala)
+    for l in lasers:
+        l.dibujar(scene, offset, escala)
     if nave.alive:
-        nave.dibujar(scene, (0,0), entidades['particles'], recursos.get('jugador'))
-    for p in entidades['particles']:
-        p.dibujar(scene, (0,0))
+        nave.dibujar(scene, offset, entidades['particles'], recursos.get('jugador'), escala)
+    if camara is not None:
+        # Después de la nave, que emite las partículas del motor al dibujarse
+        particulas = camara.filtrar_visibles(entidades['particles'])
+    if splat is not None and len(particulas) >= splat.minimo:
+        splat.dibujar(scene, particulas, offset, escala)
+    else:
+        for p in particulas:
+            p.dibujar(scene, offset, escala)
 
     if haz_activo:
         origen = nave.pos
@@ -60,8 +157,8 @@ def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stat
             dir_norm = dir_beam.normalize()
 
             # Aplicar desfase de 6 unidades desde la nave
-            origen_desfasado = origen + dir_norm * 26
-            end_pos = origen_desfasado + dir_norm * min(ALCANCE_BEAM, dist - 26)
+            origen_desfasado = (origen + dir_norm * 26) * escala + Vector2(offset)
+            end_pos = origen_desfasado + dir_norm * min(ALCANCE_BEAM, dist - 26) * escala
 
             # Capa 1: Brillo exterior difuso
             for i in range(5, 0, -1):
@@ -72,7 +169,7 @@ def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stat
                     (*COLOR_BEAM, alpha),
                     (int(origen_desfasado.x), int(origen_desfasado.y)),
                     (int(end_pos.x), int(end_pos.y)),
-                    width
+                    max(1, int(width * escala))
                 )
 
             # Capa 2: Brillo medio
@@ -84,7 +181,7 @@ def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stat
                     (*COLOR_BEAM, alpha),
                     (int(origen_desfasado.x), int(origen_desfasado.y)),
                     (int(end_pos.x), int(end_pos.y)),
-                    width
+                    max(1, int(width * escala))
                 )
 
             # Capa 3: Núcleo brillante blanco
@@ -93,9 +190,27 @@ def dibujar_escena(scene, entidades, recursos, haz_activo, nave, mouse_pos, stat
                 (255, 255, 255, 200),
                 (int(origen_desfasado.x), int(origen_desfasado.y)),
                 (int(end_pos.x), int(end_pos.y)),
-                6
+                max(1, int(6 * escala))
             )
 
 
-
-    dibujar_ui(scene, entidades, stats, nave, reloj, fuente=fuente_ui)
+    if hud:
+        dibujar_ui(scene, entidades, stats, nave, reloj, perf_monitor, fuente_ui)
+
+
+def componer_frame(pantalla, scene, offset, ampliada=None):
+    # Con una scene de resolución interna menor, bloom y suma se hacen a esa
+    # resolución y el resultado se amplía una sola vez sobre `ampliada`
+    escala = scene.get_width() / pantalla.get_width()
+    downscale = max(1, round(BLOOM_DOWNSCALE * escala))
+    bloom = apply_bloom(scene, intensity=BLOOM_INTENSITY, downscale=downscale)
+    pantalla.fill((0, 0, 0))
+    if scene.get_size() == pantalla.get_size():
+        pantalla.blit(scene, offset)
+        pantalla.blit(bloom, offset, special_flags=pygame.BLEND_ADD)
+        return
+    scene.blit(bloom, (0, 0), special_flags=pygame.BLEND_ADD)
+    if ampliada is None:
+        ampliada = superficie(pantalla.get_size())
+    pygame.transform.smoothscale(scene, pantalla.get_size(), ampliada)
+    pantalla.blit(ampliada, offset)
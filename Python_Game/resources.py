@@ -4,7 +4,7 @@ import pygame
 
 from pygame.math import Vector2
 from config import (
-    ANCHO, ALTO,
+    MUNDO_ANCHO, MUNDO_ALTO,
     CANT_ENEMIGOS_INICIAL,
     STAR_COUNT,
     NEBULA_COUNT_MIN, NEBULA_COUNT_MAX,
@@ -12,15 +12,22 @@ from config import (
     VELOCIDAD_BASE_ENEMIGO,
 )
 from utils import create_sound_tone
+from sintesis import BancoVariantes
+from superficies import adaptar
 from entities import Nave, Enemigo, Star, Nebula, Fog
 
 logger = logging.getLogger("Naves")
 
 
+def _cargar_imagen(ruta):
+    # Sin modo de video (backend de texturas) no hay formato de pantalla al que convertir
+    return adaptar(pygame.image.load(ruta))
+
+
 def cargar_recursos():
     recursos = {}
     try:
-        img = pygame.image.load('jugador.png').convert_alpha()
+        img = _cargar_imagen('jugador.png')
         recursos['jugador'] = pygame.transform.rotate(
             pygame.transform.scale(img, (40, 40)), 180
         )
@@ -29,13 +36,13 @@ def cargar_recursos():
         recursos['jugador'] = None
 
     try:
-        img = pygame.image.load('enemigos.png').convert_alpha()
+        img = _cargar_imagen('enemigos.png')
         recursos['enemigo'] = pygame.transform.scale(img, (36, 36))
     except Exception:
         recursos['enemigo'] = None
 
     try:
-        img = pygame.image.load('nebulosa.png').convert_alpha()
+        img = _cargar_imagen('nebulosa.png')
         recursos['nebulosa'] = pygame.transform.scale(img, (120, 120))
     except Exception:
         recursos['nebulosa'] = None
@@ -50,17 +57,25 @@ def cargar_recursos():
         logger.info("SFX faltantes; usando tonos sintetizados o None")
         recursos['s_shot'] = create_sound_tone(1200, 0.07, 0.12)
         recursos['s_missile'] = create_sound_tone(420, 0.12, 0.16)
-        recursos['s_explosion'] = create_sound_tone(160, 0.5, 0.18)
+        recursos['s_explosion'] = _banco_explosion()
         recursos['s_beam'] = create_sound_tone(720, 0.3, 0.06)
 
     return recursos
 
 
+def _banco_explosion():
+    # Explosiones con tono variado; el tono base queda memoizado para el banco
+    if create_sound_tone(160, 0.5, 0.18) is None:
+        return None
+    return BancoVariantes(160, 0.5, 0.18).iniciar()
+
+
 def inicializar_entidades(recursos):
     entidades = {
-        'nave': Nave((ANCHO / 2, ALTO / 2)),
+        'nave': Nave((MUNDO_ANCHO / 2, MUNDO_ALTO / 2)),
         'lasers': [],
         'misiles': [],
+        'estelas': [],
         'enemigos': [Enemigo(VELOCIDAD_BASE_ENEMIGO) for _ in range(CANT_ENEMIGOS_INICIAL)],
         'particles': [],
         'stars': [Star() for _ in range(STAR_COUNT)],
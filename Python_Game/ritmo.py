@@ -0,0 +1,118 @@
+import time
+import bisect
+import logging
+from collections import deque
+
+from config import FPS, MODO_RITMO, RITMO_MARGEN_SPIN, DT_MAXIMO, DT_SUAVIZADO, JITTER_BORDES_MS
+
+logger = logging.getLogger("Naves")
+
+MODOS_RITMO = ('sleep', 'hibrido', 'vsync', 'libre')
+
+
+class Marcapasos:
+    # Reemplazo de pygame.time.Clock: tick() devuelve dt en segundos y get_fps() lo usa el HUD.
+    #   sleep    duerme hasta el próximo deadline (granularidad del SO)
+    #   hibrido  duerme hasta `margen_spin` antes del deadline y termina girando sobre perf_counter
+    #   vsync    no espera: el flip del backend bloquea hasta el refresco
+    #   libre    sin límite
+    # Los deadlines avanzan de a un período desde el anterior (no desde "ahora"),
+    # así un frame tardío no corre a todos los siguientes.
+    def __init__(self, modo=MODO_RITMO, fps=FPS, margen_spin=RITMO_MARGEN_SPIN,
+                 dt_maximo=DT_MAXIMO, suavizado=DT_SUAVIZADO, bordes_jitter_ms=JITTER_BORDES_MS):
+        if modo not in MODOS_RITMO:
+            raise ValueError(f"Modo de ritmo desconocido: {modo}")
+        self.modo = modo
+        self.periodo = 1.0 / fps if fps else 0.0
+        self.margen_spin = margen_spin
+        self.dt_maximo = dt_maximo
+        self.suavizado = suavizado
+        self.bordes_jitter_ms = tuple(bordes_jitter_ms)
+        self.histograma = [0] * (len(self.bordes_jitter_ms) + 1)
+        self.jitter_total_ms = 0.0
+        self._jitter_recientes = deque(maxlen=1000)
+        self._intervalos = deque(maxlen=60)
+        self.frames = 0
+        self.tirones = 0
+        self._ultimo = None
+        self._deadline = None
+        self._dt = self.periodo or 1.0 / FPS
+
+    def _esperar(self):
+        ahora = time.perf_counter()
+        if self.modo in ('vsync', 'libre') or not self.periodo or self._deadline is None:
+            return ahora
+        if ahora - self._deadline > self.periodo:
+            # Atrasados más de un frame: no intentar recuperar en ráfaga
+            self._deadline = ahora
+            return ahora
+        if self.modo == 'sleep':
+            restante = self._deadline - ahora
+            if restante > 0:
+                time.sleep(restante)
+        else:
+            restante = self._deadline - ahora - self.margen_spin
+            if restante > 0:
+                time.sleep(restante)
+            while time.perf_counter() < self._deadline:
+                pass
+        return time.perf_counter()
+
+    def tick(self, fps=None):
+        # `fps` se acepta por compatibilidad con Clock.tick y se ignora
+        ahora = self._esperar()
+        if self._ultimo is None:
+            self._ultimo = ahora
+            self._deadline = ahora + self.periodo
+            return self._dt
+
+        intervalo = ahora - self._ultimo
+        self._ultimo = ahora
+        if self.periodo:
+            self._deadline += self.periodo
+        self._registrar(intervalo)
+
+        dt = intervalo
+        if dt > self.dt_maximo:
+            self.tirones += 1
+            dt = self.dt_maximo
+        self._dt += (dt - self._dt) * self.suavizado
+        return self._dt
+
+    def _registrar(self, intervalo):
+        self.frames += 1
+        self._intervalos.append(intervalo)
+        # Sin objetivo fijo (vsync/libre) el jitter se mide contra el intervalo medio reciente
+        objetivo = self.periodo if self.modo in ('sleep', 'hibrido') and self.periodo else (
+            sum(self._intervalos) / len(self._intervalos))
+        jitter_ms = abs(intervalo - objetivo) * 1000.0
+        # Buckets (b_i-1, b_i], como los le= del histograma Prometheus
+        self.histograma[bisect.bisect_left(self.bordes_jitter_ms, jitter_ms)] += 1
+        self.jitter_total_ms += jitter_ms
+        self._jitter_recientes.append(jitter_ms)
+
+    def get_fps(self):
+        if not self._intervalos:
+            return 0.0
+        return len(self._intervalos) / sum(self._intervalos)
+
+    def get_time(self):
+        return self._dt * 1000.0
+
+    def estadisticas(self):
+        recientes = sorted(self._jitter_recientes)
+
+        def percentil(p):
+            return recientes[min(len(recientes) - 1, int(p * len(recientes)))] if recientes else 0.0
+
+        etiquetas = [f"<={b}" for b in self.bordes_jitter_ms] + [f">{self.bordes_jitter_ms[-1]}"]
+        return {
+            'modo': self.modo,
+            'frames': self.frames,
+            'tirones': self.tirones,
+            'dt_ms': self._dt * 1000.0,
+            'jitter_p50_ms': percentil(0.5),
+            'jitter_p99_ms': percentil(0.99),
+            'jitter_max_ms': recientes[-1] if recientes else 0.0,
+            'jitter_histograma': dict(zip(etiquetas, self.histograma)),
+        }
@@ -0,0 +1,105 @@
+import random
+import logging
+import threading
+import numpy as np
+import pygame
+
+from config import SINTESIS_VARIANTES, SINTESIS_RANGO_TONO
+
+logger = logging.getLogger("Naves")
+
+FRECUENCIA_MUESTREO = 44100
+
+# Tono: seno a media amplitud con envolvente exp(-5t). Se calcula en buffers
+# float64 reutilizables por hilo y se escribe directo, con el truncado de
+# np.int16, en el canal 0 de un buffer int16 intercalado (n, canales). Los
+# demás canales se copian desde esa vista con stride. Sound(array=) exige un
+# array C-contiguo y hace la única copia hacia SDL. t = i * (duracion / n) y
+# el orden de las multiplicaciones son los de la versión con np.linspace, así
+# que las muestras coinciden bit a bit con ella.
+_locales = threading.local()
+_tonos = {}
+_candado_tonos = threading.Lock()
+
+
+def _trabajo(n):
+    # Índices 0..n-1 y dos buffers de trabajo; crecen al doble y se reutilizan
+    buffers = getattr(_locales, 'buffers', None)
+    if buffers is None or len(buffers[0]) < n:
+        tam = max(n, 2 * len(buffers[0]) if buffers else n)
+        buffers = (np.arange(tam, dtype=np.float64), np.empty(tam), np.empty(tam))
+        _locales.buffers = buffers
+    indices, fase, envolvente = buffers
+    return indices[:n], fase[:n], envolvente[:n]
+
+
+def _canales_mezclador():
+    iniciado = pygame.mixer.get_init()
+    return iniciado[2] if iniciado else 2
+
+
+def sintetizar_pcm(frecuencia, duracion, volumen, frecuencia_muestreo=FRECUENCIA_MUESTREO, canales=2):
+    n = int(frecuencia_muestreo * duracion)
+    pcm = np.empty((n, canales), np.int16)
+    indices, fase, t = _trabajo(n)
+    np.multiply(indices, duracion / n if n else 0.0, out=t)
+    np.multiply(t, 2 * np.pi * frecuencia, out=fase)
+    np.sin(fase, out=fase)
+    fase *= 0.5
+    # La envolvente reutiliza el buffer de t
+    envolvente = np.multiply(t, -5, out=t)
+    np.exp(envolvente, out=envolvente)
+    fase *= envolvente
+    fase *= volumen
+    fase *= 32767
+    np.copyto(pcm[:, 0], fase, casting='unsafe')
+    if canales > 1:
+        pcm[:, 1:] = pcm[:, :1]
+    return pcm
+
+
+def crear_tono(frecuencia=440, duracion=0.12, volumen=0.2, frecuencia_muestreo=FRECUENCIA_MUESTREO):
+    clave = (frecuencia, duracion, volumen, frecuencia_muestreo)
+    sonido = _tonos.get(clave)
+    if sonido is None:
+        sonido = pygame.sndarray.make_sound(
+            sintetizar_pcm(frecuencia, duracion, volumen, frecuencia_muestreo, _canales_mezclador()))
+        with _candado_tonos:
+            sonido = _tonos.setdefault(clave, sonido)
+    return sonido
+
+
+class BancoVariantes:
+    # Variantes del mismo tono con la frecuencia desplazada hasta ±rango, generadas
+    # en segundo plano. Mientras no estén listas, play() usa el tono base.
+    # Se usa como un Sound: play() elige una variante al azar.
+    def __init__(self, frecuencia, duracion, volumen, variantes=SINTESIS_VARIANTES, rango=SINTESIS_RANGO_TONO):
+        self.base = crear_tono(frecuencia, duracion, volumen)
+        self.variantes = []
+        factores = np.linspace(1 - rango, 1 + rango, variantes) if variantes > 1 else [1.0]
+        self._claves = [(round(frecuencia * f, 2), duracion, volumen) for f in factores]
+        # Generador propio: elegir variante no consume la secuencia de random
+        # (la simulación depende de random.seed para ser reproducible)
+        self._azar = random.Random()
+        self._hilo = threading.Thread(target=self._generar, name="sintesis", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def _generar(self):
+        try:
+            for clave in self._claves:
+                # list.append es atómico: play() ve las variantes a medida que aparecen
+                self.variantes.append(crear_tono(*clave))
+        except Exception:
+            logger.exception("Error generando variantes de sonido")
+
+    def play(self, *args, **kwargs):
+        sonido = self._azar.choice(self.variantes) if self.variantes else self.base
+        return sonido.play(*args, **kwargs)
+
+    def set_volume(self, volumen):
+        self.base.set_volume(volumen)
+        for sonido in self.variantes:
+            sonido.set_volume(volumen)
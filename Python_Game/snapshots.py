@@ -0,0 +1,229 @@
+import struct
+import logging
+from itertools import chain
+import numpy as np
+from pygame.math import Vector2
+
+from entities import Enemigo, LaserShot, Misil, Particle
+
+logger = logging.getLogger("Naves")
+
+MAGIA = b'NVS1'
+VERSION = 1
+
+# Formato (little endian):
+#   cabecera  magia, versión, cantidad por tipo
+#   stats     muertes_totales, velocidad_enemigos, spawn_interval, tiempo_spawn
+#   nave      pos, vel, angle, laser_timer, misil_timer, health, alive, misiles_activos
+#   por tipo  bloque float32 (n x campos) y, si tiene, bloque uint8 (n x campos)
+# Las estelas de los misiles son solo visuales y no se guardan.
+_CABECERA = struct.Struct('<4sH4I')
+_STATS = struct.Struct('<i3f')
+_NAVE = struct.Struct('<8f2B')
+
+
+def _campos_enemigo(e):
+    return e.pos.x, e.pos.y, e.vel.x, e.vel.y, e.vida, e.max_vida, e.wobble, e.radio
+
+
+def _campos_laser(l):
+    return l.pos.x, l.pos.y, l.vel.x, l.vel.y, l.age
+
+
+def _campos_misil(m):
+    return m.pos.x, m.pos.y, m.vel.x, m.vel.y, m.tail_timer
+
+
+def _campos_particula(p):
+    return p.pos.x, p.pos.y, p.vel.x, p.vel.y, p.size, p.age, p.lifetime
+
+
+def _color_particula(p):
+    return p.color
+
+
+# (clave en entidades, campos float32, extractor, campos uint8, extractor uint8)
+TIPOS = (
+    ('enemigos', 8, _campos_enemigo, 0, None),
+    ('lasers', 5, _campos_laser, 0, None),
+    ('misiles', 5, _campos_misil, 0, None),
+    ('particles', 7, _campos_particula, 3, _color_particula),
+)
+
+
+def codificar(entidades, stats):
+    nave = entidades['nave']
+    cantidades = [len(entidades[clave]) for clave, *_ in TIPOS]
+    partes = [
+        _CABECERA.pack(MAGIA, VERSION, *cantidades),
+        _STATS.pack(stats['muertes_totales'], stats['velocidad_enemigos'],
+                    stats['spawn_interval'], stats['tiempo_spawn']),
+        _NAVE.pack(nave.pos.x, nave.pos.y, nave.vel.x, nave.vel.y, nave.angle,
+                   nave.laser_timer, nave.misil_timer, nave.health,
+                   nave.alive, nave.misiles_activos),
+    ]
+    for (clave, n_f4, campos, n_u1, campos_u1), n in zip(TIPOS, cantidades):
+        lista = entidades[clave]
+        partes.append(np.fromiter(chain.from_iterable(map(campos, lista)), np.float32, n * n_f4).tobytes())
+        if n_u1:
+            partes.append(np.fromiter(chain.from_iterable(map(campos_u1, lista)), np.uint8, n * n_u1).tobytes())
+    return b''.join(partes)
+
+
+def decodificar(blob):
+    magia, version, *cantidades = _CABECERA.unpack_from(blob, 0)
+    if magia != MAGIA or version != VERSION:
+        raise ValueError(f"Snapshot inválido (magia {magia!r}, versión {version})")
+    offset = _CABECERA.size
+    muertes, velocidad, spawn_interval, tiempo_spawn = _STATS.unpack_from(blob, offset)
+    offset += _STATS.size
+    *flotantes, alive, misiles_activos = _NAVE.unpack_from(blob, offset)
+    offset += _NAVE.size
+
+    datos = {
+        'stats': {
+            'muertes_totales': muertes,
+            'velocidad_enemigos': velocidad,
+            'spawn_interval': spawn_interval,
+            'tiempo_spawn': tiempo_spawn,
+        },
+        'nave': {
+            'pos': flotantes[0:2], 'vel': flotantes[2:4], 'angle': flotantes[4],
+            'laser_timer': flotantes[5], 'misil_timer': flotantes[6], 'health': flotantes[7],
+            'alive': bool(alive), 'misiles_activos': bool(misiles_activos),
+        },
+    }
+    for (clave, n_f4, _, n_u1, _), n in zip(TIPOS, cantidades):
+        datos[clave] = np.frombuffer(blob, np.float32, n * n_f4, offset).reshape(n, n_f4)
+        offset += n * n_f4 * 4
+        if n_u1:
+            datos[clave + '_u1'] = np.frombuffer(blob, np.uint8, n * n_u1, offset).reshape(n, n_u1)
+            offset += n * n_u1
+    return datos
+
+
+def restaurar(blob, entidades, stats):
+    # Modifica `entidades`/`stats` in-place: la nave conserva su identidad
+    datos = decodificar(blob)
+    stats.update(datos['stats'])
+
+    nave = entidades['nave']
+    for clave, valor in datos['nave'].items():
+        setattr(nave, clave, Vector2(valor) if clave in ('pos', 'vel') else valor)
+
+    enemigos = []
+    for x, y, vx, vy, vida, max_vida, wobble, radio in datos['enemigos'].tolist():
+        # Sin el constructor, que consume el `random` global: cargar o rebobinar no altera la secuencia
+        e = Enemigo.__new__(Enemigo)
+        e.pos, e.vel = Vector2(x, y), Vector2(vx, vy)
+        e.vida, e.max_vida, e.wobble, e.radio = vida, max_vida, wobble, int(radio)
+        e.vivo = True
+        enemigos.append(e)
+
+    lasers = []
+    for x, y, vx, vy, age in datos['lasers'].tolist():
+        l = LaserShot((x, y), Vector2(vx, vy))
+        l.age = age
+        lasers.append(l)
+
+    misiles = []
+    for x, y, vx, vy, tail_timer in datos['misiles'].tolist():
+        m = Misil((x, y), Vector2(vx, vy))
+        m.vel = Vector2(vx, vy)  # el constructor la renormaliza
+        m.tail_timer = tail_timer
+        misiles.append(m)
+
+    particulas = []
+    colores = datos['particles_u1'].tolist()
+    for (x, y, vx, vy, size, age, lifetime), color in zip(datos['particles'].tolist(), colores):
+        p = Particle((x, y), (vx, vy), tuple(color), size, lifetime)
+        p.age = age
+        particulas.append(p)
+
+    entidades['enemigos'] = enemigos
+    entidades['lasers'] = lasers
+    entidades['misiles'] = misiles
+    entidades['particles'] = particulas
+    entidades['estelas'] = []
+
+
+class BufferRebobinado:
+    # Memoria fija: `capacidad` slots de `tam_slot` bytes reservados al crear.
+    # Un snapshot más grande que el slot se descarta y se cuenta.
+    def __init__(self, capacidad, tam_slot):
+        self.capacidad = capacidad
+        self.tam_slot = tam_slot
+        self.datos = np.zeros((capacidad, tam_slot), np.uint8)
+        self.largos = np.zeros(capacidad, np.int64)
+        self.inicio = 0
+        self.n = 0
+        self.descartados = 0
+
+    def __len__(self):
+        return self.n
+
+    def guardar(self, blob):
+        largo = len(blob)
+        if largo > self.tam_slot:
+            self.descartados += 1
+            return False
+        i = (self.inicio + self.n) % self.capacidad
+        if self.n == self.capacidad:
+            self.inicio = (self.inicio + 1) % self.capacidad
+        else:
+            self.n += 1
+        self.datos[i, :largo] = np.frombuffer(blob, np.uint8)
+        self.largos[i] = largo
+        return True
+
+    def _blob(self, k):
+        i = (self.inicio + k) % self.capacidad
+        return self.datos[i, :self.largos[i]].tobytes()
+
+    def retroceder(self, frames):
+        # Descarta los `frames` snapshots más nuevos y devuelve el que queda último
+        if self.n == 0:
+            return None
+        self.n = max(1, self.n - frames)
+        return self._blob(self.n - 1)
+
+    def snapshots(self):
+        return [self._blob(k) for k in range(self.n)]
+
+    def volcar(self, ruta):
+        with open(ruta, 'wb') as f:
+            f.write(struct.pack('<4sI', b'NVR1', self.n))
+            for blob in self.snapshots():
+                f.write(struct.pack('<I', len(blob)))
+                f.write(blob)
+        logger.info(f"{self.n} snapshots volcados en {ruta}")
+
+
+def cargar_volcado(ruta):
+    with open(ruta, 'rb') as f:
+        magia, n = struct.unpack('<4sI', f.read(8))
+        if magia != b'NVR1':
+            raise ValueError(f"Volcado inválido: {ruta}")
+        blobs = []
+        for _ in range(n):
+            (largo,) = struct.unpack('<I', f.read(4))
+            blobs.append(f.read(largo))
+    return blobs
+
+
+def guardar_partida(ruta, entidades, stats):
+    with open(ruta, 'wb') as f:
+        f.write(codificar(entidades, stats))
+    logger.info(f"Partida guardada en {ruta}")
+
+
+def cargar_partida(ruta, entidades, stats):
+    # Se llama desde un atajo en pleno juego: un archivo faltante o corrupto no lo corta
+    try:
+        with open(ruta, 'rb') as f:
+            restaurar(f.read(), entidades, stats)
+    except (OSError, ValueError, struct.error):
+        logger.exception(f"No se pudo cargar la partida desde {ruta}")
+        return False
+    logger.info(f"Partida cargada desde {ruta}")
+    return True
@@ -0,0 +1,127 @@
+import logging
+from collections import Counter
+import pygame
+
+logger = logging.getLogger("Naves")
+
+# Tipos de superficie que crea la fábrica
+OPACA = 'opaca'        # sin alfa, formato de la pantalla (scene, buffers, fondos)
+ALFA = 'alfa'          # alfa por píxel, formato de convert_alpha() (sprites y temporales)
+ADITIVA = 'aditiva'    # sin alfa, negro = nada; se blitea con BLEND_ADD
+
+# SDL solo toma el camino rápido de blit si origen y destino tienen la misma
+# profundidad y máscaras RGB; si no, convierte píxel a píxel en cada blit (con
+# alfa por píxel es más de un orden de magnitud más lento). Las superficies se
+# crean directo en el formato nativo, sin convert(), así que los temporales
+# por frame no pagan una copia extra. Sin modo de video (backend de texturas o
+# antes de set_mode) se usan los formatos por defecto de pygame.
+
+
+def _formato(surf):
+    return surf.get_bitsize(), surf.get_masks()[:3]
+
+
+def describir_formato(surf):
+    bits, masks = _formato(surf)
+    orden = ''.join(c for _, c in sorted(zip(masks, 'RGB'), reverse=True))
+    alfa = 'A' if surf.get_flags() & pygame.SRCALPHA else ''
+    return f"{bits}bpp {alfa}{orden}"
+
+
+class _SuperficieContada(pygame.Surface):
+    # Solo en modo depuración: cuenta los blits cuyo origen no tiene el formato del destino
+    def blit(self, fuente, *args, **kwargs):
+        registro.contar_blit(self, fuente)
+        return super().blit(fuente, *args, **kwargs)
+
+    def blits(self, secuencia, *args, **kwargs):
+        secuencia = list(secuencia)
+        for item in secuencia:
+            registro.contar_blit(self, item[0])
+        return super().blits(secuencia, *args, **kwargs)
+
+
+class RegistroSuperficies:
+    def __init__(self):
+        self._formatos = None
+        self._al_cambiar = []
+        self.depurar = False
+        self.blits = 0
+        self.distintos = Counter()
+
+    def _leer_formatos(self):
+        pantalla = pygame.display.get_surface()
+        if pantalla is None:
+            return None
+        alfa = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+        return {
+            OPACA: (0, pantalla.get_bitsize(), pantalla.get_masks()),
+            ALFA: (pygame.SRCALPHA, alfa.get_bitsize(), alfa.get_masks()),
+            ADITIVA: (0, pantalla.get_bitsize(), pantalla.get_masks()),
+        }
+
+    def formatos(self):
+        # Se leen con la primera pantalla disponible; pantalla_cambiada() los invalida
+        if self._formatos is None:
+            self._formatos = self._leer_formatos()
+        return self._formatos
+
+    def crear(self, tam, tipo=OPACA):
+        clase = _SuperficieContada if self.depurar else pygame.Surface
+        formatos = self.formatos()
+        if formatos is None:
+            surf = clase(tam, pygame.SRCALPHA if tipo == ALFA else 0)
+        else:
+            flags, bits, masks = formatos[tipo]
+            surf = clase(tam, flags, bits, masks)
+        if tipo == ADITIVA:
+            surf.fill((0, 0, 0))
+        return surf
+
+    def adaptar(self, surf, alfa=True):
+        # Assets cargados o generados: convert/convert_alpha si hay pantalla y
+        # el formato no es ya el nativo (evita la copia de convertir dos veces)
+        formatos = self.formatos()
+        if formatos is None:
+            return surf
+        _, bits, masks = formatos[ALFA if alfa else OPACA]
+        if surf.get_bitsize() == bits and surf.get_masks() == masks:
+            return surf
+        return surf.convert_alpha() if alfa else surf.convert()
+
+    def al_cambiar(self, funcion):
+        # Registra cómo vaciar una caché de superficies generadas en el formato anterior
+        self._al_cambiar.append(funcion)
+        return funcion
+
+    def pantalla_cambiada(self):
+        self._formatos = None
+        for funcion in self._al_cambiar:
+            funcion()
+
+    def activar_depuracion(self):
+        self.depurar = True
+        logger.info("Conteo de blits con formato distinto activado")
+
+    def contar_blit(self, destino, fuente):
+        self.blits += 1
+        if _formato(destino) != _formato(fuente):
+            self.distintos[(describir_formato(fuente), describir_formato(destino), fuente.get_size())] += 1
+
+    def reporte(self):
+        total = sum(self.distintos.values())
+        lineas = [f"Blits sobre superficies de la fábrica: {self.blits}, con formato distinto: {total}"]
+        for (origen, destino, tam), n in self.distintos.most_common(10):
+            lineas.append(f"  {n:8d}  {origen} -> {destino}  {tam[0]}x{tam[1]}")
+        return "\n".join(lineas)
+
+
+registro = RegistroSuperficies()
+
+
+def superficie(tam, tipo=OPACA):
+    return registro.crear(tam, tipo)
+
+
+def adaptar(surf, alfa=True):
+    return registro.adaptar(surf, alfa)
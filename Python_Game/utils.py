@@ -4,6 +4,8 @@ import numpy as np
 import pygame
 
 from config import BLOOM_DOWNSCALE, BLOOM_INTENSITY
+from sintesis import crear_tono
+from superficies import registro
 
 logger = logging.getLogger("Naves")
 
@@ -13,19 +15,31 @@ def clamp(v, a, b):
 
 
 def create_sound_tone(frequency=440, duration=0.12, volume=0.2, sample_rate=44100):
+    # Memoizado por (frecuencia, duración, volumen, muestreo); ver sintesis.py
     try:
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        wave = 0.5 * np.sin(2 * np.pi * frequency * t)
-        env = np.exp(-5 * t)
-        sig = wave * env * volume
-        audio = np.int16(sig * 32767)
-        stereo = np.column_stack([audio, audio])
-        return pygame.sndarray.make_sound(stereo.copy())
+        return crear_tono(frequency, duration, volume, sample_rate)
     except Exception:
         logger.exception("Fallo al generar tono sintético")
         return None
 
 
+_sprites_escalados = {}
+registro.al_cambiar(_sprites_escalados.clear)
+
+
+def escalar_sprite(surf, escala):
+    if escala == 1.0:
+        return surf
+    clave = (id(surf), round(escala, 3))
+    escalado = _sprites_escalados.get(clave)
+    if escalado is None:
+        w, h = surf.get_size()
+        tam = (max(1, int(w * escala)), max(1, int(h * escala)))
+        escalado = pygame.transform.smoothscale(surf, tam)
+        _sprites_escalados[clave] = escalado
+    return escalado
+
+
 def colision_punto_circulo(punto, centro, radio):
     return (punto - centro).length_squared() <= radio * radio
 
@@ -34,6 +48,43 @@ def colision_circulos(c1, r1, c2, r2):
     return (c1 - c2).length_squared() <= (r1 + r2) ** 2
 
 
+def tiempos_impacto(inicios, fines, centros, radios, desplazamientos=None):
+    # Fracción t en [0, 1] del segmento inicio->fin en la que entra a cada círculo
+    # (0 si ya empieza adentro, inf si no lo toca). Admite dimensiones previas
+    # para procesar varios mundos a la vez:
+    #   inicios/fines (..., P, 2), centros (..., E, 2), radios (..., E) -> (..., P, E)
+    # Con `desplazamientos` (..., E, 2), lo que se mueve cada círculo durante el
+    # segmento, la prueba es relativa al círculo en movimiento.
+    dx = (fines[..., 0] - inicios[..., 0])[..., :, None]
+    dy = (fines[..., 1] - inicios[..., 1])[..., :, None]
+    if desplazamientos is not None:
+        dx = dx - desplazamientos[..., None, :, 0]
+        dy = dy - desplazamientos[..., None, :, 1]
+    fx = inicios[..., :, None, 0] - centros[..., None, :, 0]
+    fy = inicios[..., :, None, 1] - centros[..., None, :, 1]
+    r = radios[..., None, :]
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - r * r
+    disc = b * b - 4 * a * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-b - np.sqrt(disc)) / (2 * a)
+    t = np.where((disc >= 0) & (a > 0) & (t >= 0) & (t <= 1), t, np.inf)
+    return np.where(c <= 0, 0.0, t)
+
+
+def primer_impacto(inicios, fines, centros, radios, mascara=None, desplazamientos=None):
+    # Índice del primer círculo que toca cada segmento (-1 si ninguno) y su t.
+    # Con empates gana el primero de la lista, como en un recorrido en orden.
+    # `mascara` (broadcast a (..., P, E)) descarta pares, p. ej. slots vacíos.
+    t = tiempos_impacto(inicios, fines, centros, radios, desplazamientos)
+    if mascara is not None:
+        t = np.where(mascara, t, np.inf)
+    indice = t.argmin(axis=-1)
+    t_min = np.take_along_axis(t, indice[..., None], axis=-1)[..., 0]
+    return np.where(np.isfinite(t_min), indice, -1), t_min
+
+
 def apply_bloom(scene_surf, intensity=BLOOM_INTENSITY, downscale=BLOOM_DOWNSCALE):
     try:
         w, h = scene_surf.get_size()